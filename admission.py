@@ -0,0 +1,239 @@
+"""
+Admission — concurrency limits and bounded, fair wait queues for API endpoints.
+
+Each pool admits up to ``max_concurrent`` requests at once. Up to
+``max_queue`` more wait for a slot, granted round-robin across clients so one
+client's burst cannot starve the others, and a single client may hold at most
+``max_per_client`` slots running or queued. A request that finds the queue
+full (or waits longer than ``queue_timeout``) is rejected with a Retry-After
+estimate derived from recent service times.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+
+@dataclass
+class AdmissionLimit:
+    max_concurrent: int
+    max_queue: int = 0
+    # Seconds a request may wait for a slot; None waits as long as it takes.
+    queue_timeout: Optional[float] = 30.0
+    max_per_client: Optional[int] = None
+
+
+class Rejected(Exception):
+    """A request was not admitted; carries what a 429 response reports."""
+
+    def __init__(self, pool: str, reason: str, retry_after: int, queue_depth: int):
+        super().__init__(f"{pool}: {reason}")
+        self.pool = pool
+        self.reason = reason
+        self.retry_after = retry_after
+        self.queue_depth = queue_depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        messages = {
+            "queue_full": "Server busy: the wait queue is full",
+            "client_limit": "Too many requests from this client are running or queued",
+            "timeout": "Server busy: timed out waiting for a slot",
+        }
+        return {
+            "detail": messages.get(self.reason, "Server busy"),
+            "pool": self.pool,
+            "reason": self.reason,
+            "retry_after": self.retry_after,
+            "queue_depth": self.queue_depth,
+        }
+
+
+class Ticket:
+    """A request's place in a pool: granted a slot immediately or waiting for one."""
+
+    def __init__(self, pool: "_Pool", client: str):
+        self.pool = pool
+        self.client = client
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        self.released = False
+        self._granted = asyncio.get_running_loop().create_future()
+
+    @property
+    def granted(self) -> bool:
+        return self.granted_at is not None
+
+    @property
+    def position(self) -> Optional[int]:
+        """Waiting requests that will be granted before this one (None once granted)."""
+        return None if self.granted else self.pool.position(self)
+
+    async def wait(self):
+        """Wait up to the pool's ``queue_timeout`` for the slot; raises Rejected on timeout.
+
+        Cancellation gives the place (or the slot) up.
+        """
+        if self.granted:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._granted), self.pool.limit.queue_timeout)
+        except asyncio.TimeoutError:
+            self.pool.withdraw(self)
+            if self.granted:    # granted in the same instant
+                return
+            self.pool.counts["timed_out"] += 1
+            raise self.pool.rejection("timeout") from None
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    def release(self):
+        """Free the slot (or leave the queue); safe to call more than once."""
+        if self.released:
+            return
+        self.released = True
+        if self.granted:
+            self.pool.finish(self)
+        else:
+            self.pool.withdraw(self)
+
+    async def __aenter__(self) -> "Ticket":
+        await self.wait()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class _Pool:
+    def __init__(self, name: str, limit: AdmissionLimit):
+        self.name = name
+        self.limit = limit
+        self.running = 0
+        self.queued = 0
+        # Waiting tickets per client; the first client is served next, then rotated to the back.
+        self._queues: "OrderedDict[str, Deque[Ticket]]" = OrderedDict()
+        self._held: Dict[str, int] = {}
+        self._service_ewma: Optional[float] = None
+        self._wait_ewma: Optional[float] = None
+        self.max_wait = 0.0
+        self.counts = {"admitted": 0, "enqueued": 0, "completed": 0, "rejected_full": 0,
+                       "rejected_client": 0, "timed_out": 0, "abandoned": 0}
+
+    def enter(self, client: str) -> Ticket:
+        if self.limit.max_per_client is not None and self._held.get(client, 0) >= self.limit.max_per_client:
+            self.counts["rejected_client"] += 1
+            raise self.rejection("client_limit")
+        ticket = Ticket(self, client)
+        if self.running < self.limit.max_concurrent and not self.queued:
+            self._grant(ticket)
+        elif self.queued >= self.limit.max_queue:
+            self.counts["rejected_full"] += 1
+            raise self.rejection("queue_full")
+        else:
+            self._queues.setdefault(client, deque()).append(ticket)
+            self.queued += 1
+            self.counts["enqueued"] += 1
+        self._held[client] = self._held.get(client, 0) + 1
+        return ticket
+
+    def _grant(self, ticket: Ticket):
+        now = time.monotonic()
+        ticket.granted_at = now
+        waited = now - ticket.enqueued_at
+        self.max_wait = max(self.max_wait, waited)
+        self._wait_ewma = waited if self._wait_ewma is None else 0.9 * self._wait_ewma + 0.1 * waited
+        self.running += 1
+        self.counts["admitted"] += 1
+        if not ticket._granted.done():
+            ticket._granted.set_result(None)
+
+    def _drop_hold(self, client: str):
+        self._held[client] -= 1
+        if not self._held[client]:
+            del self._held[client]
+
+    def _grant_next(self):
+        while self.running < self.limit.max_concurrent and self._queues:
+            client, waiting = next(iter(self._queues.items()))
+            ticket = waiting.popleft()
+            self.queued -= 1
+            if waiting:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            self._grant(ticket)
+
+    def finish(self, ticket: Ticket):
+        self.running -= 1
+        self.counts["completed"] += 1
+        service = time.monotonic() - ticket.granted_at
+        self._service_ewma = service if self._service_ewma is None else 0.9 * self._service_ewma + 0.1 * service
+        self._drop_hold(ticket.client)
+        self._grant_next()
+
+    def withdraw(self, ticket: Ticket):
+        """Take a waiting ticket out of the queue (timeout, cancellation, early release)."""
+        waiting = self._queues.get(ticket.client)
+        if waiting is None or ticket not in waiting:
+            return
+        waiting.remove(ticket)
+        if not waiting:
+            del self._queues[ticket.client]
+        self.queued -= 1
+        self.counts["abandoned"] += 1
+        ticket.released = True
+        self._drop_hold(ticket.client)
+
+    def position(self, ticket: Ticket) -> int:
+        waiting = self._queues.get(ticket.client)
+        if waiting is None or ticket not in waiting:
+            return 0
+        index = waiting.index(ticket)
+        # Round-robin: clients before this one in the rotation get index + 1 slots first, the rest index.
+        ahead = index
+        before = True
+        for client, queue in self._queues.items():
+            if client == ticket.client:
+                before = False
+                continue
+            ahead += min(len(queue), index + 1 if before else index)
+        return ahead
+
+    def retry_after(self) -> int:
+        """Seconds until the queue has likely drained enough to take another request."""
+        service = self._service_ewma if self._service_ewma is not None else 1.0
+        return max(1, math.ceil(service * (self.queued + 1) / self.limit.max_concurrent))
+
+    def rejection(self, reason: str) -> Rejected:
+        return Rejected(self.name, reason, self.retry_after(), self.queued)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrent": self.limit.max_concurrent,
+            "max_queue": self.limit.max_queue,
+            "max_per_client": self.limit.max_per_client,
+            "clients_waiting": len(self._queues),
+            "wait_seconds": {
+                "avg": round(self._wait_ewma, 3) if self._wait_ewma is not None else None,
+                "max": round(self.max_wait, 3),
+            },
+            "service_seconds_avg": round(self._service_ewma, 3) if self._service_ewma is not None else None,
+            **self.counts,
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, AdmissionLimit]):
+        self._pools = {name: _Pool(name, limit) for name, limit in limits.items()}
+
+    def enter(self, pool: str, client: str) -> Ticket:
+        """Take a slot or a place in the pool's queue; raises Rejected if neither is available."""
+        return self._pools[pool].enter(client)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
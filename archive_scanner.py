@@ -0,0 +1,263 @@
+"""
+Archive Scanner — PII scanning of files inside zip, tar(.gz/.bz2/.xz) and gzip uploads.
+
+Entries are streamed out of the archive one at a time; binaries are skipped
+by sniffing their first bytes, and each text entry is decoded and scanned on
+a thread pool, several at once. Only the first ``max_file_bytes`` of an entry
+are read, and reading stops once ``max_total_bytes`` have been decompressed
+(read, or skipped over to reach the next member of a tar stream) or
+``max_entries`` files seen, so a zip bomb or a huge log bundle costs a
+bounded amount of memory and time.
+"""
+import asyncio
+import gzip
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+ARCHIVE_WORKERS = 4
+ARCHIVE_MAX_FILE_BYTES = 256 * 1024
+ARCHIVE_MAX_TOTAL_BYTES = 256 * 1024 * 1024
+ARCHIVE_MAX_ENTRIES = 5000
+
+_SNIFF_BYTES = 8192
+# Nested archives are reported but not opened.
+_ARCHIVE_MAGIC = (b"PK\x03\x04", b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00", b"7z\xbc\xaf\x27\x1c", b"Rar!")
+
+
+def sniff_archive(fp: IO[bytes]) -> Optional[str]:
+    """"zip", "tar" or "gzip" if the (seekable) upload is an archive, else None."""
+    try:
+        if zipfile.is_zipfile(fp):
+            return "zip"
+        fp.seek(0)
+        try:
+            with tarfile.open(fileobj=fp, mode="r:*"):
+                return "tar"
+        except tarfile.TarError:
+            pass
+        fp.seek(0)
+        if fp.read(2) == b"\x1f\x8b":
+            return "gzip"
+        return None
+    finally:
+        fp.seek(0)
+
+
+def looks_binary(data: bytes) -> bool:
+    """True for data that is not worth scanning as text (NUL bytes, many control bytes, known magic)."""
+    head = data[:_SNIFF_BYTES]
+    if not head:
+        return False
+    if b"\x00" in head or head.startswith(_ARCHIVE_MAGIC):
+        return True
+    control = sum(1 for b in head if b < 32 and b not in (9, 10, 12, 13, 27))
+    return control / len(head) > 0.1
+
+
+def decode_text(data: bytes) -> str:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        # A cut at the byte limit may split the last character.
+        try:
+            return data[:-3].decode("utf-8") + data[-3:].decode("utf-8", errors="ignore")
+        except UnicodeDecodeError:
+            return data.decode("latin-1")
+
+
+def _finding(m) -> Dict[str, Any]:
+    return {
+        "type": m.pii_type,
+        "value": m.value,
+        "masked_value": m.masked_value,
+        "confidence": m.confidence,
+        "severity": m.severity,
+        "context": m.context,
+        "method": m.detection_method,
+    }
+
+
+class ArchiveScanner:
+    def __init__(
+        self,
+        workers: int = ARCHIVE_WORKERS,
+        max_file_bytes: int = ARCHIVE_MAX_FILE_BYTES,
+        max_total_bytes: int = ARCHIVE_MAX_TOTAL_BYTES,
+        max_entries: int = ARCHIVE_MAX_ENTRIES,
+    ):
+        self.workers = workers
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive-scan")
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ── Reading ──
+
+    def iter_entries(
+        self, fp: IO[bytes], fmt: str, counts: Dict[str, Any], filename: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield ``{"path", "size", "data", "truncated"}`` for each regular file.
+
+        ``data`` is at most ``max_file_bytes``; ``counts`` tracks entries,
+        decompressed bytes (read and skipped) and whether the archive was cut
+        short.
+        """
+        if fmt == "zip":
+            with zipfile.ZipFile(fp) as zf:
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    if info.flag_bits & 0x1:
+                        yield {"path": info.filename, "size": info.file_size, "skipped": "encrypted"}
+                        continue
+                    yield from self._read_entry(info.filename, info.file_size, lambda: zf.open(info), counts)
+                    if counts["truncated"]:
+                        return
+        elif fmt == "tar":
+            # Stream mode: members are read in order without seeking back, so reaching
+            # the next member decompresses whatever was not read of this one.
+            with tarfile.open(fileobj=fp, mode="r|*") as tf:
+                for member in tf:
+                    if not member.isfile():
+                        self._skip(member.size, counts)
+                    else:
+                        yield from self._read_entry(
+                            member.name, member.size, lambda: tf.extractfile(member), counts, stream_size=member.size
+                        )
+                    if counts["truncated"]:
+                        return
+        elif fmt == "gzip":
+            base = os.path.basename(filename or "")
+            path = base[:-3] if base.endswith(".gz") else base or "content"
+            yield from self._read_entry(path, None, lambda: gzip.GzipFile(fileobj=fp, mode="rb"), counts)
+        else:
+            raise ValueError(f"unknown archive format {fmt!r}")
+
+    def _skip(self, size: int, counts: Dict[str, Any]):
+        """Charge bytes decompressed without being read against ``max_total_bytes``."""
+        counts["bytes_skipped"] += size
+        if counts["bytes_read"] + counts["bytes_skipped"] >= self.max_total_bytes:
+            counts["truncated"] = "max_total_bytes"
+
+    def _read_entry(
+        self, path: str, size: Optional[int], open_entry, counts: Dict[str, Any], stream_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Read one entry; ``stream_size`` is what the archive decompresses for it
+        whether read or not (a tar stream member), charged in full.
+        """
+        if counts["entries"] >= self.max_entries:
+            counts["truncated"] = "max_entries"
+            return
+        counts["entries"] += 1
+        budget = min(self.max_file_bytes, self.max_total_bytes - counts["bytes_read"] - counts["bytes_skipped"])
+        try:
+            with open_entry() as stream:
+                # Declared sizes can lie (zip bombs); only what is actually read counts.
+                data = stream.read(budget + 1)
+        except Exception as e:
+            self._skip(stream_size or 0, counts)
+            yield {"path": path, "size": size, "skipped": "unreadable", "error": str(e)[:200]}
+            return
+        truncated = len(data) > budget
+        data = data[:budget]
+        counts["bytes_read"] += len(data)
+        self._skip(max(0, (stream_size or 0) - len(data)), counts)
+        yield {"path": path, "size": size, "data": data, "truncated": truncated}
+
+    # ── Scanning ──
+
+    async def scan(self, fp: IO[bytes], fmt: str, engine, filename: Optional[str] = None) -> Dict[str, Any]:
+        """Scan an archive upload; per-file findings plus totals in the shape of a single-file scan."""
+        started = time.monotonic()
+        loop = asyncio.get_running_loop()
+        counts: Dict[str, Any] = {"entries": 0, "bytes_read": 0, "bytes_skipped": 0, "truncated": False}
+        skipped: Dict[str, int] = {}
+        files: List[Dict[str, Any]] = []
+        entries = self.iter_entries(fp, fmt, counts, filename)
+        # The reader takes one pool thread, the scan tasks the rest.
+        scanners = max(1, self.workers - 1)
+        # Entries are read one at a time off the event loop and handed to the scan tasks
+        # through a bounded queue, so at most ~2x workers entries are in memory.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+
+        async def read():
+            try:
+                while True:
+                    entry = await loop.run_in_executor(self._executor, next, entries, None)
+                    if entry is None:
+                        break
+                    await queue.put(entry)
+            except Exception as e:
+                counts["error"] = f"Archive read error after {counts['entries']} entries: {e}"
+            for _ in range(scanners):
+                await queue.put(None)
+
+        def detect(data: bytes):
+            text = decode_text(data)
+            return text, engine.detect(text, max_length=len(text))
+
+        async def work():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                if "skipped" not in entry and looks_binary(entry["data"]):
+                    entry["skipped"] = "binary"
+                if "skipped" in entry:
+                    skipped[entry["skipped"]] = skipped.get(entry["skipped"], 0) + 1
+                    continue
+                text, matches = await loop.run_in_executor(self._executor, detect, entry.pop("data"))
+                files.append({
+                    "path": entry["path"],
+                    "size": entry["size"],
+                    "content_length": len(text),
+                    "truncated": entry["truncated"],
+                    "pii_count": len(matches),
+                    "findings": [_finding(m) for m in matches],
+                })
+
+        tasks = [asyncio.create_task(read()), *(asyncio.create_task(work()) for _ in range(scanners))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # A failed scan task must not leave the reader waiting on a queue nobody drains.
+            for task in tasks:
+                task.cancel()
+
+        files.sort(key=lambda f: f["path"])
+        severity: Dict[str, int] = {}
+        methods: Dict[str, int] = {}
+        findings = []
+        for f in files:
+            for finding in f["findings"]:
+                severity[finding["severity"]] = severity.get(finding["severity"], 0) + 1
+                methods[finding["method"]] = methods.get(finding["method"], 0) + 1
+                findings.append({**finding, "file": f["path"]})
+        return {
+            "archive": {
+                "format": fmt,
+                "entries": counts["entries"],
+                "scanned": len(files),
+                "skipped": skipped,
+                "uncompressed_bytes_read": counts["bytes_read"],
+                "uncompressed_bytes_skipped": counts["bytes_skipped"],
+                "truncated": counts["truncated"],
+                "error": counts.get("error"),
+                "elapsed_seconds": round(time.monotonic() - started, 3),
+            },
+            "content_length": sum(f["content_length"] for f in files),
+            "pii_count": len(findings),
+            "files": files,
+            "findings": findings,
+            "by_severity": severity,
+            "by_method": methods,
+        }
@@ -0,0 +1,241 @@
+"""
+Batch Analyzer — PII detection over large streams of short text records.
+
+Records come from a JSON array or NDJSON body of ``{"id": ..., "text": ...}``
+objects (bare strings are accepted too and numbered by position). They are
+read incrementally, grouped into batches for ``PIIEngine.detect_batch`` and
+reported one result per record, in input order, as each batch completes.
+Only a couple of batches are held at a time, so memory stays flat however
+many records arrive.
+"""
+import asyncio
+import codecs
+import json
+import time
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+BATCH_SIZE = 64
+# A batch is cut early once its texts add up to this many characters.
+BATCH_MAX_CHARS = 256 * 1024
+BATCH_MAX_TEXT_CHARS = 50000
+BATCH_MAX_RECORDS = 1_000_000
+BATCH_PROGRESS_SECONDS = 2.0
+
+_READ_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n\ufeff"
+
+
+def iter_text_records(fp: IO[bytes], fmt: str = "auto") -> Iterator[Tuple[int, Any]]:
+    """
+    Yield ``(index, raw_record)`` for each element of a JSON array or line of NDJSON.
+
+    ``fmt="auto"`` picks the array reader when the body starts with "[".
+    Array elements are decoded one at a time from a sliding buffer, so the
+    whole array is never in memory. An element that is not valid JSON ends
+    the input with ValueError.
+    """
+    read = _text_reader(fp)
+    head = read()
+    if fmt == "auto":
+        fmt = "json" if head.lstrip(_WHITESPACE)[:1] == "[" else "ndjson"
+    if fmt == "json":
+        return _array_records(read, head)
+    return _ndjson_records(read, head)
+
+
+def _text_reader(fp: IO[bytes]) -> Callable[[], str]:
+    """
+    A function returning the next piece of ``fp`` as UTF-8 text, "" at the end.
+
+    One decoder carries over a character split between two reads, so it is
+    decoded whole instead of becoming two replacement characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def read() -> str:
+        while True:
+            chunk = fp.read(_READ_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            # A read holding only the start of a character decodes to "" without being the end.
+            if text or not chunk:
+                return text
+
+    return read
+
+
+def _ndjson_records(read: Callable[[], str], head: str) -> Iterator[Tuple[int, Any]]:
+    index = 0
+    buffer = head
+    while True:
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            line = line.strip(_WHITESPACE)
+            if not line:
+                continue
+            try:
+                yield index, json.loads(line)
+            except json.JSONDecodeError:
+                # A bare line of text is a record of its own.
+                yield index, line
+            index += 1
+        chunk = read()
+        if not chunk:
+            break
+        buffer += chunk
+    line = buffer.strip(_WHITESPACE)
+    if line:
+        try:
+            yield index, json.loads(line)
+        except json.JSONDecodeError:
+            yield index, line
+
+
+def _array_records(read: Callable[[], str], head: str) -> Iterator[Tuple[int, Any]]:
+    decoder = json.JSONDecoder()
+    buffer = head.lstrip(_WHITESPACE)
+    if buffer[:1] != "[":
+        raise ValueError("expected a JSON array")
+    buffer = buffer[1:]
+    pos = 0
+    index = 0
+    eof = False
+    while True:
+        # Skip separators between elements.
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("need more input", buffer, pos)
+            value, end = decoder.raw_decode(buffer, pos)
+            # A number or literal may continue past the buffer; wait for a delimiter.
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError("need more input", buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                if pos >= len(buffer):
+                    return  # unterminated array: keep what was read
+                raise ValueError(f"Invalid JSON in element {index}")
+            chunk = read()
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield index, value
+        index += 1
+        pos = end
+
+
+def _record_text(raw: Any) -> Tuple[Any, Optional[str]]:
+    """(id, text) of a raw record; text is None if the record has none."""
+    if isinstance(raw, str):
+        return None, raw
+    if isinstance(raw, dict):
+        text = raw.get("text")
+        return raw.get("id"), text if isinstance(text, str) else None
+    return None, None
+
+
+def _finding(m) -> Dict[str, Any]:
+    return {
+        "type": m.pii_type,
+        "value": m.value,
+        "masked_value": m.masked_value,
+        "confidence": m.confidence,
+        "severity": m.severity,
+        "context": m.context,
+        "method": m.detection_method,
+    }
+
+
+async def analyze_records(
+    records: Iterator[Tuple[int, Any]],
+    engine,
+    batch_size: int = BATCH_SIZE,
+    max_batch_chars: int = BATCH_MAX_CHARS,
+    max_records: int = BATCH_MAX_RECORDS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Detect PII in ``(index, raw_record)`` records (see ``iter_text_records``).
+
+    Yields "result" events (``id``, ``findings``) in input order, "invalid"
+    for records without text, periodic "progress" and a final "summary" with
+    aggregate counts. Detection runs in a worker thread one batch at a time
+    while the next batch is read.
+    """
+    started = time.monotonic()
+    batches: asyncio.Queue = asyncio.Queue(maxsize=1)
+    counts = {"read": 0, "analyzed": 0, "invalid": 0, "batches": 0}
+    totals: Dict[str, Dict[str, int]] = {"by_type": {}, "by_severity": {}, "by_method": {}}
+    total_findings = 0
+    truncated = False
+    input_error: Optional[str] = None
+
+    async def produce():
+        nonlocal truncated, input_error
+        batch: List[Tuple[int, Any, Optional[str]]] = []
+        chars = 0
+        try:
+            for index, raw in records:
+                if counts["read"] >= max_records:
+                    truncated = True
+                    break
+                counts["read"] += 1
+                record_id, text = _record_text(raw)
+                batch.append((index, index if record_id is None else record_id, text))
+                chars += len(text or "")
+                if len(batch) >= batch_size or chars >= max_batch_chars:
+                    await batches.put(batch)
+                    batch, chars = [], 0
+                    # Parsing is synchronous; let results stream out between batches.
+                    await asyncio.sleep(0)
+        except Exception as e:
+            input_error = f"Input error after {counts['read']} records: {e}"
+        if batch:
+            await batches.put(batch)
+        await batches.put(None)
+
+    producer = asyncio.create_task(produce())
+    last_progress = time.monotonic()
+    try:
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                break
+            texts = [text for _, _, text in batch if text is not None]
+            detected = iter(await asyncio.to_thread(engine.detect_batch, texts, BATCH_MAX_TEXT_CHARS, batch_size))
+            counts["batches"] += 1
+            for index, record_id, text in batch:
+                if text is None:
+                    counts["invalid"] += 1
+                    yield {"type": "invalid", "index": index, "id": record_id, "error": "record has no text"}
+                    continue
+                matches = next(detected)
+                counts["analyzed"] += 1
+                total_findings += len(matches)
+                for m in matches:
+                    for key, value in (("by_type", m.pii_type), ("by_severity", m.severity),
+                                       ("by_method", m.detection_method)):
+                        totals[key][value] = totals[key].get(value, 0) + 1
+                yield {"type": "result", "id": record_id, "pii_count": len(matches),
+                       "findings": [_finding(m) for m in matches]}
+            if time.monotonic() - last_progress >= BATCH_PROGRESS_SECONDS:
+                last_progress = time.monotonic()
+                yield {"type": "progress", **counts, "elapsed_seconds": round(last_progress - started, 3)}
+    finally:
+        producer.cancel()
+
+    if input_error:
+        yield {"type": "error", "error": input_error}
+    elapsed = time.monotonic() - started
+    yield {
+        "type": "summary",
+        **counts,
+        "truncated": truncated,
+        "total_findings": total_findings,
+        **totals,
+        "elapsed_seconds": round(elapsed, 3),
+        "records_per_second": round(counts["analyzed"] / elapsed, 1) if elapsed > 0 else None,
+    }
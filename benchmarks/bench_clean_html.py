@@ -0,0 +1,101 @@
+"""
+HTML Clean Benchmark — compares extractor backends on the benchmark corpus.
+
+Usage:
+    python benchmarks/bench_clean_html.py [--repeat 5] [--workers 4]
+
+For every installed backend it reports per-page latency and throughput, checks
+that the cleaned text is identical to the html.parser reference (on the corpus
+and on the ``EDGE_CASES`` fragments: text around removed elements, comments
+and processing instructions), and measures how many pages per second the
+thread and process pools sustain. Exits with status 1 if any output differs.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from html_corpus import EDGE_CASES, build_corpus  # noqa: E402
+from html_extract import available_extractors, clean_html, get_extractor  # noqa: E402
+
+
+def bench_backend(name, corpus, repeat):
+    extractor = get_extractor(name)
+    reference = get_extractor("html.parser")
+    rows = []
+    for page, html in corpus.items():
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            out = extractor.clean(html)
+            timings.append(time.perf_counter() - t0)
+        median = statistics.median(timings)
+        rows.append({
+            "page": page,
+            "kb": len(html.encode("utf-8")) / 1024,
+            "ms": median * 1000,
+            "mb_s": len(html.encode("utf-8")) / 1e6 / median if median else 0.0,
+            "parity": out == reference.clean(html),
+        })
+    return rows
+
+
+def edge_case_diffs(name):
+    """(case, expected, got) for every edge-case fragment the backend cleans differently."""
+    extractor = get_extractor(name)
+    reference = get_extractor("html.parser")
+    diffs = []
+    for case, html in EDGE_CASES.items():
+        expected, got = reference.clean(html), extractor.clean(html)
+        if got != expected:
+            diffs.append((case, expected, got))
+    return diffs
+
+
+def bench_pool(name, corpus, workers, kind, rounds=4):
+    pages = list(corpus.values()) * rounds
+    pool_cls = ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        list(pool.map(clean_html, pages[:workers], [name] * workers))  # warm up
+        t0 = time.perf_counter()
+        list(pool.map(clean_html, pages, [name] * len(pages)))
+        elapsed = time.perf_counter() - t0
+    return len(pages) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    backends = available_extractors()
+    print(f"Corpus: {len(corpus)} pages, {sum(len(h) for h in corpus.values()) / 1e6:.1f} MB | backends: {backends}")
+
+    mismatches = 0
+    for name in backends:
+        rows = bench_backend(name, corpus, args.repeat)
+        print(f"\n[{name}]")
+        for r in rows:
+            flag = "ok" if r["parity"] else "DIFF"
+            mismatches += not r["parity"]
+            print(f"  {r['page']:<18} {r['kb']:>7.0f} KB {r['ms']:>9.2f} ms {r['mb_s']:>7.1f} MB/s  parity={flag}")
+        diffs = edge_case_diffs(name)
+        mismatches += len(diffs)
+        print(f"  edge cases: {len(EDGE_CASES) - len(diffs)}/{len(EDGE_CASES)} match")
+        for case, expected, got in diffs:
+            print(f"    {case}: expected {expected!r}, got {got!r}")
+        for kind in ("thread", "process"):
+            rate = bench_pool(name, corpus, args.workers, kind)
+            print(f"  {kind} pool x{args.workers}: {rate:,.1f} pages/s")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+JSON Serialization Benchmark — FastAPI's default encoding vs. the ``fastjson`` path.
+
+Usage:
+    python benchmarks/bench_json.py [--pages 200] [--chars 5000] [--subscribers 100] [--repeat 20]
+
+Builds a completed crawl scan of ``--pages`` synthetic pages (findings from
+PIIEngine, page text truncated to 3000 chars as in WebScanner) and times:
+
+- a GET /api/scan/{id} response: ``jsonable_encoder`` + JSONResponse (what
+  returning a dict does) vs. FastJSONResponse, with and without orjson;
+- SSE fan-out of the scan's log/result events to ``--subscribers`` streams:
+  ``json.dumps`` per subscriber (the old ``sse_frame``) vs. frames encoded
+  once at publish.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+import fastjson  # noqa: E402
+from events import EventBus, sse_frame  # noqa: E402
+from pii_engine import PIIEngine  # noqa: E402
+from synthetic_data import SyntheticGenerator  # noqa: E402
+
+
+def build_scan(pages: int, chars: int, seed: int):
+    generator = SyntheticGenerator(seed)
+    engine = PIIEngine()
+    results, log = [], []
+    for i, doc in enumerate(generator.documents(pages, "page", target_chars=chars)):
+        url = f"https://example.org/page/{i}"
+        findings = [
+            {"type": m.pii_type, "value": m.value, "masked_value": m.masked_value, "confidence": m.confidence,
+             "severity": m.severity, "context": m.context, "method": m.detection_method}
+            for m in engine.detect(doc.text)
+        ]
+        methods = {}
+        for f in findings:
+            methods[f["method"]] = methods.get(f["method"], 0) + 1
+        results.append({
+            "source": "crawl", "url": url, "title": f"Page {i}", "depth": i % 3,
+            "content_length": len(doc.text), "raw_content": doc.text[:3000],
+            "pii_count": len(findings), "pii_findings": findings, "detection_methods": methods,
+            "dedup": {"status": "unique"},
+            "fetch": {"status": 200, "bytes_downloaded": len(doc.text), "elapsed_ms": 41.7},
+        })
+        log += [f"[{i + 1}/{pages}] d{i % 3} {url}", f"  Content: {len(doc.text):,} chars",
+                f"  ⚠ {len(findings)} PII found [{', '.join(f'{k}:{v}' for k, v in methods.items())}]"]
+    scan = {
+        "scan_id": "bench01", "query": "CRAWL: https://example.org", "status": "completed",
+        "started_at": datetime.now().isoformat(), "completed_at": datetime.now().isoformat(),
+        "progress": 100, "findings": results, "log": log,
+        "total_pii": sum(r["pii_count"] for r in results), "overall_risk": "HIGH",
+    }
+    return scan, results, log
+
+
+def timed(fn, repeat: int):
+    """(median seconds, bytes produced) of ``repeat`` calls; ``fn`` returns the bytes it produced."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=5000)
+    parser.add_argument("--subscribers", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    scan, results, log = build_scan(args.pages, args.chars, args.seed)
+    findings = sum(r["pii_count"] for r in results)
+    print(f"scan: {args.pages} pages, {findings} findings, {len(log)} log lines "
+          f"(orjson {'installed' if fastjson.orjson is not None else 'NOT installed'})")
+
+    print("\nGET /api/scan/{id} (full record)")
+    cases = [("jsonable_encoder + JSONResponse", lambda: len(JSONResponse(jsonable_encoder(scan)).body))]
+    if fastjson.orjson is not None:
+        cases.append(("FastJSONResponse (orjson)", lambda: len(fastjson.FastJSONResponse(scan).body)))
+    cases.append(("FastJSONResponse (stdlib fallback)", lambda: len(fastjson._stdlib_dumps(scan).encode("utf-8"))))
+    base = None
+    for name, fn in cases:
+        seconds, size = timed(fn, args.repeat)
+        base = base or seconds
+        print(f"  {name:<36} {seconds * 1000:8.2f} ms  {size / 1e6:6.2f} MB  {base / seconds:5.1f}x")
+
+    # One scan's event stream: a log event per line and a result event per page.
+    events = [("log", {"message": line, "line": i}) for i, line in enumerate(log)]
+    events += [("result", result) for result in results]
+    print(f"\nSSE fan-out: {len(events)} events x {args.subscribers} subscribers")
+
+    def per_subscriber():
+        size = 0
+        for i, (event, data) in enumerate(events):
+            for _ in range(args.subscribers):
+                size += len(f"id: {i + 1}\nevent: {event}\ndata: {json.dumps(data)}\n\n")
+        return size
+
+    def encoded_once():
+        bus = EventBus(history=len(events))
+        size = 0
+        for event, data in events:
+            bus.publish("scan:bench", event, data)
+        for ev in bus.events("scan:bench"):
+            for _ in range(args.subscribers):
+                size += len(sse_frame(ev))
+        return size
+
+    base = None
+    for name, fn in (("json.dumps per subscriber", per_subscriber), ("encoded once at publish", encoded_once)):
+        seconds, size = timed(fn, max(1, args.repeat // 4))
+        base = base or seconds
+        print(f"  {name:<36} {seconds * 1000:8.2f} ms  {size / 1e6:6.2f} MB  {base / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
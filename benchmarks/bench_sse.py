@@ -0,0 +1,117 @@
+"""
+SSE Fan-out Benchmark — push delivery via EventBus vs. the old 0.5 s polling loop.
+
+Usage:
+    python benchmarks/bench_sse.py [--streams 1000] [--events 50] [--rate 20] [--idle 3]
+
+Each of ``--streams`` subscribers encodes every event as an SSE frame. The run
+publishes ``--events`` events at ``--rate`` per second, then stays idle for
+``--idle`` seconds. Reported: delivery latency (p50/p99), wakeups and CPU time
+while idle.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import EventBus, sse_frame  # noqa: E402
+
+POLL_SECONDS = 0.5
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def publish(emit, events, rate):
+    for i in range(events):
+        emit("log", {"i": i, "t": time.perf_counter()})
+        await asyncio.sleep(1 / rate)
+
+
+async def run_push(streams, events, rate, idle):
+    bus = EventBus()
+    topic = "scan:bench"
+    bus.publish(topic, "progress", {"t": time.perf_counter()})
+    latencies, wakeups = [], [0]
+
+    async def consume():
+        async for ev in bus.subscribe(topic, last_event_id=1, heartbeat=None):
+            wakeups[0] += 1
+            sse_frame(ev)
+            latencies.append(time.perf_counter() - ev.data["t"])
+
+    tasks = [asyncio.create_task(consume()) for _ in range(streams)]
+    await asyncio.sleep(0.1)
+    await publish(lambda event, data: bus.publish(topic, event, data), events, rate)
+    busy_wakeups = wakeups[0]
+    cpu0 = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - cpu0
+    bus.close(topic)
+    await asyncio.gather(*tasks)
+    return latencies, wakeups[0] - busy_wakeups, idle_cpu
+
+
+async def run_poll(streams, events, rate, idle):
+    log = []
+    done = [False]
+    latencies, wakeups = [], [0]
+
+    async def consume():
+        last_idx = 0
+        while not done[0]:
+            wakeups[0] += 1
+            for ev in log[last_idx:]:
+                f"event: {ev['event']}\ndata: {json.dumps(ev['data'])}\n\n"
+                latencies.append(time.perf_counter() - ev["data"]["t"])
+                last_idx += 1
+            await asyncio.sleep(POLL_SECONDS)
+
+    tasks = [asyncio.create_task(consume()) for _ in range(streams)]
+    await asyncio.sleep(0.1)
+    await publish(lambda event, data: log.append({"event": event, "data": data}), events, rate)
+    await asyncio.sleep(POLL_SECONDS)
+    busy_wakeups = wakeups[0]
+    cpu0 = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - cpu0
+    done[0] = True
+    await asyncio.gather(*tasks)
+    return latencies, wakeups[0] - busy_wakeups, idle_cpu
+
+
+def report(name, latencies, idle_wakeups, idle_cpu, idle):
+    print(
+        f"  {name:<6} delivered {len(latencies):>7,} | latency p50 {percentile(latencies, 50) * 1000:7.2f} ms"
+        f"  p99 {percentile(latencies, 99) * 1000:7.2f} ms  max {max(latencies, default=0) * 1000:7.2f} ms"
+        f" | idle: {idle_wakeups / idle:8,.0f} wakeups/s, CPU {idle_cpu * 1000:6.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--idle", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{args.streams} streams, {args.events} events at {args.rate:g}/s, {args.idle:g}s idle")
+    t0 = time.perf_counter()
+    latencies, idle_wakeups, idle_cpu = asyncio.run(run_push(args.streams, args.events, args.rate, args.idle))
+    report("push", latencies, idle_wakeups, idle_cpu, args.idle)
+    latencies, idle_wakeups, idle_cpu = asyncio.run(run_poll(args.streams, args.events, args.rate, args.idle))
+    report("poll", latencies, idle_wakeups, idle_cpu, args.idle)
+    print(f"  total {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Backend Check — runs the memory, SQLite and Redis state backends through the same operations and compares results.
+
+Usage:
+    python benchmarks/check_backends.py [--redis redis://127.0.0.1:6379/15]
+
+Without ``--redis`` the Redis backend talks to the RESP stand-in
+(``resp_standin.py``), started on a free local port. Every step's result is
+recorded per backend; the memory backend is the reference, and any
+difference is printed. Exits with status 1 on a mismatch.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resp_standin import Store, serve  # noqa: E402
+from state_backend import StateBackend, open_backend  # noqa: E402
+
+Step = Tuple[str, Any]
+
+
+def run_sequence(backend: StateBackend) -> List[Step]:
+    """The shared sequence; returns (step, result) pairs."""
+    results: List[Step] = []
+
+    def step(name: str, fn: Callable[[], Any]):
+        results.append((name, fn()))
+
+    # Values
+    step("get missing", lambda: backend.get("scans", "a"))
+    backend.put("scans", "a", {"status": "running", "findings": [], "progress": 10})
+    backend.put("scans", "b", {"status": "completed", "nested": {"n": 1, "unicode": "é"}}, ttl=1)
+    backend.put_json("scans", "c", '{"status":"queued"}')
+    step("get", lambda: backend.get("scans", "a"))
+    step("get put_json", lambda: backend.get("scans", "c"))
+    step("values", lambda: backend.values("scans"))
+    backend.put("scans", "a", {"status": "completed", "progress": 100})
+    step("get overwritten", lambda: backend.get("scans", "a"))
+    backend.delete("scans", "c")
+    step("get deleted", lambda: backend.get("scans", "c"))
+    step("other namespace", lambda: backend.values("monitors"))
+
+    # Event logs
+    topic = "monitor:m1"
+    step("unknown topic", lambda: backend.topic_state(topic))
+    step("last id of unknown topic", lambda: backend.last_event_id(topic))
+    backend.open_topic(topic)
+    step("opened topic", lambda: backend.topic_state(topic))
+    for event_id in (1, 2, 3):
+        backend.append_event(topic, event_id, "log", {"message": f"line {event_id}"})
+    # A second worker takes the topic over and continues the numbering.
+    last = backend.last_event_id(topic)
+    backend.append_event(topic, last + 1, "resumed", {"status": "running"})
+    backend.append_event_json(topic, last + 2, "log", '{"message":"after"}')
+    step("events", lambda: [(ev.id, ev.event, ev.data) for ev in backend.events(topic)])
+    step("events after 3", lambda: [ev.id for ev in backend.events(topic, 3)])
+    step("events after last", lambda: backend.events(topic, 5))
+    step("last id", lambda: backend.last_event_id(topic))
+    backend.close_topic(topic)
+    step("closed topic", lambda: backend.topic_state(topic))
+    backend.append_event("scan:s1", 1, "log", {})
+    step("topic known by its events", lambda: backend.topic_state("scan:s1"))
+
+    # Leases
+    step("claim", lambda: backend.claim("monitor:m1", "w1", 0.5))
+    step("claim held elsewhere", lambda: backend.claim("monitor:m1", "w2", 0.5))
+    step("renew", lambda: backend.claim("monitor:m1", "w1", 0.5))
+    backend.release("monitor:m1", "w2")
+    step("release by non-owner", lambda: backend.claim("monitor:m1", "w2", 0.5))
+    backend.release("monitor:m1", "w1")
+    step("claim after release", lambda: backend.claim("monitor:m1", "w2", 0.5))
+    time.sleep(0.6)
+    step("claim after expiry", lambda: backend.claim("monitor:m1", "w1", 0.5))
+
+    # Expiry (Redis TTLs are whole seconds)
+    time.sleep(0.6)
+    step("expired value", lambda: backend.get("scans", "b"))
+    step("values after expiry", lambda: sorted(backend.values("scans")))
+    return results
+
+
+def start_standin() -> str:
+    """Run the RESP stand-in on a daemon thread; returns its redis:// URL."""
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address: List[int] = []
+
+    async def main():
+        server = await asyncio.start_server(serve(Store()), "127.0.0.1", 0)
+        address.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=loop.run_until_complete, args=(main(),), daemon=True, name="resp-standin").start()
+    ready.wait(10)
+    return f"redis://127.0.0.1:{address[0]}/0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis", help="Redis URL to check instead of the stand-in (use an empty database)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{os.path.join(tmp, 'state.db')}",
+            "redis": args.redis or start_standin(),
+        }
+        runs = {}
+        for name, url in urls.items():
+            backend = open_backend(url)
+            try:
+                runs[name] = run_sequence(backend)
+            finally:
+                backend.close()
+
+    reference = runs["memory"]
+    mismatches = 0
+    for name in ("sqlite", "redis"):
+        for (step, expected), (_, got) in zip(reference, runs[name]):
+            if got != expected:
+                mismatches += 1
+                print(f"  {name}: {step}: expected {expected!r}, got {got!r}")
+    print(f"{len(reference)} steps on {', '.join(runs)}: " + (f"{mismatches} mismatches" if mismatches else "all agree"))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Fetch Scheduler Check — the half-open circuit probe survives callers cancelled while waiting for a host slot.
+
+Usage:
+    python benchmarks/check_fetch_scheduler.py
+
+A host whose circuit is half-open lets exactly one probe through. Each case
+cancels that probe while it waits (for the host's concurrency slot, or for
+its ``min_interval`` spacing) and then checks that the next request is let
+through as the new probe and closes the circuit. Exits with status 1 if a
+case fails.
+"""
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_scheduler import FetchScheduler, HostPolicy  # noqa: E402
+
+URL = "https://probe.example/page"
+
+
+def half_open(scheduler: FetchScheduler):
+    """Put the host's circuit where the next request becomes the half-open probe."""
+    state = scheduler._state(URL)
+    state.circuit = "open"
+    state.opened_at = time.monotonic() - state.policy.open_seconds
+
+
+async def ok() -> str:
+    return "ok"
+
+
+async def cancel_in_slot_wait() -> List[str]:
+    """The probe waits for the only slot, held by a request started before the circuit opened."""
+    scheduler = FetchScheduler(policies={}, default_policy=HostPolicy(max_concurrency=1, min_interval=0.0, max_retries=0))
+    release = asyncio.Event()
+
+    async def hold() -> str:
+        await release.wait()
+        return "held"
+
+    holder = asyncio.create_task(scheduler.run(URL, hold))
+    await asyncio.sleep(0.05)
+    half_open(scheduler)
+    probe = asyncio.create_task(scheduler.run(URL, ok))
+    await asyncio.sleep(0.05)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    # The holder still has the slot: the next request must queue as the new probe, not fast-fail.
+    problems = []
+    state = scheduler._state(URL)
+    if state.probe_in_flight:
+        problems.append(f"probe still marked in flight (circuit {state.circuit})")
+    following = asyncio.create_task(scheduler.run(URL, ok))
+    await asyncio.sleep(0.05)
+    release.set()
+    await holder
+    try:
+        await following
+    except Exception as exc:
+        problems.append(f"next request failed: {exc!r}")
+    return problems
+
+
+async def cancel_in_interval_wait() -> List[str]:
+    """The probe has a free slot but waits out the host's min_interval."""
+    scheduler = FetchScheduler(policies={}, default_policy=HostPolicy(max_concurrency=1, min_interval=0.5, max_retries=0))
+    await scheduler.run(URL, ok)
+    half_open(scheduler)
+    probe = asyncio.create_task(scheduler.run(URL, ok))
+    await asyncio.sleep(0.05)
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    return await after_cancel(scheduler)
+
+
+async def after_cancel(scheduler: FetchScheduler) -> List[str]:
+    state = scheduler._state(URL)
+    problems = []
+    if state.probe_in_flight:
+        problems.append(f"probe still marked in flight (circuit {state.circuit})")
+    try:
+        await scheduler.run(URL, ok)
+    except Exception as exc:
+        problems.append(f"next request failed: {exc!r}")
+    if state.circuit != "closed":
+        problems.append(f"circuit is {state.circuit} after a successful probe")
+    return problems
+
+
+def main():
+    cases: List[Callable[[], Awaitable[List[str]]]] = [cancel_in_slot_wait, cancel_in_interval_wait]
+    failed = 0
+    for case in cases:
+        problems = asyncio.run(case())
+        failed += bool(problems)
+        print(f"  {case.__name__:<26} " + ("; ".join(problems) if problems else "ok"))
+    print(f"{len(cases)} cases: " + (f"{failed} failed" if failed else "all pass"))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
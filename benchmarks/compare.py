@@ -0,0 +1,105 @@
+"""
+Benchmark Comparison — flags regressions between two ``benchmarks/run.py`` result files.
+
+Usage:
+    python benchmarks/compare.py BASE.json NEW.json [--threshold 0.10] [--p99-threshold 0.25] [--memory-threshold 0.20]
+
+For every case in both files it prints the change in p50, p99, throughput
+and peak memory. A case regresses when p50 or throughput gets worse by more
+than ``--threshold``, p99 (noisier) by more than ``--p99-threshold`` or peak
+memory by more than ``--memory-threshold``. Exits with status 1 if any case
+regressed, so it can gate CI. Differences in Python version, platform or
+installed detection layers are reported first, since they make the numbers
+incomparable.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# (result key, label, True when higher is better)
+METRICS = (
+    ("p50_ms", "p50", False),
+    ("p99_ms", "p99", False),
+    ("throughput", "thrpt", True),
+    ("peak_kb", "peak mem", False),
+)
+META_KEYS = ("python", "platform", "layers", "html_backends", "quick", "budget_seconds", "seed")
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(base: Optional[float], new: Optional[float]) -> Optional[float]:
+    """Relative change from base to new (0.1 = +10%)."""
+    if base is None or new is None or base == 0:
+        return None
+    return (new - base) / base
+
+
+def compare_case(base: Dict[str, Any], new: Dict[str, Any], thresholds: Dict[str, float]) -> Tuple[List[str], List[str]]:
+    """(formatted cells, names of metrics that regressed)."""
+    cells, regressed = [], []
+    for key, label, higher_is_better in METRICS:
+        delta = change(base.get(key), new.get(key))
+        if delta is None:
+            cells.append(f"{'n/a':>9}")
+            continue
+        worse = -delta if higher_is_better else delta
+        mark = ""
+        if worse > thresholds[key]:
+            regressed.append(label)
+            mark = "!"
+        elif worse < -thresholds[key]:
+            mark = "+"
+        cells.append(f"{delta:>+8.1%}{mark or ' '}")
+    return cells, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--p99-threshold", type=float, default=0.25)
+    parser.add_argument("--memory-threshold", type=float, default=0.20)
+    args = parser.parse_args()
+    thresholds = {
+        "p50_ms": args.threshold,
+        "throughput": args.threshold,
+        "p99_ms": args.p99_threshold,
+        "peak_kb": args.memory_threshold,
+    }
+
+    base, new = load(args.base), load(args.new)
+    print(f"base {base['meta'].get('commit')} ({base['meta'].get('timestamp')})")
+    print(f"new  {new['meta'].get('commit')} ({new['meta'].get('timestamp')})")
+    for key in META_KEYS:
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"  warning: {key} differs: {base['meta'].get(key)!r} -> {new['meta'].get(key)!r}")
+
+    print(f"\n  {'case':<34} " + " ".join(f"{label:>9}" for _, label, _ in METRICS))
+    regressions = []
+    for name in sorted(set(base["results"]) & set(new["results"])):
+        cells, regressed = compare_case(base["results"][name], new["results"][name], thresholds)
+        print(f"  {name:<34} " + " ".join(cells))
+        if regressed:
+            regressions.append((name, regressed))
+    for name in sorted(set(base["results"]) - set(new["results"])):
+        print(f"  {name:<34} (only in base)")
+    for name in sorted(set(new["results"]) - set(base["results"])):
+        print(f"  {name:<34} (new case)")
+
+    print("\n  ! worse beyond threshold, + better beyond threshold")
+    if regressions:
+        print(f"\n{len(regressions)} regressed case(s):")
+        for name, metrics in regressions:
+            print(f"  {name}: {', '.join(metrics)}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+HTML Corpus — deterministic, real-world-sized pages for HTML extraction benchmarks.
+
+Pages are generated from a fixed seed so every run (and every commit) sees the
+same bytes. Sizes and structure mirror what the scanner actually fetches: blog
+posts, news articles with heavy chrome, directory/listing pages, profile pages
+and script-heavy single-page apps.
+"""
+import random
+from typing import Dict, List
+
+WORDS = (
+    "data privacy report contact team office project release update customer support "
+    "security account profile service network engineer manager city street phone email "
+    "public record annual meeting community developer platform research policy access "
+    "information system board member review document archive portal online student"
+).split()
+
+FIRST_NAMES = ["Priya", "Arjun", "Maria", "James", "Wei", "Fatima", "Lucas", "Aisha", "Ravi", "Emma"]
+LAST_NAMES = ["Sharma", "Kumar", "Garcia", "Smith", "Chen", "Khan", "Silva", "Okafor", "Iyer", "Brown"]
+
+
+def _sentence(rng: random.Random, n: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(n)]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+
+def _person(rng: random.Random) -> str:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return (
+        f"{first} {last} &lt;{first.lower()}.{last.lower()}@example.com&gt; "
+        f"+91 9{rng.randint(1000, 9999)} {rng.randint(10000, 99999)}"
+    )
+
+
+def _chrome(rng: random.Random, links: int) -> str:
+    nav = "".join(f'<li><a href="/section/{i}">{rng.choice(WORDS).title()}</a></li>' for i in range(links))
+    return (
+        f'<header class="site-header"><div class="logo">Example</div><nav><ul>{nav}</ul></nav></header>'
+        f'<aside class="sidebar"><ul>{nav}</ul></aside>'
+    )
+
+
+def _footer(rng: random.Random) -> str:
+    cols = "".join(f"<div class='col'><h4>{rng.choice(WORDS)}</h4><p>{_sentence(rng)}</p></div>" for _ in range(4))
+    return f"<footer>{cols}<form><input name='q'><button>Go</button></form></footer>"
+
+
+def _script(rng: random.Random, kb: int) -> str:
+    body = "".join(f"var v{i}={rng.randint(0, 10**9)};" for i in range(kb * 40))
+    return f"<script>{body}</script>"
+
+
+def _style(kb: int) -> str:
+    rules = "".join(f".c{i}{{margin:{i % 17}px;padding:{i % 5}px;color:#{i % 4096:03x}}}" for i in range(kb * 25))
+    return f"<style>{rules}</style>"
+
+
+def _page(title: str, head: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>{title}</title>{head}</head><body>{body}</body></html>"
+    )
+
+
+def blog_post(rng: random.Random) -> str:
+    paras = "".join(f"<p>{' '.join(_sentence(rng) for _ in range(5))}</p>" for _ in range(30))
+    body = _chrome(rng, 20) + f"<main><article><h1>{_sentence(rng, 6)}</h1>{paras}" \
+        f"<p>Written by {_person(rng)}</p></article></main>" + _footer(rng)
+    return _page("Blog post", _style(8), body)
+
+
+def news_article(rng: random.Random) -> str:
+    paras = "".join(
+        f"<p>{' '.join(_sentence(rng) for _ in range(6))} <a href='/story/{i}'>More</a></p>" for i in range(80)
+    )
+    related = "".join(f"<div class='card'><img src='/i/{i}.jpg'><span>{_sentence(rng, 8)}</span></div>" for i in range(60))
+    body = _chrome(rng, 80) + f"<main><article>{paras}</article><section>{related}</section></main>" + _footer(rng)
+    return _page("News article", _style(40) + _script(rng, 60), body + _script(rng, 40))
+
+
+def directory_listing(rng: random.Random) -> str:
+    rows = "".join(
+        f"<tr><td>{i}</td><td>{_person(rng)}</td><td>{rng.choice(WORDS)} dept</td>"
+        f"<td>{rng.randint(1, 28)}/{rng.randint(1, 12)}/19{rng.randint(50, 99)}</td></tr>"
+        for i in range(2500)
+    )
+    body = _chrome(rng, 30) + f"<main><table><thead><tr><th>#</th><th>Person</th></tr></thead>" \
+        f"<tbody>{rows}</tbody></table></main>" + _footer(rng)
+    return _page("Staff directory", _style(10), body)
+
+
+def profile_page(rng: random.Random) -> str:
+    posts = "".join(
+        f"<div class='post'><span class='who'>@{rng.choice(FIRST_NAMES).lower()}_{i}</span>"
+        f"<p>{_sentence(rng, 20)}</p><time>{rng.randint(1, 59)}m</time></div>"
+        for i in range(300)
+    )
+    about = f"<section class='about'><h2>About</h2><p>{_person(rng)}</p><p>{_sentence(rng, 30)}</p></section>"
+    body = _chrome(rng, 40) + f"<main>{about}<div class='feed'>{posts}</div></main>" + _footer(rng)
+    return _page("Profile", _style(30) + _script(rng, 120), body + "<svg><path d='M0 0L10 10'/></svg>")
+
+
+def spa_shell(rng: random.Random) -> str:
+    state = "".join(f'"k{i}":"{_sentence(rng, 6)}",' for i in range(6000))
+    body = (
+        "<div id='root'><noscript>Enable JavaScript to run this app.</noscript>"
+        f"<div class='ssr'>{''.join(f'<p>{_sentence(rng)}</p>' for _ in range(40))}</div></div>"
+        f"<script>window.__STATE__={{{state}}};</script>" + _script(rng, 400)
+    )
+    return _page("App", _style(60), body)
+
+
+def malformed_page(rng: random.Random) -> str:
+    chunks = []
+    for i in range(400):
+        chunks.append(f"<div><p>{_sentence(rng)}<b>{_person(rng)}<i>{rng.choice(WORDS)}</p>")
+        if i % 7 == 0:
+            chunks.append("</div></div>")
+    return "<html><head><title>Broken page</title><body>" + "".join(chunks)
+
+
+GENERATORS = {
+    "blog_post": blog_post,
+    "news_article": news_article,
+    "directory_listing": directory_listing,
+    "profile_page": profile_page,
+    "spa_shell": spa_shell,
+    "malformed_page": malformed_page,
+}
+
+
+# Small fragments where extractors tend to disagree: text on both sides of a removed
+# element, comment or processing instruction must stay two separate lines.
+EDGE_CASES: Dict[str, str] = {
+    "script_tail": "<div>a<script>x</script>b</div>",
+    "noise_first_child": "<div><style>q</style>b<span>s</span>c</div>",
+    "noise_between_tails": "<div>a<nav>n</nav><span>s</span>b<style>q</style>c</div>",
+    "nested_noise": "<div>a<form>f<script>x</script>g</form>b</div>",
+    "comment": "<div>a<!-- c -->b</div>",
+    "comment_in_email": "<p>Mail jo<!-- x -->hn@example.com today</p>",
+    "comments_around_text": "<!-- top --><div><!--c-->a<!--d-->b<!--e--></div><!-- end -->",
+    "processing_instruction": "<p>a<?pi x?>b</p>",
+    "phone_around_script": "<p>Call +91 98765<script>track()</script>43210</p>",
+}
+
+
+def build_corpus(seed: int = 1337) -> Dict[str, str]:
+    """Return ``{page_name: html}`` for the whole corpus."""
+    corpus = {}
+    for i, (name, gen) in enumerate(GENERATORS.items()):
+        corpus[name] = gen(random.Random(seed + i))
+    return corpus
+
+
+def corpus_sizes(corpus: Dict[str, str]) -> List[str]:
+    return [f"{name}: {len(html.encode('utf-8')) / 1024:,.0f} KB" for name, html in corpus.items()]
+
+
+if __name__ == "__main__":
+    for line in corpus_sizes(build_corpus()):
+        print(line)
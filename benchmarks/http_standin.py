@@ -0,0 +1,162 @@
+"""
+HTTP Stand-in — local Tavily search API and web pages for running the scan pipeline offline.
+
+Usage:
+    python benchmarks/http_standin.py [--host 127.0.0.1] [--port 8766] [--latency-ms 20] [--page-chars 8000]
+
+``POST /search`` answers like Tavily: ``max_results`` hits for the query,
+each pointing at ``/page/<key>`` on this server with no ``raw_content``, so
+the scanner fetches and cleans every page. ``GET /page/<key>`` serves a
+synthetic HTML page (``SyntheticGenerator.html_page``) that depends only on
+the key, so a query always leads to the same bytes. Every response is held
+back ``--latency-ms`` to stand in for the network.
+
+``StandinServer`` runs the same server on a background thread for
+benchmarks (see ``benchmarks/run.py``).
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import SyntheticGenerator  # noqa: E402
+
+PAGE_CACHE_SIZE = 4096
+
+
+class Pages:
+    def __init__(self, page_chars: int, seed: int = 1337):
+        self.page_chars = page_chars
+        self.seed = seed
+        self._cache: Dict[str, bytes] = {}
+
+    def get(self, key: str) -> bytes:
+        page = self._cache.get(key)
+        if page is None:
+            if len(self._cache) >= PAGE_CACHE_SIZE:
+                self._cache.clear()
+            doc = SyntheticGenerator.for_key(key, seed=self.seed).html_page(target_chars=self.page_chars)
+            page = self._cache[key] = doc.text.encode("utf-8")
+        return page
+
+
+class _Handler:
+    def __init__(self, pages: Pages, latency: float):
+        self.pages = pages
+        self.latency = latency
+        self.base_url = ""
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode("latin-1").split("\r\n")
+            method, path, _ = lines[0].split(" ", 2)
+            headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+            body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+            self.requests += 1
+            status, content_type, payload = self.route(method, path, body)
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method: str, path: str, body: bytes) -> Tuple[str, str, bytes]:
+        if method == "POST" and path == "/search":
+            request = json.loads(body or b"{}")
+            query = request.get("query", "")
+            digest = hashlib.blake2b(query.encode("utf-8"), digest_size=6).hexdigest()
+            results = [
+                {
+                    "url": f"{self.base_url}/page/{digest}-{i}",
+                    "title": f"Result {i} for {query}",
+                    "content": f"Snippet {i} for {query}",
+                    "raw_content": "",
+                    "score": round(1 - i / 100, 2),
+                }
+                for i in range(int(request.get("max_results", 5)))
+            ]
+            return "200 OK", "application/json", json.dumps({"query": query, "results": results}).encode()
+        if method == "GET" and path.startswith("/page/"):
+            return "200 OK", "text/html; charset=utf-8", self.pages.get(path[len("/page/"):])
+        return "404 Not Found", "text/plain", b"not found"
+
+
+async def serve(host: str, port: int, latency_ms: float, page_chars: int, started: Optional[threading.Event] = None,
+                handler_out: Optional[list] = None):
+    handler = _Handler(Pages(page_chars), latency_ms / 1000)
+    server = await asyncio.start_server(handler.handle, host, port, backlog=1024)
+    bound_port = server.sockets[0].getsockname()[1]
+    handler.base_url = f"http://{host}:{bound_port}"
+    if handler_out is not None:
+        handler_out.append(handler)
+    if started is not None:
+        started.set()
+    async with server:
+        await server.serve_forever()
+
+
+class StandinServer:
+    """The stand-in on a daemon thread with its own event loop; ``port=0`` picks a free port."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 20.0, page_chars: int = 8000):
+        self._started = threading.Event()
+        self._handlers: list = []
+        self._loop = asyncio.new_event_loop()
+        args = (host, port, latency_ms, page_chars, self._started, self._handlers)
+        self._thread = threading.Thread(target=self._run, args=args, daemon=True, name="http-standin")
+        self._task: Optional[asyncio.Task] = None
+
+    def _run(self, *args):
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(serve(*args))
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+
+    def start(self) -> "StandinServer":
+        self._thread.start()
+        self._started.wait(10)
+        return self
+
+    @property
+    def base_url(self) -> str:
+        return self._handlers[0].base_url
+
+    @property
+    def requests(self) -> int:
+        return self._handlers[0].requests
+
+    def stop(self):
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        self._thread.join(5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--page-chars", type=int, default=8000)
+    args = parser.parse_args()
+    print(f"Tavily stand-in at http://{args.host}:{args.port}/search, pages under /page/")
+    asyncio.run(serve(args.host, args.port, args.latency_ms, args.page_chars))
+
+
+if __name__ == "__main__":
+    main()
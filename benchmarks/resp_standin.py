@@ -0,0 +1,205 @@
+"""
+RESP Stand-in — tiny in-memory Redis-protocol server for running the scanner
+with ``STATE_BACKEND_URL = "redis://127.0.0.1:6390/0"`` without a real Redis.
+
+Usage:
+    python benchmarks/resp_standin.py [--host 127.0.0.1] [--port 6390]
+
+Implements only the commands the ``redis://`` state backend issues: PING,
+AUTH, SELECT, GET, SET (EX/PX/NX), MGET, DEL, EXISTS, EXPIRE, PEXPIRE, SADD,
+SREM, SMEMBERS, RPUSH, LRANGE, ZADD, ZRANGEBYSCORE and ZREVRANGE. Keys are shared across databases and
+expiry is checked lazily on access.
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class Store:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expires: Dict[str, float] = {}
+
+    def _live(self, key: str) -> Optional[Any]:
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline < time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def _expire(self, key: str, seconds: float) -> int:
+        if self._live(key) is None:
+            return 0
+        self.expires[key] = time.monotonic() + seconds
+        return 1
+
+    def execute(self, cmd: str, args: List[str]) -> Any:
+        if cmd == "PING":
+            return Status("PONG")
+        if cmd in ("AUTH", "SELECT"):
+            return Status("OK")
+        if cmd == "GET":
+            value = self._live(args[0])
+            return value if value is None or isinstance(value, str) else WrongType
+        if cmd == "MGET":
+            return [v if isinstance(v, str) else None for v in map(self._live, args)]
+        if cmd == "SET":
+            key, value, opts = args[0], args[1], [a.upper() for a in args[2:]]
+            if "NX" in opts and self._live(key) is not None:
+                return None
+            self.data[key] = value
+            self.expires.pop(key, None)
+            for unit, scale in (("EX", 1.0), ("PX", 0.001)):
+                if unit in opts:
+                    self.expires[key] = time.monotonic() + int(args[2 + opts.index(unit) + 1]) * scale
+            return Status("OK")
+        if cmd == "DEL":
+            removed = sum(1 for key in args if self._live(key) is not None)
+            for key in args:
+                self.data.pop(key, None)
+                self.expires.pop(key, None)
+            return removed
+        if cmd == "EXISTS":
+            return sum(1 for key in args if self._live(key) is not None)
+        if cmd == "EXPIRE":
+            return self._expire(args[0], int(args[1]))
+        if cmd == "PEXPIRE":
+            return self._expire(args[0], int(args[1]) / 1000)
+        if cmd == "SADD":
+            members = self._live(args[0]) or set()
+            before = len(members)
+            members.update(args[1:])
+            self.data[args[0]] = members
+            return len(members) - before
+        if cmd == "SREM":
+            members = self._live(args[0]) or set()
+            before = len(members)
+            members.difference_update(args[1:])
+            return before - len(members)
+        if cmd == "SMEMBERS":
+            return sorted(self._live(args[0]) or ())
+        if cmd == "RPUSH":
+            items = self._live(args[0])
+            if items is None:
+                items = self.data[args[0]] = []
+            items.extend(args[1:])
+            return len(items)
+        if cmd == "LRANGE":
+            items = self._live(args[0]) or []
+            start, stop = int(args[1]), int(args[2])
+            stop = len(items) if stop == -1 else stop + 1
+            return items[start:stop]
+        if cmd == "ZADD":
+            zset = self._live(args[0])
+            if zset is None:
+                zset = self.data[args[0]] = {}
+            added = 0
+            for score, member in zip(args[1::2], args[2::2]):
+                added += member not in zset
+                zset[member] = float(score)
+            return added
+        if cmd == "ZRANGEBYSCORE":
+            low, high = _score_bound(args[1]), _score_bound(args[2])
+            members = sorted((self._live(args[0]) or {}).items(), key=lambda item: (item[1], item[0]))
+            return [m for m, score in members if low(score, "min") and high(score, "max")]
+        if cmd == "ZREVRANGE":
+            members = sorted((self._live(args[0]) or {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+            start, stop = int(args[1]), int(args[2])
+            members = members[start:len(members) if stop == -1 else stop + 1]
+            if "WITHSCORES" in (a.upper() for a in args[3:]):
+                return [x for m, score in members for x in (m, repr(score))]
+            return [m for m, _ in members]
+        return Error(f"ERR unknown command '{cmd}'")
+
+
+def _score_bound(spec: str):
+    """ZRANGEBYSCORE bound: "-inf", "+inf", "5" (inclusive) or "(5" (exclusive)."""
+    exclusive = spec.startswith("(")
+    value = float(spec.lstrip("("))
+
+    def check(score: float, side: str) -> bool:
+        if side == "min":
+            return score > value if exclusive else score >= value
+        return score < value if exclusive else score <= value
+
+    return check
+
+
+class Status(str):
+    pass
+
+
+class Error(str):
+    pass
+
+
+WrongType = Error("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+
+def encode(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Error):
+        return b"-" + value.encode() + b"\r\n"
+    if isinstance(value, Status):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+    data = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[Tuple[str, List[str]]]:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        parts = line.decode().split()
+        return (parts[0].upper(), parts[1:]) if parts else ("PING", [])
+    args = []
+    for _ in range(int(line[1:-2])):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2].decode())
+    return args[0].upper(), args[1:]
+
+
+def serve(store: Store):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await read_command(reader)
+                if command is None:
+                    break
+                writer.write(encode(store.execute(*command)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def main_async(host: str, port: int):
+    server = await asyncio.start_server(serve(Store()), host, port)
+    print(f"RESP stand-in listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Benchmark Suite — PIIEngine layers, HTML cleaning and the end-to-end scan, saved for comparison between commits.
+
+Usage:
+    python benchmarks/run.py [--suite detect,clean,scan] [--quick] [--budget 2] [--out FILE]
+    python benchmarks/compare.py benchmarks/results/BASE.json benchmarks/results/NEW.json
+
+Cases:
+
+- ``detect/<layer>/<size>/d<density>``: one PIIEngine layer (regex, spacy,
+  transformer; "all" is ``detect`` itself) on a synthetic page of 1 KB to
+  1 MB with the given share of PII-bearing sentences. Layers whose model is
+  not installed are skipped.
+- ``clean/<backend>``: ``clean_html`` per page over the ``html_corpus`` pages,
+  for every installed extractor.
+- ``scan/<n>-results[-x<k>]``: ``WebScanner.scan`` against the local
+  stand-in (``http_standin.py``: Tavily search plus synthetic pages with
+  ``--latency-ms`` per response), ``k`` scans at a time. Host politeness
+  delays are turned off so the pipeline, not the rate limit, is measured.
+  ``scan`` analyzes its results one after another with a 0.2 s pause
+  between them, which bounds a single scan's pages/s; the ``-x<k>`` cases
+  show how far concurrent scans get past that.
+
+Each case reports throughput, p50/p99 latency per run and peak memory
+(tracemalloc, in a separate untimed pass; model tensors allocated outside
+Python are not counted). Results are written as JSON together with the
+commit, Python version and installed layers, by default to
+``benchmarks/results/<commit>.json``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fetch_scheduler import HostPolicy  # noqa: E402
+from html_corpus import build_corpus  # noqa: E402
+from html_extract import available_extractors, clean_html  # noqa: E402
+from http_standin import StandinServer  # noqa: E402
+from pii_engine import PIIEngine  # noqa: E402
+from synthetic_data import SyntheticGenerator  # noqa: E402
+from web_scanner import WebScanner  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SIZES = {"1KB": 1_000, "10KB": 10_000, "100KB": 100_000, "1MB": 1_000_000}
+QUICK_SIZES = ("1KB", "100KB")
+DENSITIES = (0.05, 0.3)
+SCAN_CASES = ((5, 1), (20, 1), (20, 8))     # (max_results, concurrent scans)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(timings: List[float], units: float, unit: str, peak_bytes: Optional[int]) -> Dict[str, Any]:
+    """One case's result; ``units`` is the work done per run (bytes, pages...)."""
+    total = sum(timings)
+    return {
+        "runs": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "mean_ms": round(total / len(timings) * 1000, 3),
+        "throughput": round(units * len(timings) / total, 3) if total else None,
+        "unit": f"{unit}/s",
+        "peak_kb": round(peak_bytes / 1024, 1) if peak_bytes is not None else None,
+    }
+
+
+def timed_runs(fn: Callable[[], Any], budget: float, min_runs: int = 3, max_runs: int = 1000) -> List[float]:
+    """Run ``fn`` until ``budget`` seconds have passed (at least ``min_runs`` times)."""
+    timings: List[float] = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak Python heap growth (bytes) during one call of ``fn``."""
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def report(name: str, result: Dict[str, Any]):
+    peak = f"{result['peak_kb']:>10,.0f} KB" if result["peak_kb"] is not None else ""
+    print(f"  {name:<34} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+          f"{result['throughput']:>12,.1f} {result['unit']:<10}{peak}", flush=True)
+
+
+# ── Suites ──
+
+def bench_detect(engine: PIIEngine, args) -> Dict[str, Dict[str, Any]]:
+    layers = {"regex": engine._detect_regex}
+    if engine.nlp:
+        layers["spacy"] = engine._detect_spacy
+    if engine.ner_pipe:
+        layers["transformer"] = engine._detect_transformer
+    layers["all"] = lambda text: engine.detect(text, max_length=len(text))
+
+    results = {}
+    sizes = QUICK_SIZES if args.quick else tuple(SIZES)
+    for density in DENSITIES:
+        for size in sizes:
+            text = SyntheticGenerator(args.seed, pii_density=density).page(target_chars=SIZES[size])
+            text = text.text[:SIZES[size]]
+            for layer, detect in layers.items():
+                name = f"detect/{layer}/{size}/d{density}"
+                timings = timed_runs(lambda: detect(text), args.budget, min_runs=1 if size == "1MB" else 3)
+                results[name] = summarize(timings, len(text.encode("utf-8")) / 1e6, "MB", peak_memory(lambda: detect(text)))
+                report(name, results[name])
+    return results
+
+
+def bench_clean(args) -> Dict[str, Dict[str, Any]]:
+    corpus = build_corpus(args.seed)
+    mb = sum(len(html.encode("utf-8")) for html in corpus.values()) / 1e6
+    results = {}
+    for backend in available_extractors():
+        def clean_all():
+            for html in corpus.values():
+                clean_html(html, backend)
+
+        # Passes over the whole corpus, timed per page.
+        per_page: List[float] = []
+        deadline = time.perf_counter() + args.budget
+        while not per_page or time.perf_counter() < deadline:
+            for html in corpus.values():
+                t0 = time.perf_counter()
+                clean_html(html, backend)
+                per_page.append(time.perf_counter() - t0)
+        result = summarize(per_page, mb / len(corpus), "MB", peak_memory(clean_all))
+        results[f"clean/{backend}"] = result
+        report(f"clean/{backend}", result)
+    return results
+
+
+def bench_scan(engine: PIIEngine, args) -> Dict[str, Dict[str, Any]]:
+    server = StandinServer(latency_ms=args.latency_ms, page_chars=args.page_chars).start()
+    scanner = WebScanner(search_url=f"{server.base_url}/search")
+    scanner.scheduler.default_policy = HostPolicy(max_concurrency=64, min_interval=0.0, max_retries=0)
+    loop = asyncio.new_event_loop()
+    counter = [0]
+
+    def scan_batch(max_results: int, concurrent: int) -> int:
+        async def one():
+            counter[0] += 1
+            # A fresh query each time: new pages, so no cache or near-duplicate reuse.
+            results = await scanner.scan(f"benchmark query {counter[0]}", engine, max_results)
+            return sum(1 for r in results if "error" not in r)
+
+        async def batch():
+            return sum(await asyncio.gather(*(one() for _ in range(concurrent))))
+
+        return loop.run_until_complete(batch())
+
+    results = {}
+    try:
+        for max_results, concurrent in SCAN_CASES:
+            if args.quick and concurrent > 1:
+                continue
+            name = f"scan/{max_results}-results" + (f"-x{concurrent}" if concurrent > 1 else "")
+            pages = scan_batch(max_results, concurrent)     # warm-up; also checks the stand-in answers
+            if pages != max_results * concurrent:
+                raise RuntimeError(f"{name}: expected {max_results * concurrent} pages, got {pages}")
+            timings = timed_runs(lambda: scan_batch(max_results, concurrent), args.budget)
+            result = summarize(timings, max_results * concurrent, "pages", peak_memory(lambda: scan_batch(max_results, concurrent)))
+            results[name] = result
+            report(name, result)
+    finally:
+        scanner.close()
+        loop.close()
+        server.stop()
+    return results
+
+
+# ── Metadata and output ──
+
+def _git(*cmd: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def metadata(engine: PIIEngine, args) -> Dict[str, Any]:
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    return {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "layers": ["regex"] + (["spacy"] if engine.nlp else []) + (["transformer"] if engine.ner_pipe else []),
+        "html_backends": available_extractors(),
+        "quick": args.quick,
+        "budget_seconds": args.budget,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suite", default="detect,clean,scan", help="comma-separated: detect, clean, scan")
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and no concurrent scans")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of timed runs per case")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stand-in response delay")
+    parser.add_argument("--page-chars", type=int, default=8000, help="stand-in page size")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    args = parser.parse_args()
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = set(suites) - {"detect", "clean", "scan"}
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    engine = PIIEngine()
+    meta = metadata(engine, args)
+    print(f"commit {meta['commit']}{' (dirty)' if meta['dirty'] else ''} | Python {meta['python']} | "
+          f"layers {', '.join(meta['layers'])}")
+    print(f"  {'case':<34} {'p50 ms':>10} {'p99 ms':>10} {'throughput':>12}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    started = time.perf_counter()
+    if "detect" in suites:
+        results.update(bench_detect(engine, args))
+    if "clean" in suites:
+        results.update(bench_clean(args))
+    if "scan" in suites:
+        results.update(bench_scan(engine, args))
+    meta["elapsed_seconds"] = round(time.perf_counter() - started, 1)
+    # ru_maxrss is KB on Linux, bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    meta["max_rss_kb"] = maxrss // 1024 if sys.platform == "darwin" else maxrss
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{meta['commit']}{'-dirty' if meta['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"\n{len(results)} cases in {meta['elapsed_seconds']} s, max RSS {meta['max_rss_kb'] / 1024:,.0f} MB -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compression — gzip/brotli response compression middleware.
+
+Picks brotli when the client accepts it and the ``brotli`` package is
+installed, gzip otherwise. Small responses and already-encoded or SSE
+responses pass through unchanged; streamed bodies (NDJSON) are compressed
+chunk by chunk with a flush after each, so lines still arrive as they are
+produced.
+"""
+import zlib
+from typing import Any, Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+MINIMUM_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Streams whose consumers need every event immediately; compression would only add buffering.
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self):
+        self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self):
+        self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._c.process(data)
+        return out + (self._c.finish() if final else self._c.flush())
+
+
+def _accepted(header: str) -> List[str]:
+    """Codings the client accepts (q=0 excluded)."""
+    codings = []
+    for part in header.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        codings.append(name.strip())
+    return codings
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+        codings = _accepted(accept)
+        if brotli is not None and "br" in codings:
+            make = _Brotli
+        elif "gzip" in codings:
+            make = _Gzip
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Dict[str, Any]] = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                media_type = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip()
+                passthrough = b"content-encoding" in headers or media_type in EXCLUDED_TYPES
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if compressor is None:
+                if not more and len(body) < self.minimum_size:
+                    # Too small to be worth it: send as is.
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = make()
+                headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"content-length"]
+                headers += [(b"content-encoding", compressor.encoding.encode()), (b"vary", b"Accept-Encoding")]
+                await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressor.compress(body, not more), "more_body": more})
+
+        await self.app(scope, receive, send_compressed)
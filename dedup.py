@@ -0,0 +1,175 @@
+"""
+Dedup — SimHash fingerprints to recognise near-duplicate pages and reuse their PII findings.
+
+Mirrors, syndicated copies and paginated variants of a page produce texts whose
+64-bit SimHash differs in only a few bits. The index keeps the fingerprints of
+recently analyzed pages (within a scan and across scans) together with their
+findings, so the scanner can reuse them for exact copies and only analyze the
+changed lines of near copies.
+"""
+import hashlib
+import re
+import time
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Max Hamming distance between SimHashes still considered the same document.
+MAX_DISTANCE = 3
+# Bands for the LSH lookup; MAX_DISTANCE < BANDS guarantees one band matches exactly.
+BANDS = 4
+BAND_BITS = 64 // BANDS
+# Texts shorter than this only match exact copies; their SimHash is too noisy.
+MIN_NEAR_CHARS = 500
+SHINGLE_SIZE = 3
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    """64-bit SimHash over lower-cased word shingles."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles: Iterable[str] = [" ".join(words)]
+    else:
+        shingles = (" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+
+    digests = b"".join(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest() for sh in shingles)
+    total = len(digests) // 8
+    # Per-bit vote: count how often each byte value occurs at each byte
+    # position (C speed), then expand the 256 buckets into bit counts.
+    fp = 0
+    for pos in range(8):
+        ones = [0] * 8
+        for value, count in Counter(digests[pos::8]).items():
+            for bit in range(8):
+                if value >> bit & 1:
+                    ones[bit] += count
+        for bit in range(8):
+            if ones[bit] * 2 > total:
+                fp |= 1 << (pos * 8 + bit)
+    return fp
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _line_hashes(text: str) -> array:
+    return array("Q", sorted({_hash64(line.strip()) for line in text.splitlines() if line.strip()}))
+
+
+@dataclass
+class Fingerprint:
+    simhash: int
+    content_hash: str
+    lines: array
+    length: int
+
+
+def fingerprint(text: str) -> Fingerprint:
+    return Fingerprint(
+        simhash=simhash(text),
+        content_hash=hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest(),
+        lines=_line_hashes(text),
+        length=len(text),
+    )
+
+
+@dataclass
+class _Entry:
+    fp: Fingerprint
+    url: str
+    findings: List[Dict]
+    added_at: float = field(default_factory=time.monotonic)
+
+
+class NearDuplicateIndex:
+    """Bounded, TTL-evicting index of recently analyzed documents."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 6 * 3600, max_distance: int = MAX_DISTANCE):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = min(max_distance, BANDS - 1)
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._by_hash: Dict[str, int] = {}
+        self._bands: List[Dict[int, set]] = [dict() for _ in range(BANDS)]
+        self._next_id = 0
+
+    @staticmethod
+    def _band_keys(fp: int) -> List[int]:
+        mask = (1 << BAND_BITS) - 1
+        return [(fp >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        if self._by_hash.get(entry.fp.content_hash) == entry_id:
+            del self._by_hash[entry.fp.content_hash]
+        for band, key in zip(self._bands, self._band_keys(entry.fp.simhash)):
+            ids = band.get(key)
+            if ids:
+                ids.discard(entry_id)
+                if not ids:
+                    del band[key]
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if entry.added_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._remove(entry_id)
+
+    def lookup(self, fp: Fingerprint) -> Tuple[Optional[str], Optional[_Entry], int]:
+        """Return ("exact" | "near" | None, matching entry, Hamming distance)."""
+        self._expire()
+        entry_id = self._by_hash.get(fp.content_hash)
+        if entry_id is not None:
+            entry = self._entries[entry_id]
+            entry.added_at = time.monotonic()
+            self._entries.move_to_end(entry_id)
+            return "exact", entry, 0
+        if fp.length < MIN_NEAR_CHARS:
+            return None, None, 64
+
+        best, best_dist = None, self.max_distance + 1
+        candidates = set()
+        for band, key in zip(self._bands, self._band_keys(fp.simhash)):
+            candidates.update(band.get(key, ()))
+        for cid in candidates:
+            entry = self._entries[cid]
+            if entry.fp.length < MIN_NEAR_CHARS:
+                continue
+            dist = hamming(fp.simhash, entry.fp.simhash)
+            if dist < best_dist:
+                best, best_dist = entry, dist
+        if best is None:
+            return None, None, 64
+        return "near", best, best_dist
+
+    def add(self, fp: Fingerprint, url: str, findings: List[Dict]):
+        if fp.content_hash in self._by_hash:
+            return
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(fp=fp, url=url, findings=findings)
+        self._by_hash[fp.content_hash] = entry_id
+        for band, key in zip(self._bands, self._band_keys(fp.simhash)):
+            band.setdefault(key, set()).add(entry_id)
+        self._expire()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def changed_lines(text: str, previous: Fingerprint) -> List[str]:
+    """Lines of ``text`` that do not occur in the previously analyzed document."""
+    known = set(previous.lines)
+    return [line for line in text.splitlines() if line.strip() and _hash64(line.strip()) not in known]
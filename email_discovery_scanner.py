@@ -1,16 +1,134 @@
 """
 Email Discovery Scanner — Searches for social footprints and leakages via email.
 """
+import asyncio
+import csv
+import json
 import logging
-from typing import List, Dict
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from crawler import SeenSet
 
 logger = logging.getLogger(__name__)
 
+# Sites searched for the address, one narrow query per site.
+DISCOVERY_SITES = ["linkedin.com", "github.com", "facebook.com", "instagram.com", "pastebin.com", "twitter.com", "x.com"]
+DISCOVERY_RESULTS_PER_SITE = 2
+
+# Bulk discovery limits.
+BULK_MAX_EMAILS = 20000
+BULK_CONCURRENCY = 4
+BULK_EMAIL_TIMEOUT = 120.0
+# A progress line is emitted after this many addresses or seconds, whichever comes first.
+BULK_PROGRESS_EVERY = 25
+BULK_PROGRESS_SECONDS = 2.0
+
+EMAIL_RE = re.compile(
+    r"^[a-z0-9.!#$%&'*+/=?^_`{|}~-]+@"
+    r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)+$"
+)
+EMAIL_COLUMNS = ("email", "e-mail", "email_address", "emailaddress", "mail")
+
+
+def normalize_email(value: Any) -> Optional[str]:
+    """Lower-cased, trimmed address, or None if it does not look like an email."""
+    if not isinstance(value, str):
+        return None
+    email = value.strip().strip("<>\"' ").lower()
+    if email.startswith("mailto:"):
+        email = email[7:]
+    if len(email) > 254 or ".." in email or not EMAIL_RE.match(email):
+        return None
+    return email
+
+
+def _csv_records(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    column = None
+    for row_no, row in enumerate(csv.reader(lines), start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if row_no == 1:
+            header = [cell.lower() for cell in cells]
+            for name in EMAIL_COLUMNS:
+                if name in header:
+                    column = header.index(name)
+                    break
+            if column is not None:
+                continue
+        if column is not None:
+            yield row_no, cells[column] if column < len(cells) else None
+        else:
+            yield row_no, next((cell for cell in cells if "@" in cell), cells[0])
+
+
+def _ndjson_records(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            yield line_no, None
+            continue
+        yield line_no, item.get("email") if isinstance(item, dict) else item
+
+
+def iter_email_records(lines: Iterable[str], fmt: str = "auto") -> Iterator[Tuple[int, Any]]:
+    """
+    Yield ``(line_no, raw_value)`` for each record of a CSV or NDJSON list.
+
+    CSV uses the "email" column when there is a header row, otherwise the first
+    cell containing "@". NDJSON lines may be strings or objects with "email".
+    ``fmt="auto"`` picks NDJSON when the first non-blank line starts with "{" or '"'.
+    """
+    lines = iter(lines)
+    if fmt == "auto":
+        head: List[str] = []
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                break
+        first = head[-1].lstrip("\ufeff").lstrip() if head else ""
+        fmt = "ndjson" if first[:1] in ("{", '"') else "csv"
+        lines = _chain(head, lines)
+    lines = _strip_bom(lines)
+    if fmt == "ndjson":
+        return _ndjson_records(lines)
+    return _csv_records(lines)
+
+
+def _chain(head: List[str], rest: Iterator[str]) -> Iterator[str]:
+    yield from head
+    yield from rest
+
+
+def _strip_bom(lines: Iterator[str]) -> Iterator[str]:
+    for i, line in enumerate(lines):
+        yield line.lstrip("\ufeff") if i == 0 else line
+
+
+def _compact_source(res: Dict) -> Dict:
+    """A discovery hit without page content and with masked values only."""
+    return {
+        "url": res.get("url"),
+        "title": res.get("title"),
+        "pii_count": res.get("pii_count", 0),
+        "findings": [
+            {k: f.get(k) for k in ("type", "masked_value", "severity", "confidence", "method")}
+            for f in res.get("pii_findings", [])
+        ],
+    }
+
+
 class EmailDiscoveryScanner:
     def __init__(self, web_scanner):
         self.web_scanner = web_scanner
 
-    async def scan_email(self, email: str, engine) -> List[Dict]:
+    async def scan_email(self, email: str, engine, cache: bool = False) -> List[Dict]:
         """
         Deep scan for an email address across the web.
         Finds associated profiles, breaches (mentions), and other PII.
@@ -18,11 +136,13 @@ class EmailDiscoveryScanner:
         email = email.lower().strip()
         logger.info(f"Initiating Email Identity Discovery for: {email}")
         
-        # Targeted discovery query
-        discovery_query = f'"{email}" OR "email: {email}" site:linkedin.com OR site:github.com OR site:facebook.com OR site:instagram.com OR site:pastebin.com OR site:twitter.com OR site:x.com'
+        # Targeted discovery queries
+        discovery_queries = [f'"{email}" OR "email: {email}" site:{site}' for site in DISCOVERY_SITES]
         
-        # Execute broad web search
-        web_results = await self.web_scanner.scan(discovery_query, engine, max_results=7)
+        # Execute the fan-out web search
+        web_results = await self.web_scanner.scan_many(
+            discovery_queries, engine, max_results=DISCOVERY_RESULTS_PER_SITE, cache=cache
+        )
         
         all_results = []
         for res in web_results:
@@ -36,3 +156,111 @@ class EmailDiscoveryScanner:
             logger.info(f"No public web associations found for {email}")
             
         return all_results
+
+    async def scan_emails(
+        self,
+        records: Iterable[Tuple[int, Any]],
+        engine,
+        concurrency: int = BULK_CONCURRENCY,
+        max_emails: int = BULK_MAX_EMAILS,
+        timeout: float = BULK_EMAIL_TIMEOUT,
+    ) -> AsyncIterator[Dict]:
+        """
+        Bulk discovery over ``(line_no, raw_value)`` records (see ``iter_email_records``).
+
+        Addresses are normalized and deduplicated, then scanned by ``concurrency``
+        workers sharing the web scanner's search and page caches. Yields events
+        as they happen: "result" (one per address, findings masked), "invalid",
+        "error", periodic "progress" and a final "summary". Input is pulled
+        through bounded queues, so memory stays flat however long the list is.
+        """
+        concurrency = max(1, concurrency)
+        work: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        out: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+        counts = {"read": 0, "queued": 0, "invalid": 0, "duplicates": 0, "scanned": 0, "failed": 0}
+        seen = SeenSet()
+        truncated = False
+
+        async def produce():
+            nonlocal truncated
+            try:
+                for line_no, raw in records:
+                    counts["read"] += 1
+                    email = normalize_email(raw)
+                    if email is None:
+                        counts["invalid"] += 1
+                        await out.put({"type": "invalid", "line": line_no, "value": str(raw)[:200] if raw else None})
+                        continue
+                    if not seen.add(email):
+                        counts["duplicates"] += 1
+                        continue
+                    if counts["queued"] >= max_emails:
+                        truncated = True
+                        break
+                    counts["queued"] += 1
+                    await work.put((line_no, email))
+                    # Parsing is synchronous; let the workers run between records.
+                    await asyncio.sleep(0)
+            except Exception as e:
+                await out.put({"type": "error", "error": f"Input error after {counts['read']} records: {e}"})
+            for _ in range(concurrency):
+                await work.put(None)
+
+        async def consume():
+            while True:
+                item = await work.get()
+                if item is None:
+                    await out.put(None)
+                    return
+                line_no, email = item
+                started = time.monotonic()
+                event = {"type": "result", "line": line_no, "email": email}
+                try:
+                    results = await asyncio.wait_for(self.scan_email(email, engine, cache=True), timeout)
+                except asyncio.TimeoutError:
+                    counts["failed"] += 1
+                    event["error"] = f"timed out after {timeout:.0f}s"
+                except Exception as e:
+                    counts["failed"] += 1
+                    logger.warning(f"Bulk discovery failed for {email}: {e}")
+                    event["error"] = str(e) or e.__class__.__name__
+                else:
+                    severity: Dict[str, int] = {}
+                    for res in results:
+                        for f in res.get("pii_findings", []):
+                            severity[f["severity"]] = severity.get(f["severity"], 0) + 1
+                    event["total_pii"] = sum(res.get("pii_count", 0) for res in results)
+                    event["by_severity"] = severity
+                    event["sources"] = [_compact_source(res) for res in results]
+                counts["scanned"] += 1
+                event["elapsed_ms"] = round((time.monotonic() - started) * 1000)
+                await out.put(event)
+
+        started = time.monotonic()
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume()) for _ in range(concurrency)]
+        last_progress, last_scanned = started, 0
+        try:
+            running = concurrency
+            while running:
+                event = await out.get()
+                if event is None:
+                    running -= 1
+                    continue
+                yield event
+                now = time.monotonic()
+                if event["type"] == "result" and (
+                    counts["scanned"] - last_scanned >= BULK_PROGRESS_EVERY or now - last_progress >= BULK_PROGRESS_SECONDS
+                ):
+                    last_progress, last_scanned = now, counts["scanned"]
+                    yield {"type": "progress", **counts, "pending": counts["queued"] - counts["scanned"]}
+            yield {
+                "type": "summary",
+                **counts,
+                "truncated": truncated,
+                "max_emails": max_emails,
+                "elapsed_seconds": round(time.monotonic() - started, 2),
+            }
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
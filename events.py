@@ -0,0 +1,206 @@
+"""
+Events — in-process pub/sub that pushes scan and monitor events to SSE streams.
+
+Each topic ("scan:<id>", "monitor:<id>") keeps a bounded history of numbered
+events. Subscribers get new events pushed into a bounded queue as they are
+published, can resume after a ``Last-Event-ID``, receive heartbeats while the
+topic is idle, and never block publishers: a subscriber whose queue overflows
+is resynchronized from the topic history (or told how many events it missed).
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from fastjson import dumps
+from storage import approx_size
+
+EVENT_HISTORY = 5000
+SUBSCRIBER_QUEUE = 256
+HEARTBEAT_SECONDS = 15.0
+
+_CLOSED = object()
+
+
+@dataclass
+class Event:
+    id: Optional[int]
+    event: str
+    data: Any
+    # The encoded SSE frame, built once and shared by every subscriber.
+    frame: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+
+class _Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def push(self, item: Any):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class _Topic:
+    def __init__(self, history: int):
+        self.events: Deque[Event] = deque(maxlen=history)
+        self.next_id = 1
+        self.closed = False
+        self.subscribers: Set[_Subscriber] = set()
+
+
+class EventBus:
+    def __init__(self, history: int = EVENT_HISTORY, queue_size: int = SUBSCRIBER_QUEUE):
+        self.history = history
+        self.queue_size = queue_size
+        self._topics: Dict[str, _Topic] = {}
+        self.counts = {"published": 0, "delivered": 0, "overflows": 0, "heartbeats": 0}
+
+    def __contains__(self, topic: str) -> bool:
+        return topic in self._topics
+
+    def _topic(self, topic: str) -> _Topic:
+        t = self._topics.get(topic)
+        if t is None:
+            t = self._topics[topic] = _Topic(self.history)
+        return t
+
+    def seed(self, topic: str, last_id: int):
+        """Number the topic's next events after ``last_id``, e.g. ids it reached before a restart."""
+        t = self._topic(topic)
+        t.next_id = max(t.next_id, last_id + 1)
+
+    def publish(self, topic: str, event: str, data: Any) -> int:
+        """Append an event to the topic and push it to every subscriber; returns its id."""
+        t = self._topic(topic)
+        ev = Event(t.next_id, event, data)
+        ev.frame = _encode_frame(ev)
+        t.next_id += 1
+        t.events.append(ev)
+        self.counts["published"] += 1
+        for sub in t.subscribers:
+            sub.push(ev)
+        return ev.id
+
+    def events(self, topic: str, after: int = 0) -> List[Event]:
+        t = self._topics.get(topic)
+        return [ev for ev in t.events if ev.id > after] if t else []
+
+    def topic_state(self, topic: str) -> Optional[str]:
+        """"open", "closed", or None for an unknown topic."""
+        t = self._topics.get(topic)
+        if t is None:
+            return None
+        return "closed" if t.closed else "open"
+
+    def close(self, topic: str):
+        """No more events will follow; subscribers finish once they have caught up."""
+        t = self._topics.get(topic)
+        if t is None or t.closed:
+            return
+        t.closed = True
+        for sub in t.subscribers:
+            sub.push(_CLOSED)
+
+    def drop(self, topic: str):
+        """Forget a topic and its history (subscribers are closed first)."""
+        self.close(topic)
+        self._topics.pop(topic, None)
+
+    async def subscribe(
+        self, topic: str, last_event_id: int = 0, heartbeat: Optional[float] = HEARTBEAT_SECONDS
+    ) -> AsyncIterator[Optional[Event]]:
+        """
+        Yield the topic's events after ``last_event_id``, then new ones as they arrive.
+
+        Yields None as a heartbeat after ``heartbeat`` idle seconds. After an
+        overflow, missed events are replayed from history; if they were already
+        trimmed, an id-less "gap" event reports how many were lost. Ends when the
+        topic is closed (or unknown) and everything has been delivered.
+        """
+        t = self._topics.get(topic)
+        if t is None:
+            return
+        sub = _Subscriber(self.queue_size)
+        t.subscribers.add(sub)
+        last = last_event_id
+        try:
+            replay = True
+            while True:
+                if replay or sub.overflowed:
+                    if sub.overflowed:
+                        self.counts["overflows"] += 1
+                    # Discard the queue and rebuild from history; events published
+                    # while we yield below are queued and deduplicated by id.
+                    sub.overflowed = False
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    backlog = [ev for ev in t.events if ev.id > last]
+                    if backlog and backlog[0].id > last + 1 and not replay:
+                        yield Event(None, "gap", {"missed": backlog[0].id - last - 1})
+                    replay = False
+                    for ev in backlog:
+                        last = ev.id
+                        self.counts["delivered"] += 1
+                        yield ev
+                    continue
+                if t.closed and sub.queue.empty():
+                    return
+                try:
+                    item = await asyncio.wait_for(sub.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    self.counts["heartbeats"] += 1
+                    yield None
+                    continue
+                if item is _CLOSED:
+                    if sub.overflowed:
+                        continue
+                    return
+                if item.id <= last:
+                    continue
+                last = item.id
+                self.counts["delivered"] += 1
+                yield item
+        finally:
+            t.subscribers.discard(sub)
+
+    def subscribers(self) -> int:
+        return sum(len(t.subscribers) for t in self._topics.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "topics": len(self._topics),
+            "subscribers": self.subscribers(),
+            "retained_events": sum(len(t.events) for t in self._topics.values()),
+            "approx_bytes": sum(approx_size(ev.data) for t in self._topics.values() for ev in t.events),
+        }
+
+
+def _encode_frame(ev: Event) -> bytes:
+    head = f"id: {ev.id}\n" if ev.id is not None else ""
+    return f"{head}event: {ev.event}\ndata: ".encode() + dumps(ev.data) + b"\n\n"
+
+
+def sse_frame(ev: Optional[Event]) -> bytes:
+    """Encode an event (or a heartbeat for None) as a text/event-stream frame.
+
+    Published events carry their frame already; others (gaps, events read
+    back from a shared backend) are encoded here.
+    """
+    if ev is None:
+        return b": heartbeat\n\n"
+    if ev.frame is None:
+        ev.frame = _encode_frame(ev)
+    return ev.frame
+
+
+def parse_last_event_id(value: Optional[str]) -> int:
+    try:
+        return max(0, int(value)) if value else 0
+    except ValueError:
+        return 0
@@ -0,0 +1,278 @@
+"""
+Fetch Scheduler — per-host politeness, retries and circuit breaking for outbound HTTP.
+
+Every request to a host goes through ``FetchScheduler.run``, which enforces the
+host's concurrency limit and minimum spacing between requests, retries
+retryable failures with jittered exponential backoff (honouring Retry-After),
+and fast-fails hosts whose circuit breaker is open.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: rate limiting and transient upstream failures.
+RETRYABLE_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+@dataclass
+class HostPolicy:
+    max_concurrency: int = 4
+    min_interval: float = 0.25      # seconds between request starts to the host
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    failure_threshold: int = 5      # consecutive failures that open the circuit
+    open_seconds: float = 60.0      # how long an open circuit fast-fails
+
+
+DEFAULT_POLICY = HostPolicy()
+
+# Domain suffix -> policy. Subdomains share the policy and the host slot.
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "linkedin.com": HostPolicy(max_concurrency=1, min_interval=2.0, max_retries=1, open_seconds=300.0),
+    "facebook.com": HostPolicy(max_concurrency=1, min_interval=2.0, max_retries=1, open_seconds=300.0),
+    "instagram.com": HostPolicy(max_concurrency=1, min_interval=2.0, max_retries=1, open_seconds=300.0),
+    "twitter.com": HostPolicy(max_concurrency=1, min_interval=1.5, max_retries=1, open_seconds=300.0),
+    "x.com": HostPolicy(max_concurrency=1, min_interval=1.5, max_retries=1, open_seconds=300.0),
+    "github.com": HostPolicy(max_concurrency=2, min_interval=1.0),
+    "api.tavily.com": HostPolicy(max_concurrency=8, min_interval=0.0, max_retries=2, failure_threshold=10),
+}
+
+# Idle host entries beyond this count are forgotten (oldest first).
+MAX_TRACKED_HOSTS = 2048
+
+
+class CircuitOpenError(Exception):
+    """Raised without touching the network while a host's circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit open for {host} (retry in {retry_in:.0f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class RetryableFetchError(Exception):
+    """Raised by an attempt for a retryable HTTP status."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a delta-seconds Retry-After header (HTTP dates are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value.strip()))
+    except ValueError:
+        return None
+
+
+class _HostState:
+    def __init__(self, key: str, policy: HostPolicy):
+        self.key = key
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.max_concurrency)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+        self.consecutive_failures = 0
+        self.circuit = "closed"         # closed | open | half-open
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.in_flight = 0
+        self.waiting = 0
+        self.latency_ewma: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.counts = {
+            "requests": 0,
+            "successes": 0,
+            "failures": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "fast_failed": 0,
+            "circuit_opens": 0,
+        }
+
+    def snapshot(self) -> Dict:
+        return {
+            **self.counts,
+            "circuit": self.circuit,
+            "consecutive_failures": self.consecutive_failures,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "avg_latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "last_error": self.last_error,
+            "max_concurrency": self.policy.max_concurrency,
+            "min_interval": self.policy.min_interval,
+        }
+
+
+class FetchScheduler:
+    """Per-host concurrency/rate limits, retry with backoff and a circuit breaker."""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, HostPolicy]] = None,
+        default_policy: HostPolicy = DEFAULT_POLICY,
+        retry_on: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.policies = HOST_POLICIES if policies is None else policies
+        self.default_policy = default_policy
+        self.retry_on = retry_on
+        self._hosts: "OrderedDict[str, _HostState]" = OrderedDict()
+
+    def _host_key(self, url: str) -> Tuple[str, HostPolicy]:
+        host = (urlsplit(url).hostname or "").lower()
+        if host.startswith("www."):
+            host = host[4:]
+        for suffix, policy in self.policies.items():
+            if host == suffix or host.endswith("." + suffix):
+                return suffix, policy
+        return host, self.default_policy
+
+    def _state(self, url: str) -> _HostState:
+        key, policy = self._host_key(url)
+        state = self._hosts.get(key)
+        if state is None:
+            state = self._hosts[key] = _HostState(key, policy)
+            self._evict_idle()
+        else:
+            self._hosts.move_to_end(key)
+        return state
+
+    def _evict_idle(self):
+        excess = len(self._hosts) - MAX_TRACKED_HOSTS
+        for key in list(self._hosts):
+            if excess <= 0:
+                break
+            state = self._hosts[key]
+            if state.in_flight == 0 and state.waiting == 0 and state.circuit == "closed":
+                del self._hosts[key]
+                excess -= 1
+
+    def _check_circuit(self, state: _HostState):
+        if state.circuit == "closed":
+            return
+        now = time.monotonic()
+        if state.circuit == "open":
+            remaining = state.opened_at + state.policy.open_seconds - now
+            if remaining > 0:
+                state.counts["fast_failed"] += 1
+                raise CircuitOpenError(state.key, remaining)
+            state.circuit = "half-open"
+        # Half-open: let exactly one probe through.
+        if state.probe_in_flight:
+            state.counts["fast_failed"] += 1
+            raise CircuitOpenError(state.key, 1.0)
+        state.probe_in_flight = True
+
+    def _record_success(self, state: _HostState, elapsed: float):
+        state.counts["successes"] += 1
+        state.consecutive_failures = 0
+        state.last_error = None
+        state.latency_ewma = elapsed if state.latency_ewma is None else 0.8 * state.latency_ewma + 0.2 * elapsed
+        if state.circuit != "closed":
+            logger.info(f"Circuit closed for {state.key}")
+        state.circuit = "closed"
+        state.probe_in_flight = False
+
+    def _record_failure(self, state: _HostState, error: BaseException):
+        state.counts["failures"] += 1
+        state.consecutive_failures += 1
+        state.last_error = str(error) or error.__class__.__name__
+        reopen = state.circuit == "half-open"
+        if reopen or state.consecutive_failures >= state.policy.failure_threshold:
+            if state.circuit != "open":
+                state.counts["circuit_opens"] += 1
+                logger.warning(f"Circuit opened for {state.key} after {state.consecutive_failures} failures")
+            state.circuit = "open"
+            state.opened_at = time.monotonic()
+        state.probe_in_flight = False
+
+    async def _acquire_slot(self, state: _HostState):
+        state.waiting += 1
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.waiting -= 1
+        try:
+            async with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + state.policy.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            state.semaphore.release()
+            raise
+
+    def _backoff(self, policy: HostPolicy, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, policy.backoff_max * 6)
+        ceiling = min(policy.backoff_max, policy.backoff_base * (2 ** attempt))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    async def run(self, url: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Run ``attempt`` under the host's limits, retrying retryable failures."""
+        state = self._state(url)
+        policy = state.policy
+        last_error: Optional[BaseException] = None
+
+        for attempt_no in range(policy.max_retries + 1):
+            self._check_circuit(state)
+            try:
+                await self._acquire_slot(state)
+            except BaseException:
+                # Cancelled while waiting for a slot: let the next caller take the half-open probe.
+                state.probe_in_flight = False
+                raise
+            state.in_flight += 1
+            state.counts["requests"] += 1
+            started = time.monotonic()
+            retry_after = None
+            try:
+                result = await attempt()
+            except RetryableFetchError as e:
+                last_error, retry_after = e, e.retry_after
+                if e.status == 429:
+                    state.counts["rate_limited"] += 1
+                self._record_failure(state, e)
+            except self.retry_on as e:
+                last_error = e
+                self._record_failure(state, e)
+            except BaseException:
+                state.probe_in_flight = False
+                raise
+            else:
+                self._record_success(state, time.monotonic() - started)
+                return result
+            finally:
+                state.in_flight -= 1
+                state.semaphore.release()
+
+            if attempt_no >= policy.max_retries:
+                break
+            delay = self._backoff(policy, attempt_no, retry_after)
+            if retry_after is not None:
+                # The host asked everyone to wait, not just this request.
+                state.next_start = max(state.next_start, time.monotonic() + delay)
+            state.counts["retries"] += 1
+            logger.debug(f"Retrying {url} in {delay:.2f}s after {last_error}")
+            await asyncio.sleep(delay)
+
+        raise last_error
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-host counters, circuit state and latency."""
+        return {key: state.snapshot() for key, state in self._hosts.items()}
@@ -0,0 +1,232 @@
+"""
+HTML Extract — pluggable HTML-to-text backends for the web scanner.
+
+Every backend produces the same cleaned text as the original BeautifulSoup
+pipeline: noise tags are dropped, each text node is split into lines, lines
+are stripped and empty ones discarded, and the remainder is joined with "\\n".
+The C-backed backends (selectolax/lexbor, lxml) are used when installed and
+fall back to BeautifulSoup's pure-Python ``html.parser`` otherwise.
+"""
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Tags whose whole subtree is removed before text extraction.
+NOISE_TAGS = ("script", "style", "nav", "footer", "header", "aside", "noscript", "svg", "form")
+
+
+def _join_lines(strings: Iterable[str]) -> str:
+    """Split text nodes into lines, strip them and drop the empty ones."""
+    lines: List[str] = []
+    for s in strings:
+        for line in s.splitlines():
+            line = line.strip()
+            if line:
+                lines.append(line)
+    return "\n".join(lines)
+
+
+class HTMLExtractor:
+    """Base extractor: ``clean`` returns page text, ``title`` the <title> text."""
+
+    name = "base"
+
+    def clean(self, html: str) -> str:
+        raise NotImplementedError
+
+    def title(self, html: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def links(self, html: str) -> List[str]:
+        """Raw ``href`` values of every <a> element, in document order."""
+        raise NotImplementedError
+
+
+class SoupExtractor(HTMLExtractor):
+    """Pure-Python BeautifulSoup + html.parser (reference implementation)."""
+
+    name = "html.parser"
+
+    def clean(self, html: str) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup(list(NOISE_TAGS)):
+            tag.decompose()
+        return _join_lines([soup.get_text(separator="\n", strip=True)])
+
+    def title(self, html: str) -> Optional[str]:
+        soup = BeautifulSoup(html, "html.parser")
+        if soup.title and soup.title.string:
+            return soup.title.string.strip()
+        return None
+
+    def links(self, html: str) -> List[str]:
+        soup = BeautifulSoup(html, "html.parser")
+        return [a["href"] for a in soup.find_all("a", href=True)]
+
+
+class LxmlExtractor(HTMLExtractor):
+    """libxml2 HTML parser via lxml."""
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree
+        self._etree = etree
+        # lxml parser objects must not be shared between threads.
+        self._local = threading.local()
+
+    def _parse(self, html: str):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            # Comments and PIs stay in the tree: ``clean`` removes them without joining the text around them.
+            parser = self._etree.HTMLParser(huge_tree=True)
+            self._local.parser = parser
+        try:
+            return self._etree.fromstring(html, parser)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be bytes.
+            return self._etree.fromstring(html.encode("utf-8", "replace"), parser)
+
+    def clean(self, html: str) -> str:
+        root = self._parse(html)
+        if root is None:
+            return ""
+        etree = self._etree
+        for el in list(root.iter(etree.Comment, etree.ProcessingInstruction, *NOISE_TAGS, "template")):
+            parent = el.getparent()
+            if parent is None:
+                continue
+            # Keep the text that follows the removed element, like decompose(); it stays a
+            # separate text node there, so it goes on a line of its own.
+            if el.tail:
+                prev = el.getprevious()
+                if prev is not None:
+                    prev.tail = (prev.tail or "") + "\n" + el.tail
+                else:
+                    parent.text = (parent.text or "") + "\n" + el.tail
+            parent.remove(el)
+        return _join_lines(root.itertext())
+
+    def title(self, html: str) -> Optional[str]:
+        root = self._parse(html)
+        if root is None:
+            return None
+        el = root.find(".//title")
+        if el is None or not el.text or len(el):
+            return None
+        return el.text.strip()
+
+    def links(self, html: str) -> List[str]:
+        root = self._parse(html)
+        if root is None:
+            return []
+        return [el.get("href") for el in root.iter("a") if el.get("href")]
+
+
+class SelectolaxExtractor(HTMLExtractor):
+    """lexbor HTML5 parser via selectolax."""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    def clean(self, html: str) -> str:
+        tree = self._parser_cls(html)
+        root = tree.root
+        if root is None:
+            return ""
+        tree.strip_tags(list(NOISE_TAGS))
+        return _join_lines(
+            node.text_content or "" for node in root.traverse(include_text=True) if node.tag == "-text"
+        )
+
+    def title(self, html: str) -> Optional[str]:
+        node = self._parser_cls(html).css_first("title")
+        if node is None:
+            return None
+        text = node.text(deep=True)
+        return text.strip() if text else None
+
+    def links(self, html: str) -> List[str]:
+        tree = self._parser_cls(html)
+        return [node.attributes["href"] for node in tree.css("a[href]") if node.attributes.get("href")]
+
+
+EXTRACTORS = {
+    SelectolaxExtractor.name: SelectolaxExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+    SoupExtractor.name: SoupExtractor,
+}
+
+# Preference order for "auto": fastest first.
+AUTO_ORDER = ("selectolax", "lxml", "html.parser")
+
+_instances: Dict[str, HTMLExtractor] = {}
+
+
+def available_extractors() -> List[str]:
+    """Names of the backends that can be loaded in this environment."""
+    names = []
+    for name in EXTRACTORS:
+        try:
+            get_extractor(name)
+            names.append(name)
+        except ImportError:
+            continue
+    return names
+
+
+def get_extractor(name: str = "auto") -> HTMLExtractor:
+    """Return a (cached) extractor by name; "auto" picks the fastest installed one."""
+    name = (name or "auto").lower()
+    if name == "auto":
+        for candidate in AUTO_ORDER:
+            try:
+                return get_extractor(candidate)
+            except ImportError:
+                continue
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown HTML extractor '{name}'. Use one of: auto, {', '.join(EXTRACTORS)}")
+    if name not in _instances:
+        _instances[name] = EXTRACTORS[name]()
+    return _instances[name]
+
+
+def clean_html(html: str, backend: str = "auto") -> str:
+    """Module-level entry point so process pools can pickle the call."""
+    if not html:
+        return ""
+    try:
+        return get_extractor(backend).clean(html)
+    except Exception as e:
+        logger.error(f"HTML cleaning error: {e}")
+        return ""
+
+
+def clean_page(html: str, backend: str = "auto", title_chars: Optional[int] = None) -> Tuple[str, Optional[str]]:
+    """``clean_html`` plus the <title> (looked up in the first ``title_chars``), in one pool call."""
+    if not html:
+        return "", None
+    try:
+        title = get_extractor(backend).title(html[:title_chars] if title_chars else html)
+    except Exception as e:
+        logger.error(f"Title extraction error: {e}")
+        title = None
+    return clean_html(html, backend), title
+
+
+def extract_links(html: str, backend: str = "auto") -> List[str]:
+    """Module-level link extraction, safe to run on a process pool."""
+    if not html:
+        return []
+    try:
+        return get_extractor(backend).links(html)
+    except Exception as e:
+        logger.error(f"Link extraction error: {e}")
+        return []
@@ -0,0 +1,200 @@
+"""
+Job Queue — persistent SQLite queue of scan jobs for out-of-process workers.
+
+API processes enqueue jobs; worker processes (``worker.py``) claim them under
+a lease they keep renewing while the job runs. A job whose lease expires (its
+worker died) is queued again until it has used ``max_attempts``, then marked
+failed. Several API and worker processes can share one queue file.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = 60.0
+# Finished jobs (and their results) are kept this long for their submitters to collect.
+JOB_RETENTION_SECONDS = 3600.0
+
+FINISHED = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue:
+    def __init__(self, path: str, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        # Autocommit mode; claims take the write lock explicitly with BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL,"
+            " worker TEXT, lease_expires REAL, result TEXT, error TEXT,"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    # ── Submitters ──
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], job_id: Optional[str] = None, max_attempts: int = 1) -> str:
+        job_id = job_id or uuid.uuid4().hex[:12]
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, kind, payload, status, max_attempts, created_at, updated_at)"
+            " VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, json.dumps(payload, default=str), max_attempts, now, now),
+        )
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not finished; a worker already running it finds out when it reports."""
+        cur = self._execute(
+            "UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id),
+        )
+        return cur.rowcount > 0
+
+    def statuses(self, job_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Status (and result or error once finished) of each known job."""
+        job_ids = list(job_ids)
+        found: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(job_ids), 500):
+            chunk = job_ids[i:i + 500]
+            rows = self._execute(
+                f"SELECT id, status, result, error FROM jobs WHERE id IN ({','.join('?' * len(chunk))})", tuple(chunk)
+            ).fetchall()
+            for job_id, status, result, error in rows:
+                found[job_id] = {"status": status, "result": json.loads(result) if result else None, "error": error}
+        return found
+
+    def position(self, job_id: str) -> Optional[int]:
+        """How many queued jobs are ahead of this one (None unless it is queued)."""
+        row = self._execute("SELECT created_at FROM jobs WHERE id = ? AND status = 'queued'", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return self._execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (row[0],)
+        ).fetchone()[0]
+
+    # ── Workers ──
+
+    def claim(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """Take the oldest queued job (of ``kinds``) under a lease, or None if there is none."""
+        kind_filter = f" AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT id, kind, payload, attempts FROM jobs WHERE status = 'queued'{kind_filter}"
+                    " ORDER BY created_at LIMIT 1",
+                    tuple(kinds or ()),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,"
+                        " lease_expires = ?, updated_at = ? WHERE id = ?",
+                        (worker_id, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return Job(row[0], row[1], json.loads(row[2]), row[3] + 1)
+
+    def renew(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease; False if the job was cancelled or taken over."""
+        cur = self._execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time() + self.lease_seconds, job_id, worker_id),
+        )
+        return cur.rowcount > 0
+
+    def complete(self, job_id: str, worker_id: str, result: Any = None) -> bool:
+        cur = self._execute(
+            "UPDATE jobs SET status = 'completed', result = ?, lease_expires = NULL, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(result, default=str), time.time(), job_id, worker_id),
+        )
+        return cur.rowcount > 0
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        cur = self._execute(
+            "UPDATE jobs SET status = 'failed', error = ?, lease_expires = NULL, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'running'",
+            (error, time.time(), job_id, worker_id),
+        )
+        return cur.rowcount > 0
+
+    def release(self, job_id: str, worker_id: str):
+        """Give a job back (worker shutting down): queued again if it has attempts left."""
+        self._execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+            " error = CASE WHEN attempts < max_attempts THEN error ELSE 'worker shut down' END,"
+            " worker = NULL, lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (time.time(), job_id, worker_id),
+        )
+
+    # ── Maintenance ──
+
+    def requeue_expired(self) -> int:
+        """Queue again (or fail) running jobs whose worker stopped renewing the lease."""
+        now = time.time()
+        cur = self._execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+            " error = CASE WHEN attempts < max_attempts THEN error ELSE 'worker lost' END,"
+            " worker = NULL, lease_expires = NULL, updated_at = ? WHERE status = 'running' AND lease_expires < ?",
+            (now, now),
+        )
+        if cur.rowcount:
+            logger.warning(f"Recovered {cur.rowcount} jobs from lost workers")
+        return cur.rowcount
+
+    def purge(self, older_than: float = JOB_RETENTION_SECONDS) -> int:
+        cur = self._execute(
+            f"DELETE FROM jobs WHERE status IN ({','.join('?' * len(FINISHED))}) AND updated_at < ?",
+            (*FINISHED, time.time() - older_than),
+        )
+        return cur.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._execute("SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status").fetchall()
+        by_status: Dict[str, int] = {}
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in rows:
+            by_status[status] = by_status.get(status, 0) + count
+            by_kind.setdefault(kind, {})[status] = count
+        oldest = self._execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        workers = self._execute("SELECT COUNT(DISTINCT worker) FROM jobs WHERE status = 'running'").fetchone()[0]
+        return {
+            "path": self.path,
+            "by_status": by_status,
+            "by_kind": by_kind,
+            "oldest_queued_seconds": round(time.time() - oldest, 3) if oldest else None,
+            "busy_workers": workers,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
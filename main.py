@@ -2,52 +2,170 @@
 PII Leakage Scanner - FastAPI app with one-time scans and continuous monitoring.
 """
 import asyncio
-import json
 import logging
+import random
+import resource
+import tempfile
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
-from email_discovery_scanner import EmailDiscoveryScanner
-from pii_engine import PIIEngine
-from social_api_scanner import SocialAPIScanner
-from web_scanner import WebScanner
+from admission import AdmissionController, AdmissionLimit, Rejected, Ticket
+from archive_scanner import ArchiveScanner, sniff_archive
+from batch_analyzer import BATCH_SIZE, analyze_records, iter_text_records
+from compression import CompressionMiddleware
+from crawler import normalize_url
+from email_discovery_scanner import BULK_CONCURRENCY, iter_email_records
+from events import parse_last_event_id, sse_frame
+from fastjson import FastJSONResponse, dumps
+from job_queue import FINISHED, JOB_LEASE_SECONDS, JobQueue
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import MONITORS_ACTIVE, REGISTRY, SCANS_ACTIVE, SSE_SUBSCRIBERS, watch_loop_lag
+from scan_pipeline import (
+    JOB_QUEUE_PATH,
+    LOG_MAX_LINES,
+    SCAN_RETENTION,
+    WORKER_ID,
+    CrawlRequest,
+    MonitorRequest,
+    ScanRequest,
+    add_log,
+    backend,
+    bus,
+    close_topic,
+    coalescer,
+    create_scan,
+    email_scanner,
+    emit_event,
+    engine,
+    execute_monitor_scan,
+    publish,
+    record_stats,
+    risk_from_severity,
+    run_crawl,
+    run_scan,
+    scanner,
+    scans,
+    share_scan,
+    social_scanner,
+    stats,
+    summarize_results,
+    traces,
+    writer,
+)
+from scheduler import MonitorScheduler
+from social_api_scanner import PLATFORM_SITES, unsupported_platforms
+from state_backend import follow_remote
+from stats import RESOLUTIONS
+from storage import BoundedList, BoundedStore, DurableStore, RetentionPolicy, SQLiteSpill
+from tracing import to_otlp
+from views import parse_fields, shape
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="PII Scanner API v3.0")
-
-# Shared instances
-engine = PIIEngine()
-scanner = WebScanner()
-social_scanner = SocialAPIScanner(web_scanner=scanner)
-email_scanner = EmailDiscoveryScanner(web_scanner=scanner)
-
-# In-memory stores
-scans: Dict[str, Dict[str, Any]] = {}
-scan_events: Dict[str, List[Dict[str, Any]]] = {}
-stats_history: List[Dict[str, Any]] = []
-
-monitors: Dict[str, Dict[str, Any]] = {}
-monitor_events: Dict[str, List[Dict[str, Any]]] = {}
-monitor_tasks: Dict[str, asyncio.Task] = {}
-
-# Alert-quality filter: send email only for the most accurate findings.
-ALERT_CONFIDENCE_THRESHOLDS: Dict[str, float] = {
-    "regex": 0.85,
-    "transformer": 0.92,
+# gzip, or brotli when the brotli package is installed; SSE streams are left alone.
+app.add_middleware(CompressionMiddleware)
+
+# Scanners and stores the worker shares live in scan_pipeline.py.
+archive_scanner = ArchiveScanner()
+
+# Retention of finished monitors; running ones are never evicted.
+MONITOR_RETENTION = RetentionPolicy(ttl_seconds=7 * 24 * 3600, max_entries=200, max_bytes=64 * 1024 * 1024)
+# SQLite file that receives evicted scans/monitors (still readable by id); None keeps nothing.
+STORAGE_SPILL_PATH: Optional[str] = None
+STORAGE_SWEEP_SECONDS = 60
+
+# SQLite file that keeps monitors (definition, run state, history, alerts) across
+# restarts; running monitors are rescheduled on startup. None keeps them in memory only.
+MONITOR_DB_PATH: Optional[str] = "monitors.db"
+MONITOR_FLUSH_SECONDS = 1.0
+# Runs missed while the server was down are spread over up to this many seconds.
+MONITOR_RESUME_SPREAD_SECONDS = 30.0
+
+# A worker owns the monitors it runs through leases it renews every BACKEND_SYNC_SECONDS;
+# a monitor whose lease expires (its worker died) is adopted by another worker.
+# The backend itself is STATE_BACKEND_URL in scan_pipeline.py.
+MONITOR_LEASE_SECONDS = 180.0
+BACKEND_SYNC_SECONDS = 2.0
+
+# "inline" runs scans and monitor scans inside the API process; "queue" hands them to
+# worker processes (python worker.py) through a persistent job queue. Queue mode
+# needs a shared STATE_BACKEND_URL: workers report progress and events through it.
+SCAN_EXECUTION = "inline"
+JOB_POLL_SECONDS = 0.5
+# A monitor scan whose worker died is retried this many times in total.
+MONITOR_JOB_ATTEMPTS = 2
+
+spill = SQLiteSpill(STORAGE_SPILL_PATH) if STORAGE_SPILL_PATH else None
+durable = DurableStore(MONITOR_DB_PATH, flush_seconds=MONITOR_FLUSH_SECONDS) if MONITOR_DB_PATH else None
+job_queue = JobQueue(JOB_QUEUE_PATH) if SCAN_EXECUTION == "queue" else None
+_job_waiters: Dict[str, asyncio.Future] = {}
+scans.spill = spill
+traces.spill = spill
+
+
+def _mirror(method, *args, **kwargs):
+    """
+    Call a shared-backend method; a backend outage must not break the scan or monitor itself.
+
+    Blocking: call it through ``asyncio.to_thread`` (writes go through ``writer``).
+    """
+    if not backend.shared:
+        return None
+    try:
+        return method(*args, **kwargs)
+    except Exception as exc:
+        logger.warning(f"State backend {method.__name__} failed: {exc}")
+        return None
+
+
+def _drop_monitor_state(monitor_id: str, monitor: Dict[str, Any]):
+    bus.drop(f"monitor:{monitor_id}")
+    if durable is not None:
+        durable.delete("monitors", monitor_id)
+
+
+monitors: BoundedStore = BoundedStore(
+    "monitors",
+    MONITOR_RETENTION,
+    evictable=lambda monitor: monitor.get("status") not in ("running", "stopping"),
+    on_evict=_drop_monitor_state,
+    spill=spill,
+)
+
+# All monitor runs share one scheduler: at most this many run at once (identical
+# target scans are coalesced, see MONITOR_COALESCE_SECONDS in scan_pipeline.py).
+MONITOR_MAX_CONCURRENT_RUNS = 4
+MONITOR_START_JITTER_SECONDS = 10.0
+
+scheduler = MonitorScheduler(max_concurrent=MONITOR_MAX_CONCURRENT_RUNS, start_jitter=MONITOR_START_JITTER_SECONDS)
+
+# Admission control per endpoint group: requests running at once, how many more may
+# wait for a slot (and for how long), and how many one client may hold running or
+# queued. Web scans and crawls run in the background, so theirs wait without a timeout.
+ADMISSION_LIMITS: Dict[str, AdmissionLimit] = {
+    "scan": AdmissionLimit(max_concurrent=4, max_queue=32, queue_timeout=None, max_per_client=8),
+    "url": AdmissionLimit(max_concurrent=8, max_queue=32, queue_timeout=30, max_per_client=8),
+    "discovery": AdmissionLimit(max_concurrent=4, max_queue=16, queue_timeout=30, max_per_client=4),
+    "analyze": AdmissionLimit(max_concurrent=2, max_queue=64, queue_timeout=15, max_per_client=16),
 }
+# Header identifying the client for fairness (e.g. set by a proxy); None uses the peer address.
+ADMISSION_CLIENT_HEADER: Optional[str] = None
+# Monitor starts are refused beyond this many running monitors on this worker.
+MONITOR_MAX_ACTIVE = 200
 
+admission = AdmissionController(ADMISSION_LIMITS)
 
-class ScanRequest(BaseModel):
-    query: str
-    max_results: int = 5
+# Bulk uploads (email lists, batch analysis): largest accepted body, and how much of it is buffered in memory.
+BULK_MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+BULK_SPOOL_BYTES = 1024 * 1024
 
 
 class URLScanRequest(BaseModel):
@@ -55,8 +173,10 @@ class URLScanRequest(BaseModel):
 
 
 class SocialScanRequest(BaseModel):
-    platform: str
+    platform: Optional[str] = None
     handle: str
+    # Scan the handle on several platforms at once (shares one discovery search).
+    platforms: List[str] = Field(default_factory=list)
 
 
 class EmailScanRequest(BaseModel):
@@ -67,36 +187,15 @@ class AnalyzeRequest(BaseModel):
     text: str
 
 
-class MonitorRequest(BaseModel):
-    mode: str = "all"
-    query: Optional[str] = None
-    url: Optional[str] = None
-    platform: Optional[str] = None
-    handle: Optional[str] = None
-    email: Optional[str] = None
-    max_results: int = Field(default=5, ge=1, le=20)
-    interval_seconds: int = Field(default=120, ge=30, le=86400)
-    duration_minutes: int = Field(default=60, ge=1, le=10080)
-
-
-def _emit_event(scan_id: str, event_type: str, data: Dict[str, Any]):
-    if scan_id not in scan_events:
-        scan_events[scan_id] = []
-    scan_events[scan_id].append({"event": event_type, "data": data})
-
-
-def _add_log(scan_id: str, msg: str):
-    ts = datetime.now().strftime("%H:%M:%S")
-    entry = f"[{ts}] {msg}"
-    if scan_id in scans:
-        scans[scan_id]["log"].append(entry)
-    _emit_event(scan_id, "log", {"message": entry})
-
-
 def _emit_monitor_event(monitor_id: str, event_type: str, data: Dict[str, Any]):
-    if monitor_id not in monitor_events:
-        monitor_events[monitor_id] = []
-    monitor_events[monitor_id].append({"event": event_type, "data": data})
+    monitor = monitors.get(monitor_id)
+    if monitor is None:
+        # Evicted, or handed over to another worker, which publishes its events from now on.
+        return
+    # Kept with the monitor so a resumed monitor continues the numbering its clients resume from.
+    monitor["last_event_id"] = publish(f"monitor:{monitor_id}", event_type, data)
+    if durable is not None:
+        durable.save("monitors", monitor_id, monitor)
 
 
 def _add_monitor_log(monitor_id: str, msg: str):
@@ -107,93 +206,22 @@ def _add_monitor_log(monitor_id: str, msg: str):
     _emit_monitor_event(monitor_id, "log", {"message": entry})
 
 
-def _risk_from_severity(severity: Dict[str, int]) -> str:
-    if severity.get("CRITICAL", 0) > 0:
-        return "CRITICAL"
-    if severity.get("HIGH", 0) > 0:
-        return "HIGH"
-    if severity.get("MEDIUM", 0) > 0:
-        return "MEDIUM"
-    return "LOW"
-
-
-def _is_high_accuracy_finding(finding: Dict[str, Any]) -> bool:
-    method = (finding.get("method") or "").lower()
-    if method not in ALERT_CONFIDENCE_THRESHOLDS:
-        return False
-    try:
-        confidence = float(finding.get("confidence", 0.0))
-    except (TypeError, ValueError):
-        confidence = 0.0
-    return confidence >= ALERT_CONFIDENCE_THRESHOLDS[method]
+def _persist_monitor(monitor_id: str):
+    """Queue the monitor's current state for the next durable-store flush."""
+    if monitor_id not in monitors:
+        return
+    if durable is not None:
+        durable.save("monitors", monitor_id, monitors[monitor_id])
+    writer.put("monitors", monitor_id, monitors[monitor_id], ttl=MONITOR_RETENTION.ttl_seconds)
 
 
-def _summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    total_pii = 0
-    total_sources = 0
+def _methods_of(results: List[Dict[str, Any]]) -> Dict[str, int]:
     methods: Dict[str, int] = {}
-    severity: Dict[str, int] = {}
-    top_findings: List[Dict[str, Any]] = []
-    high_accuracy_pii = 0
-    high_accuracy_methods: Dict[str, int] = {}
-    high_accuracy_severity: Dict[str, int] = {}
-    high_accuracy_findings: List[Dict[str, Any]] = []
-
     for item in results:
-        if not isinstance(item, dict) or "error" in item:
-            continue
-
-        total_sources += 1
-        total_pii += int(item.get("pii_count", 0))
-
-        for finding in item.get("pii_findings", []):
-            method = finding.get("method", "unknown")
-            methods[method] = methods.get(method, 0) + 1
-
-            sev = finding.get("severity", "LOW")
-            severity[sev] = severity.get(sev, 0) + 1
-
-            if len(top_findings) < 10:
-                top_findings.append(
-                    {
-                        "source": item.get("url") or item.get("title") or item.get("source"),
-                        "type": finding.get("type"),
-                        "masked_value": finding.get("masked_value") or finding.get("value"),
-                        "severity": sev,
-                        "method": method,
-                    }
-                )
-
-            if _is_high_accuracy_finding(finding):
-                high_accuracy_pii += 1
-                high_accuracy_methods[method] = high_accuracy_methods.get(method, 0) + 1
-                high_accuracy_severity[sev] = high_accuracy_severity.get(sev, 0) + 1
-                if len(high_accuracy_findings) < 10:
-                    high_accuracy_findings.append(
-                        {
-                            "source": item.get("url") or item.get("title") or item.get("source"),
-                            "type": finding.get("type"),
-                            "masked_value": finding.get("masked_value") or finding.get("value"),
-                            "severity": sev,
-                            "method": method,
-                            "confidence": finding.get("confidence"),
-                        }
-                    )
-
-    return {
-        "total_pii": total_pii,
-        "total_sources": total_sources,
-        "by_method": methods,
-        "by_severity": severity,
-        "overall_risk": _risk_from_severity(severity),
-        "top_findings": top_findings,
-        "high_accuracy_pii": high_accuracy_pii,
-        "high_accuracy_by_method": high_accuracy_methods,
-        "high_accuracy_by_severity": high_accuracy_severity,
-        "high_accuracy_risk": _risk_from_severity(high_accuracy_severity),
-        "high_accuracy_findings": high_accuracy_findings,
-        "alert_ready": high_accuracy_pii > 0,
-    }
+        if isinstance(item, dict):
+            for method, count in (item.get("detection_methods") or {}).items():
+                methods[method] = methods.get(method, 0) + count
+    return methods
 
 
 def _monitor_label(req: MonitorRequest) -> str:
@@ -229,11 +257,23 @@ def _sanitize_monitor_config(req: MonitorRequest) -> Dict[str, Any]:
         "handle": req.handle,
         "email": req.email,
         "max_results": req.max_results,
+        "crawl_depth": req.crawl_depth,
+        "crawl_max_pages": req.crawl_max_pages,
         "interval_seconds": req.interval_seconds,
         "duration_minutes": req.duration_minutes,
+        "run_budget_seconds": req.run_budget_seconds,
+        "subscan_timeout_seconds": req.subscan_timeout_seconds,
     }
 
 
+def _check_platforms(platforms: List[str]):
+    unknown = unsupported_platforms(platforms)
+    if unknown:
+        raise HTTPException(
+            400, f"Unsupported platform(s): {', '.join(unknown)}. Use one of: {', '.join(PLATFORM_SITES)}"
+        )
+
+
 def _validate_monitor_request(req: MonitorRequest):
     mode = req.mode.lower().strip()
     valid_modes = {"web", "url", "social", "email", "all"}
@@ -244,6 +284,8 @@ def _validate_monitor_request(req: MonitorRequest):
         raise HTTPException(400, "query is required for web mode")
     if mode == "url" and not req.url:
         raise HTTPException(400, "url is required for url mode")
+    if req.url and req.crawl_depth > 0 and not normalize_url(req.url):
+        raise HTTPException(400, "url must be an absolute http(s) URL to crawl")
     if mode == "social":
         if not req.platform or not req.handle:
             raise HTTPException(400, "platform and handle are required for social mode")
@@ -256,186 +298,399 @@ def _validate_monitor_request(req: MonitorRequest):
 
     if (req.platform and not req.handle) or (req.handle and not req.platform):
         raise HTTPException(400, "social target needs both platform and handle")
+    if req.platform:
+        _check_platforms(req.platform.split(","))
 
 
-async def _execute_monitor_scan(monitor_id: str, req: MonitorRequest) -> List[Dict[str, Any]]:
-    mode = req.mode.lower()
-    results: List[Dict[str, Any]] = []
-
-    if mode in ("web", "all") and req.query:
-        _add_monitor_log(monitor_id, f'Web scan: "{req.query}"')
-        web_results = await scanner.scan(req.query, engine, req.max_results)
-        results.extend(web_results)
-
-    if mode in ("url", "all") and req.url:
-        _add_monitor_log(monitor_id, f"URL scan: {req.url}")
-        url_result = await scanner.scan_url(req.url, engine)
-        results.append(url_result)
-
-    if mode in ("social", "all") and req.platform and req.handle:
-        _add_monitor_log(monitor_id, f"Social scan: {req.platform} @{req.handle.lstrip('@')}")
-        social_results = await social_scanner.scan_handle(req.platform, req.handle, engine, deep_search=True)
-        results.extend(social_results)
-
-    if mode in ("email", "all") and req.email:
-        _add_monitor_log(monitor_id, f"Email discovery: {req.email}")
-        email_results = await email_scanner.scan_email(req.email, engine)
-        results.extend(email_results)
-
-    return results
+async def _await_job(job_id: str) -> Dict[str, Any]:
+    """Wait until ``_poll_jobs`` sees the queued job finish; returns its status, result and error."""
+    future = asyncio.get_running_loop().create_future()
+    _job_waiters[job_id] = future
+    try:
+        return await future
+    finally:
+        _job_waiters.pop(job_id, None)
+
+
+async def _poll_jobs():
+    """Resolve waiters of finished jobs and recover jobs whose worker died."""
+    last_recovery = 0.0
+    while True:
+        await asyncio.sleep(JOB_POLL_SECONDS)
+        try:
+            if time.monotonic() - last_recovery >= JOB_LEASE_SECONDS / 4:
+                last_recovery = time.monotonic()
+                await asyncio.to_thread(job_queue.requeue_expired)
+            if not _job_waiters:
+                continue
+            for job_id, info in (await asyncio.to_thread(job_queue.statuses, list(_job_waiters))).items():
+                future = _job_waiters.get(job_id)
+                if info["status"] in FINISHED and future is not None and not future.done():
+                    future.set_result(info)
+        except Exception as exc:
+            logger.error(f"Job polling failed: {exc}")
+
+
+async def _scan_for_monitor(monitor_id: str, req: MonitorRequest) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """Run a monitor's sub-scans here, or on a worker when SCAN_EXECUTION is "queue"."""
+    if job_queue is None:
+        return await execute_monitor_scan(monitor_id, req, log_fn=lambda msg: _add_monitor_log(monitor_id, msg))
+    payload = {"monitor_id": monitor_id, "config": _sanitize_monitor_config(req)}
+    job_id = await asyncio.to_thread(job_queue.enqueue, "monitor_scan", payload, None, MONITOR_JOB_ATTEMPTS)
+    try:
+        info = await _await_job(job_id)
+    except asyncio.CancelledError:
+        # Shielded, so the cancel reaches the queue even though this task is being cancelled.
+        await asyncio.shield(asyncio.to_thread(job_queue.cancel, job_id))
+        raise
+    if info["status"] != "completed":
+        raise RuntimeError(f"monitor scan job {info['status']}: {info.get('error') or 'no result'}")
+    result = info["result"]
+    for line in result.get("logs", []):
+        _add_monitor_log(monitor_id, line)
+    return result["results"], result["subscans"]
 
 
-async def _run_scan(scan_id: str, req: ScanRequest):
-    try:
-        def log_fn(msg: str):
-            _add_log(scan_id, msg)
+async def _enqueue_scan(kind: str, scan_id: str, query: str, req: BaseModel) -> Dict[str, Any]:
+    """Queue a web scan or crawl for a worker; its progress arrives through the state backend."""
+    snapshot = {
+        "scan_id": scan_id,
+        "query": query,
+        "status": "queued",
+        "started_at": datetime.now().isoformat(),
+        "findings": [],
+        "progress": 0,
+        "log": [],
+    }
 
-        scans[scan_id]["progress"] = 10
-        _emit_event(scan_id, "progress", {"progress": 10, "message": "Searching web..."})
-        results = await scanner.scan(req.query, engine, req.max_results, log_fn)
+    def submit():
+        backend.put("scans", scan_id, snapshot, ttl=SCAN_RETENTION.ttl_seconds)
+        backend.open_topic(f"scan:{scan_id}")
+        job_queue.enqueue(kind, {"scan_id": scan_id, "request": req.dict()}, job_id=scan_id)
+        return job_queue.position(scan_id)
+
+    position = await asyncio.to_thread(submit)
+    stats.start("scans", scan_id)
+    asyncio.create_task(_collect_scan_job(scan_id, kind))
+    return {"scan_id": scan_id, "status": "queued", "queue_position": position}
+
+
+async def _collect_scan_job(scan_id: str, scan_type: str):
+    """Count a worker-run scan in this process's stats once its job finishes."""
+    info = await _await_job(scan_id)
+    stats.finish("scans", scan_id)
+    result = info.get("result") or {}
+    if info["status"] == "completed":
+        if result.get("status") == "completed":
+            record_stats(result["entry"], scan_type, result.get("by_method"))
+        return
+    # The worker never finished it (lost or failed): make that visible to readers.
+    scan = await _shared_get("scans", scan_id) or {"scan_id": scan_id}
+    scan.update({"status": "error", "error": info.get("error") or f"job {info['status']}"})
+    await asyncio.to_thread(_mirror, backend.put, "scans", scan_id, scan, ttl=SCAN_RETENTION.ttl_seconds)
+    await asyncio.to_thread(_mirror, backend.close_topic, f"scan:{scan_id}")
+
+
+async def _run_monitor_once(monitor_id: str, req: MonitorRequest):
+    """One scheduled monitor run: scan, summarize, alert and record stats."""
+    monitor = monitors[monitor_id]
+    run_no = monitor["run_count"] + 1
+    monitor["run_count"] = run_no
+    monitor["last_run_at"] = datetime.now().isoformat()
+    monitor["next_run_at"] = None
+    _add_monitor_log(monitor_id, f"Run #{run_no} started")
+    _emit_monitor_event(monitor_id, "run_started", {"run_no": run_no})
+    _persist_monitor(monitor_id)
+
+    run_started = time.monotonic()
+    results, subscans = await _scan_for_monitor(monitor_id, req)
+    run_seconds = time.monotonic() - run_started
+    summary = summarize_results(results)
+    summary["run_no"] = run_no
+    summary["timestamp"] = datetime.now().isoformat()
+    summary["duration_ms"] = round(run_seconds * 1000)
+    summary["subscans"] = subscans
+    summary["partial"] = any(t["status"] != "ok" for t in subscans.values())
+
+    monitor["last_summary"] = summary
+    monitor["total_findings"] += summary["total_pii"]
+    monitor["history"].append(summary)
+    if len(monitor["history"]) > 30:
+        monitor["history"] = monitor["history"][-30:]
 
-        scans[scan_id]["progress"] = 90
-        _emit_event(scan_id, "progress", {"progress": 90, "message": "Analyzing results..."})
+    _add_monitor_log(
+        monitor_id,
+        f"Run #{run_no} complete in {run_seconds:.1f}s: {summary['total_pii']} PII across {summary['total_sources']} sources | Risk: {summary['overall_risk']}"
+        + (" | partial" if summary["partial"] else ""),
+    )
+    _emit_monitor_event(monitor_id, "run_completed", summary)
 
-        summary = _summarize_results(results)
-        scans[scan_id].update(
-            {
-                "status": "completed",
-                "findings": results,
-                "progress": 100,
-                "total_pii": summary["total_pii"],
-                "overall_risk": summary["overall_risk"],
-                "by_severity": summary["by_severity"],
-                "by_method": summary["by_method"],
-                "completed_at": datetime.now().isoformat(),
-            }
-        )
+    record_stats(
+        {
+            "scan_id": f"monitor-{monitor_id}-{run_no}",
+            "query": _monitor_label(req),
+            "total_findings": summary["total_pii"],
+            "overall_risk": summary["overall_risk"],
+            "timestamp": datetime.now().isoformat(),
+        },
+        "monitor",
+        summary["by_method"],
+    )
 
-        _add_log(
-            scan_id,
-            f"Complete: {summary['total_pii']} PII across {summary['total_sources']} sources | Risk: {summary['overall_risk']}",
+    if summary.get("alert_ready"):
+        alert_item = {
+            "id": uuid.uuid4().hex[:10],
+            "run_no": run_no,
+            "timestamp": datetime.now().isoformat(),
+            "risk": summary["high_accuracy_risk"],
+            "high_accuracy_findings": summary["high_accuracy_pii"],
+            "total_findings": summary["total_pii"],
+            "findings": summary.get("high_accuracy_findings", []),
+        }
+        monitor["alerts_sent"] += 1
+        monitor["alerts"].append(alert_item)
+        if len(monitor["alerts"]) > 50:
+            monitor["alerts"] = monitor["alerts"][-50:]
+        _emit_monitor_event(monitor_id, "alert", alert_item)
+        _add_monitor_log(
+            monitor_id,
+            f"IN-APP ALERT: {summary['high_accuracy_pii']} high-accuracy findings | Risk: {summary['high_accuracy_risk']}",
         )
-        _emit_event(
-            scan_id,
-            "completed",
-            {"total_findings": summary["total_pii"], "overall_risk": summary["overall_risk"]},
+    elif summary["total_pii"] > 0:
+        _add_monitor_log(
+            monitor_id,
+            "PII found but alert skipped: no high-accuracy matches met the alert threshold",
         )
+    monitors.touch(monitor_id)
+    _persist_monitor(monitor_id)
 
-        stats_history.append(
-            {
-                "scan_id": scan_id,
-                "query": req.query,
-                "total_findings": summary["total_pii"],
-                "overall_risk": summary["overall_risk"],
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
-    except Exception as exc:
-        logger.error(f"Scan error: {exc}")
-        scans[scan_id]["status"] = "error"
-        scans[scan_id]["error"] = str(exc)
-        _add_log(scan_id, f"ERROR: {exc}")
 
+def _set_next_run(monitor_id: str, ts: Optional[float]):
+    monitor = monitors.get(monitor_id)
+    if monitor is not None:
+        monitor["next_run_at"] = datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+        _persist_monitor(monitor_id)
 
-async def _run_monitor_loop(monitor_id: str, req: MonitorRequest):
-    monitor = monitors[monitor_id]
-    end_time = datetime.fromisoformat(monitor["ends_at"])
-
-    try:
-        run_no = 0
-        while monitor.get("status") == "running":
-            if datetime.now() >= end_time:
-                break
-
-            run_no += 1
-            monitor["run_count"] = run_no
-            monitor["last_run_at"] = datetime.now().isoformat()
-            _add_monitor_log(monitor_id, f"Run #{run_no} started")
-            _emit_monitor_event(monitor_id, "run_started", {"run_no": run_no})
-
-            results = await _execute_monitor_scan(monitor_id, req)
-            summary = _summarize_results(results)
-            summary["run_no"] = run_no
-            summary["timestamp"] = datetime.now().isoformat()
-
-            monitor["last_summary"] = summary
-            monitor["total_findings"] += summary["total_pii"]
-            monitor["history"].append(summary)
-            if len(monitor["history"]) > 30:
-                monitor["history"] = monitor["history"][-30:]
-
-            _add_monitor_log(
-                monitor_id,
-                f"Run #{run_no} complete: {summary['total_pii']} PII across {summary['total_sources']} sources | Risk: {summary['overall_risk']}",
-            )
-            _emit_monitor_event(monitor_id, "run_completed", summary)
-
-            stats_history.append(
-                {
-                    "scan_id": f"monitor-{monitor_id}-{run_no}",
-                    "query": _monitor_label(req),
-                    "total_findings": summary["total_pii"],
-                    "overall_risk": summary["overall_risk"],
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-
-            if summary.get("alert_ready"):
-                alert_item = {
-                    "id": uuid.uuid4().hex[:10],
-                    "run_no": run_no,
-                    "timestamp": datetime.now().isoformat(),
-                    "risk": summary["high_accuracy_risk"],
-                    "high_accuracy_findings": summary["high_accuracy_pii"],
-                    "total_findings": summary["total_pii"],
-                    "findings": summary.get("high_accuracy_findings", []),
-                }
-                monitor["alerts_sent"] += 1
-                monitor["alerts"].append(alert_item)
-                if len(monitor["alerts"]) > 50:
-                    monitor["alerts"] = monitor["alerts"][-50:]
-                _emit_monitor_event(monitor_id, "alert", alert_item)
-                _add_monitor_log(
-                    monitor_id,
-                    f"IN-APP ALERT: {summary['high_accuracy_pii']} high-accuracy findings | Risk: {summary['high_accuracy_risk']}",
-                )
-            elif summary["total_pii"] > 0:
-                _add_monitor_log(
-                    monitor_id,
-                    "PII found but alert skipped: no high-accuracy matches met the alert threshold",
-                )
-
-            remaining = (end_time - datetime.now()).total_seconds()
-            if remaining <= 0:
-                break
-
-            delay = min(req.interval_seconds, int(remaining))
-            if delay <= 0:
-                break
-
-            monitor["next_run_at"] = (datetime.now() + timedelta(seconds=delay)).isoformat()
-            await asyncio.sleep(delay)
 
-        if monitor.get("status") in ("running", "stopping"):
-            monitor["status"] = "completed" if datetime.now() >= end_time else "stopped"
-            monitor["completed_at"] = datetime.now().isoformat()
-            monitor["next_run_at"] = None
-            _add_monitor_log(monitor_id, f"Monitoring {monitor['status']}")
-            _emit_monitor_event(monitor_id, monitor["status"], {"status": monitor["status"]})
-    except asyncio.CancelledError:
-        monitor["status"] = "stopped"
-        monitor["completed_at"] = datetime.now().isoformat()
-        monitor["next_run_at"] = None
-        _add_monitor_log(monitor_id, "Monitoring stopped by user")
-        _emit_monitor_event(monitor_id, "stopped", {"status": "stopped"})
-        raise
-    except Exception as exc:
-        monitor["status"] = "error"
+def _finish_monitor(monitor_id: str, status: str, exc: Optional[BaseException] = None):
+    """Scheduler callback once a monitor has no more runs: completed, stopped or error."""
+    monitor = monitors.get(monitor_id)
+    if monitor is None:
+        return
+    monitor["status"] = status
+    monitor["completed_at"] = datetime.now().isoformat()
+    monitor["next_run_at"] = None
+    if status == "error":
         monitor["error"] = str(exc)
-        monitor["completed_at"] = datetime.now().isoformat()
-        monitor["next_run_at"] = None
         _add_monitor_log(monitor_id, f"ERROR: {exc}")
         _emit_monitor_event(monitor_id, "error", {"message": str(exc)})
+    else:
+        _add_monitor_log(monitor_id, "Monitoring stopped by user" if status == "stopped" else f"Monitoring {status}")
+        _emit_monitor_event(monitor_id, status, {"status": status})
+    monitors.touch(monitor_id)
+    _persist_monitor(monitor_id)
+    close_topic(f"monitor:{monitor_id}")
+    writer.release(f"monitor:{monitor_id}", WORKER_ID)
+    stats.finish("monitors", monitor_id)
+
+
+def _schedule_monitor(monitor_id: str, req: MonitorRequest, ends_at: datetime, first_run_at: Optional[float] = None):
+    stats.start("monitors", monitor_id)
+    scheduler.add(
+        monitor_id,
+        lambda: _run_monitor_once(monitor_id, req),
+        interval=req.interval_seconds,
+        ends_at=ends_at.timestamp(),
+        on_done=_finish_monitor,
+        on_scheduled=lambda ts: _set_next_run(monitor_id, ts),
+        first_run_at=first_run_at,
+    )
+
+
+def _take_over_monitor(monitor_id: str, monitor: Dict[str, Any]) -> bool:
+    """
+    Backend side of resuming a running monitor; blocking, so run it in a thread.
+
+    Takes the monitor's lease and makes its event ids continue after the last
+    one any worker mirrored. Returns False if another worker holds the lease.
+    """
+    if monitor.get("status") not in ("running", "stopping") or not backend.shared:
+        return True
+    if not _mirror(backend.claim, f"monitor:{monitor_id}", WORKER_ID, MONITOR_LEASE_SECONDS):
+        return False
+    mirrored = _mirror(backend.last_event_id, f"monitor:{monitor_id}") or 0
+    monitor["last_event_id"] = max(monitor.get("last_event_id") or 0, mirrored)
+    return True
+
+
+def _resume_monitor(monitor_id: str, monitor: Dict[str, Any], now: float) -> bool:
+    """
+    Load a persisted monitor and, if it was running, reschedule it on this worker.
+
+    A running monitor must have been taken over first (``_take_over_monitor``).
+    It keeps its planned next run if that is still ahead; runs missed while no
+    worker ran it start within MONITOR_RESUME_SPREAD_SECONDS, spread randomly
+    so they do not all fire at once. Its event ids continue after the last one
+    it published, so SSE clients resuming with Last-Event-ID keep receiving
+    events. Returns True when the monitor was rescheduled.
+    """
+    active = monitor.get("status") in ("running", "stopping")
+    monitor["log"] = BoundedList(LOG_MAX_LINES, monitor.get("log") or [])
+    monitors[monitor_id] = monitor
+    if not active:
+        return False
+    bus.seed(f"monitor:{monitor_id}", monitor.get("last_event_id") or 0)
+    if monitor["status"] == "stopping":
+        _finish_monitor(monitor_id, "stopped")
+        return False
+    try:
+        req = MonitorRequest(**monitor["config"])
+        ends_at = datetime.fromisoformat(monitor["ends_at"])
+        next_run = datetime.fromisoformat(monitor["next_run_at"]).timestamp() if monitor.get("next_run_at") else now
+    except (KeyError, TypeError, ValueError) as exc:
+        _finish_monitor(monitor_id, "error", exc)
+        return False
+    if ends_at.timestamp() <= now:
+        _finish_monitor(monitor_id, "completed")
+        return False
+    if next_run <= now:
+        next_run = now + random.uniform(0, min(MONITOR_RESUME_SPREAD_SECONDS, req.interval_seconds))
+    _add_monitor_log(monitor_id, f"Monitoring resumed on {WORKER_ID}")
+    _emit_monitor_event(monitor_id, "resumed", {"status": "running"})
+    _schedule_monitor(monitor_id, req, ends_at, first_run_at=next_run)
+    _persist_monitor(monitor_id)
+    return True
+
+
+async def _restore_monitors():
+    """Reload persisted monitors on startup and reschedule the running ones."""
+    now = time.time()
+    resumed = 0
+    for monitor_id, monitor in (await asyncio.to_thread(durable.load, "monitors")).items():
+        if await asyncio.to_thread(_take_over_monitor, monitor_id, monitor):
+            resumed += _resume_monitor(monitor_id, monitor, now)
+    if resumed:
+        logger.info(f"Resumed {resumed} monitors from {MONITOR_DB_PATH}")
+
+
+def _stop_local_monitor(monitor_id: str):
+    monitors[monitor_id]["status"] = "stopping"
+    _persist_monitor(monitor_id)
+    scheduler.remove(monitor_id)
+
+
+def _hand_over_monitor(monitor_id: str):
+    """
+    Stop a monitor whose lease another worker now holds, so only that worker runs it.
+
+    The monitor leaves this worker's state without being marked finished: its
+    stored record and event log now belong to the new owner.
+    """
+    logger.warning(f"Lost the lease on monitor {monitor_id}; leaving it to its new owner")
+    if monitor_id in monitors:
+        del monitors[monitor_id]
+    if durable is not None:
+        durable.discard("monitors", monitor_id)
+    # With the monitor gone, the scheduler's on_done (_finish_monitor) records nothing.
+    scheduler.remove(monitor_id)
+    bus.drop(f"monitor:{monitor_id}")
+    stats.finish("monitors", monitor_id)
+
+
+def _renew_leases(monitor_ids: List[str]) -> List[str]:
+    """Renew the leases of our monitors (blocking); returns those another worker has taken."""
+    return [
+        monitor_id for monitor_id in monitor_ids
+        if not backend.claim(f"monitor:{monitor_id}", WORKER_ID, MONITOR_LEASE_SECONDS)
+    ]
+
+
+async def _sync_backend():
+    """
+    Multi-worker housekeeping: apply stop requests made on other workers,
+    renew the leases of our monitors and adopt monitors whose lease expired.
+    """
+    last_adopt = time.monotonic()
+    while True:
+        await asyncio.sleep(BACKEND_SYNC_SECONDS)
+        try:
+            for monitor_id in await asyncio.to_thread(backend.values, "monitor_commands"):
+                if monitor_id in scheduler:
+                    await asyncio.to_thread(backend.delete, "monitor_commands", monitor_id)
+                    _add_monitor_log(monitor_id, "Stop requested via another worker")
+                    _stop_local_monitor(monitor_id)
+            for monitor_id in await asyncio.to_thread(_renew_leases, scheduler.job_ids()):
+                _hand_over_monitor(monitor_id)
+            if durable is not None and time.monotonic() - last_adopt >= MONITOR_LEASE_SECONDS / 3:
+                last_adopt = time.monotonic()
+                now = time.time()
+                for monitor_id, monitor in (await asyncio.to_thread(durable.load, "monitors")).items():
+                    if monitor.get("status") != "running" or monitor_id in scheduler:
+                        continue
+                    if await asyncio.to_thread(_take_over_monitor, monitor_id, monitor) and monitor_id not in scheduler:
+                        if _resume_monitor(monitor_id, monitor, now):
+                            logger.info(f"Adopted orphaned monitor {monitor_id}")
+        except Exception as exc:
+            logger.error(f"State backend sync failed: {exc}")
+
+
+async def _sweep_storage():
+    while True:
+        await asyncio.sleep(STORAGE_SWEEP_SECONDS)
+        try:
+            scans.sweep()
+            traces.sweep()
+            monitors.sweep()
+            if job_queue is not None:
+                await asyncio.to_thread(job_queue.purge)
+            await asyncio.to_thread(_mirror, backend.purge)
+        except Exception as exc:
+            logger.error(f"Storage sweep failed: {exc}")
+
+
+@app.on_event("startup")
+async def startup():
+    app.state.sweeper = asyncio.create_task(_sweep_storage())
+    if durable is not None:
+        await _restore_monitors()
+        app.state.flusher = asyncio.create_task(durable.run())
+    if backend.shared:
+        app.state.backend_writer = asyncio.create_task(writer.run())
+        app.state.backend_sync = asyncio.create_task(_sync_backend())
+    if job_queue is not None:
+        if not backend.shared:
+            raise RuntimeError('SCAN_EXECUTION = "queue" needs a shared STATE_BACKEND_URL')
+        app.state.job_poller = asyncio.create_task(_poll_jobs())
+    scheduler.start()
+    app.state.loop_lag = asyncio.create_task(watch_loop_lag())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.sweeper.cancel()
+    app.state.loop_lag.cancel()
+    if backend.shared:
+        app.state.backend_sync.cancel()
+        # Hand our monitors over right away instead of after the lease expires.
+        for monitor_id in scheduler.job_ids():
+            writer.release(f"monitor:{monitor_id}", WORKER_ID)
+    # Runs cut short here stay "running" in the durable store and resume on the next start.
+    await scheduler.stop()
+    if job_queue is not None:
+        app.state.job_poller.cancel()
+        job_queue.close()
+    if durable is not None:
+        app.state.flusher.cancel()
+        durable.close()
+    if backend.shared:
+        await writer.flush()
+        app.state.backend_writer.cancel()
+    scanner.close()
+    archive_scanner.close()
+    backend.close()
+    if spill is not None:
+        spill.close()
+
 
 @app.get("/")
 async def root():
@@ -445,52 +700,181 @@ async def root():
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+@app.exception_handler(Rejected)
+async def admission_rejected(request: Request, exc: Rejected):
+    return JSONResponse(exc.to_dict(), status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+
+def _client_id(request: Request) -> str:
+    if ADMISSION_CLIENT_HEADER and request.headers.get(ADMISSION_CLIENT_HEADER):
+        return request.headers[ADMISSION_CLIENT_HEADER]
+    return request.client.host if request.client else "unknown"
+
+
+async def _run_admitted(ticket: Ticket, scan_id: str, started: str, run: Callable[[], Any]):
+    """Run a background scan once its admission ticket gets a slot; frees the slot when done."""
+    try:
+        if not ticket.granted:
+            add_log(scan_id, f"Queued: {ticket.position} scans ahead")
+            await ticket.wait()
+            scans[scan_id]["status"] = "running"
+            share_scan(scan_id)
+            emit_event(scan_id, "progress", {"progress": 0, "message": "Started"})
+        add_log(scan_id, started)
+        await run()
+    finally:
+        ticket.release()
+
+
+def _start_admitted_scan(request: Request, scan_id: str, query: str, started: str, run: Callable[[], Any]) -> Dict[str, Any]:
+    ticket = admission.enter("scan", _client_id(request))
+    create_scan(scan_id, query, "running" if ticket.granted else "queued")
+    asyncio.create_task(_run_admitted(ticket, scan_id, started, run))
+    if ticket.granted:
+        return {"scan_id": scan_id, "status": "started"}
+    return {"scan_id": scan_id, "status": "queued", "queue_position": ticket.position}
+
+
 @app.post("/api/scan")
-async def start_scan(req: ScanRequest):
+async def start_scan(req: ScanRequest, request: Request):
     scan_id = uuid.uuid4().hex[:8]
-    scans[scan_id] = {
-        "scan_id": scan_id,
-        "query": req.query,
-        "status": "running",
-        "started_at": datetime.now().isoformat(),
-        "findings": [],
-        "progress": 0,
-        "log": [],
+    if job_queue is not None:
+        return await _enqueue_scan("scan", scan_id, req.query, req)
+    return _start_admitted_scan(
+        request, scan_id, req.query, f'Scan started: "{req.query}"', lambda: run_scan(scan_id, req)
+    )
+
+
+@app.post("/api/scan/crawl")
+async def start_crawl(req: CrawlRequest, request: Request):
+    if not normalize_url(req.url):
+        raise HTTPException(400, "url must be an absolute http(s) URL")
+
+    scan_id = uuid.uuid4().hex[:8]
+    if job_queue is not None:
+        return await _enqueue_scan("crawl", scan_id, f"CRAWL: {req.url}", req)
+    return _start_admitted_scan(
+        request, scan_id, f"CRAWL: {req.url}", f"Crawl started: {req.url}", lambda: run_crawl(scan_id, req)
+    )
+
+
+async def _shared_get(namespace: str, key: str) -> Optional[Dict[str, Any]]:
+    """A scan or monitor mirrored by another worker, if any."""
+    if not backend.shared:
+        return None
+    return await asyncio.to_thread(_mirror, backend.get, namespace, key)
+
+
+# Largest page of findings, history entries or events one GET returns.
+PAGE_MAX_LIMIT = 1000
+
+
+def _check_page(since: Optional[int], cursor: int, limit: Optional[int]):
+    if since is not None and since < 0:
+        raise HTTPException(400, "since must be >= 0")
+    if cursor < 0:
+        raise HTTPException(400, "cursor must be >= 0")
+    if limit is not None and not 1 <= limit <= PAGE_MAX_LIMIT:
+        raise HTTPException(400, f"limit must be between 1 and {PAGE_MAX_LIMIT}")
+
+
+@app.get("/api/scan/{scan_id}", response_class=FastJSONResponse)
+async def get_scan(
+    scan_id: str,
+    fields: Optional[str] = None,
+    since: Optional[int] = None,
+    cursor: int = 0,
+    limit: Optional[int] = None,
+    content: bool = True,
+):
+    """
+    A scan, or the parts of it a poller needs: ``fields`` selects top-level
+    keys, ``since`` returns the log from that position on (``log_next`` is
+    the next one), ``cursor``/``limit`` page through ``findings`` and
+    ``content=false`` leaves out each result's page text.
+    """
+    _check_page(since, cursor, limit)
+    scan = scans.get(scan_id) or await _shared_get("scans", scan_id)
+    if scan is None:
+        raise HTTPException(404, "Scan not found")
+    return FastJSONResponse(shape(scan, "scan_id", parse_fields(fields), since, "findings", cursor, limit, content))
+
+
+async def _events_since(topic: str, since: int, limit: int) -> Optional[Dict[str, Any]]:
+    """Events of a topic after ``since`` (here or mirrored by another worker); None if unknown."""
+    state = bus.topic_state(topic)
+    if state is not None or not backend.shared:
+        events = bus.events(topic, since)
+    else:
+        state = await asyncio.to_thread(_mirror, backend.topic_state, topic)
+        events = await asyncio.to_thread(_mirror, backend.events, topic, since) or []
+    if state is None:
+        return None
+    events = events[:limit]
+    return {
+        "events": [{"id": ev.id, "event": ev.event, "data": ev.data} for ev in events],
+        "next": events[-1].id if events else since,
+        "state": state if len(events) < limit else "open",
     }
-    _add_log(scan_id, f'Scan started: "{req.query}"')
-    asyncio.create_task(_run_scan(scan_id, req))
-    return {"scan_id": scan_id, "status": "started"}
 
 
-@app.get("/api/scan/{scan_id}")
-async def get_scan(scan_id: str):
-    if scan_id not in scans:
+@app.get("/api/scan/{scan_id}/events", response_class=FastJSONResponse)
+async def scan_events(scan_id: str, since: int = 0, limit: int = PAGE_MAX_LIMIT):
+    """The scan's events after id ``since``, for clients that poll instead of streaming."""
+    _check_page(since, 0, limit)
+    page = await _events_since(f"scan:{scan_id}", since, limit)
+    if page is None:
         raise HTTPException(404, "Scan not found")
-    return scans[scan_id]
+    return FastJSONResponse(page)
 
 
-@app.get("/api/scan/{scan_id}/stream")
-async def scan_stream(scan_id: str):
-    async def generate():
-        last_idx = 0
-        while True:
-            events = scan_events.get(scan_id, [])
-            for ev in events[last_idx:]:
-                yield f"event: {ev['event']}\ndata: {json.dumps(ev['data'])}\n\n"
-                last_idx += 1
+@app.get("/api/scan/{scan_id}/trace", response_class=FastJSONResponse)
+async def scan_trace(scan_id: str):
+    """The finished scan's spans as an OTLP/JSON ExportTraceServiceRequest (POST-able to a collector's /v1/traces)."""
+    scan = scans.get(scan_id) or await _shared_get("scans", scan_id)
+    if scan is None:
+        raise HTTPException(404, "Scan not found")
+    if not scan.get("timing"):
+        raise HTTPException(409, "Scan has no trace yet")
+    trace = traces.get(scan_id) or await _shared_get("traces", scan_id)
+    if trace is None:
+        raise HTTPException(404, "Scan trace is no longer kept")
+    return FastJSONResponse(to_otlp(trace))
+
+
+async def _sse(topic: str, last_event_id: int):
+    """Push a topic's events as SSE frames, then a final "done" once the topic is closed."""
+    last = last_event_id
+    if topic in bus or not backend.shared:
+        async for ev in bus.subscribe(topic, last_event_id):
+            if ev is not None and ev.id is not None:
+                last = ev.id
+            yield sse_frame(ev)
+        if not backend.shared or topic in bus:
+            yield b"event: done\ndata: {}\n\n"
+            return
+        # Dropped rather than closed: the monitor was handed over, so continue with its new owner's log.
+    # Published by another worker: follow its mirrored event log.
+    async for ev in follow_remote(backend, topic, last):
+        yield sse_frame(ev)
+    yield b"event: done\ndata: {}\n\n"
 
-            if scan_id in scans and scans[scan_id]["status"] in ("completed", "error"):
-                yield "event: done\ndata: {}\n\n"
-                break
-            await asyncio.sleep(0.5)
 
-    return StreamingResponse(generate(), media_type="text/event-stream")
+@app.get("/api/scan/{scan_id}/stream")
+async def scan_stream(scan_id: str, request: Request, last_event_id: Optional[str] = None):
+    if scan_id not in scans and await _shared_get("scans", scan_id) is None:
+        raise HTTPException(404, "Scan not found")
+    resume_from = parse_last_event_id(request.headers.get("last-event-id") or last_event_id)
+    return StreamingResponse(_sse(f"scan:{scan_id}", resume_from), media_type="text/event-stream")
 
 
 @app.post("/api/monitor/start")
 async def start_monitor(req: MonitorRequest):
     _validate_monitor_request(req)
     req.mode = req.mode.lower().strip()
+    if len(scheduler.job_ids()) >= MONITOR_MAX_ACTIVE:
+        # Runs themselves are capped by the scheduler; this bounds how many monitors queue up for it.
+        raise Rejected("monitor", "queue_full", retry_after=req.interval_seconds, queue_depth=scheduler.stats()["queue_depth"])
 
     monitor_id = uuid.uuid4().hex[:8]
     started_at = datetime.now()
@@ -512,18 +896,18 @@ async def start_monitor(req: MonitorRequest):
         "last_summary": None,
         "history": [],
         "alerts": [],
-        "log": [],
+        "log": BoundedList(LOG_MAX_LINES),
         "config": _sanitize_monitor_config(req),
     }
-    monitor_events[monitor_id] = []
 
     _add_monitor_log(
         monitor_id,
         f"Monitoring started for {req.duration_minutes} min, interval {req.interval_seconds} sec, mode={req.mode}",
     )
 
-    task = asyncio.create_task(_run_monitor_loop(monitor_id, req))
-    monitor_tasks[monitor_id] = task
+    await asyncio.to_thread(_mirror, backend.claim, f"monitor:{monitor_id}", WORKER_ID, MONITOR_LEASE_SECONDS)
+    _schedule_monitor(monitor_id, req, ends_at)
+    _persist_monitor(monitor_id)
 
     return {
         "monitor_id": monitor_id,
@@ -533,119 +917,242 @@ async def start_monitor(req: MonitorRequest):
     }
 
 
-@app.get("/api/monitor/{monitor_id}")
-async def get_monitor(monitor_id: str):
-    monitor = monitors.get(monitor_id)
+@app.get("/api/monitor/{monitor_id}", response_class=FastJSONResponse)
+async def get_monitor(
+    monitor_id: str,
+    fields: Optional[str] = None,
+    since: Optional[int] = None,
+    cursor: int = 0,
+    limit: Optional[int] = None,
+):
+    """A monitor; ``fields``, ``since`` and ``cursor``/``limit`` (over ``history``) work as for scans."""
+    _check_page(since, cursor, limit)
+    monitor = monitors.get(monitor_id) or await _shared_get("monitors", monitor_id)
     if not monitor:
         raise HTTPException(404, "Monitor not found")
-    return monitor
+    return FastJSONResponse(shape(monitor, "monitor_id", parse_fields(fields), since, "history", cursor, limit))
 
 
-@app.get("/api/monitor")
+@app.get("/api/monitor", response_class=FastJSONResponse)
 async def list_monitors():
-    return {"monitors": list(monitors.values())[-20:][::-1]}
+    found = list(monitors.values())
+    if backend.shared:
+        shared = await asyncio.to_thread(_mirror, backend.values, "monitors") or {}
+        found += [m for monitor_id, m in shared.items() if monitor_id not in monitors]
+        found.sort(key=lambda m: m.get("started_at") or "")
+    return FastJSONResponse({"monitors": found[-20:][::-1]})
 
 
 @app.post("/api/monitor/{monitor_id}/stop")
 async def stop_monitor(monitor_id: str):
     monitor = monitors.get(monitor_id)
     if not monitor:
-        raise HTTPException(404, "Monitor not found")
+        monitor = await _shared_get("monitors", monitor_id)
+        if not monitor:
+            raise HTTPException(404, "Monitor not found")
+        if monitor.get("status") in ("running", "stopping"):
+            # Runs on another worker, which picks the request up on its next backend sync.
+            await asyncio.to_thread(
+                _mirror, backend.put, "monitor_commands", monitor_id, {"action": "stop"}, ttl=MONITOR_LEASE_SECONDS
+            )
+            return {"monitor_id": monitor_id, "status": "stopping"}
+        return {"monitor_id": monitor_id, "status": monitor.get("status")}
 
     if monitor.get("status") not in ("running", "stopping"):
         return {"monitor_id": monitor_id, "status": monitor.get("status")}
 
-    monitor["status"] = "stopping"
-    task = monitor_tasks.get(monitor_id)
-    if task and not task.done():
-        task.cancel()
-    return {"monitor_id": monitor_id, "status": "stopping"}
+    _stop_local_monitor(monitor_id)
+    return {"monitor_id": monitor_id, "status": monitor["status"]}
+
+
+@app.get("/api/monitor/{monitor_id}/events", response_class=FastJSONResponse)
+async def monitor_events(monitor_id: str, since: int = 0, limit: int = PAGE_MAX_LIMIT):
+    _check_page(since, 0, limit)
+    page = await _events_since(f"monitor:{monitor_id}", since, limit)
+    if page is None:
+        raise HTTPException(404, "Monitor not found")
+    return FastJSONResponse(page)
 
 
 @app.get("/api/monitor/{monitor_id}/stream")
-async def monitor_stream(monitor_id: str):
-    if monitor_id not in monitors:
+async def monitor_stream(monitor_id: str, request: Request, last_event_id: Optional[str] = None):
+    if monitor_id not in monitors and await _shared_get("monitors", monitor_id) is None:
         raise HTTPException(404, "Monitor not found")
+    resume_from = parse_last_event_id(request.headers.get("last-event-id") or last_event_id)
+    return StreamingResponse(_sse(f"monitor:{monitor_id}", resume_from), media_type="text/event-stream")
 
-    async def generate():
-        last_idx = 0
-        while True:
-            events = monitor_events.get(monitor_id, [])
-            for ev in events[last_idx:]:
-                yield f"event: {ev['event']}\ndata: {json.dumps(ev['data'])}\n\n"
-                last_idx += 1
-
-            status = monitors.get(monitor_id, {}).get("status")
-            if status in ("completed", "stopped", "error"):
-                yield "event: done\ndata: {}\n\n"
-                break
-            await asyncio.sleep(0.5)
-
-    return StreamingResponse(generate(), media_type="text/event-stream")
-
-
-@app.post("/api/scan/url")
-async def scan_url(req: URLScanRequest):
-    result = await scanner.scan_url(req.url, engine)
-    stats_history.append(
+
+@app.post("/api/scan/url", response_class=FastJSONResponse)
+async def scan_url(req: URLScanRequest, request: Request):
+    async with admission.enter("url", _client_id(request)):
+        result = await scanner.scan_url(req.url, engine)
+    record_stats(
         {
             "scan_id": "url-" + uuid.uuid4().hex[:6],
             "query": f"URL: {req.url[:40]}",
             "total_findings": result["pii_count"],
             "overall_risk": "HIGH" if result["pii_count"] > 0 else "LOW",
             "timestamp": datetime.now().isoformat(),
-        }
+        },
+        "url",
+        result.get("detection_methods"),
     )
-    return result
+    return FastJSONResponse(result)
 
 
-@app.post("/api/scan/social")
-async def scan_social(req: SocialScanRequest):
-    results = await social_scanner.scan_handle(req.platform, req.handle, engine, deep_search=True)
+@app.post("/api/scan/social", response_class=FastJSONResponse)
+async def scan_social(req: SocialScanRequest, request: Request):
+    platforms = req.platforms or ([req.platform] if req.platform else [])
+    if not platforms:
+        raise HTTPException(400, "platform or platforms is required")
+    _check_platforms(platforms)
+    async with admission.enter("discovery", _client_id(request)):
+        results = await social_scanner.scan_handles(platforms, req.handle, engine, deep_search=True)
     if not results:
         raise HTTPException(404, "No social data found for this handle")
 
     total_pii = sum(r.get("pii_count", 0) for r in results if isinstance(r, dict) and "error" not in r)
-    stats_history.append(
+    record_stats(
         {
             "scan_id": f"social-{uuid.uuid4().hex[:6]}",
             "query": f"SOCIAL DISCOVERY: @{req.handle}",
             "total_findings": total_pii,
             "overall_risk": "HIGH" if total_pii > 0 else "LOW",
             "timestamp": datetime.now().isoformat(),
-        }
+        },
+        "social",
+        _methods_of(results),
     )
-    return results
+    return FastJSONResponse(results)
 
 
-@app.post("/api/scan/email")
-async def scan_email(req: EmailScanRequest):
-    results = await email_scanner.scan_email(req.email, engine)
+@app.post("/api/scan/email", response_class=FastJSONResponse)
+async def scan_email(req: EmailScanRequest, request: Request):
+    async with admission.enter("discovery", _client_id(request)):
+        results = await email_scanner.scan_email(req.email, engine)
     if not results:
         raise HTTPException(404, "No public data found for this email")
 
     total_pii = sum(r.get("pii_count", 0) for r in results if isinstance(r, dict) and "error" not in r)
-    stats_history.append(
+    record_stats(
         {
             "scan_id": f"email-{uuid.uuid4().hex[:6]}",
             "query": f"EMAIL DISCOVERY: {req.email}",
             "total_findings": total_pii,
             "overall_risk": "HIGH" if total_pii > 0 else "LOW",
             "timestamp": datetime.now().isoformat(),
-        }
+        },
+        "email",
+        _methods_of(results),
     )
-    return results
+    return FastJSONResponse(results)
+
+
+@app.post("/api/scan/email/bulk")
+async def scan_email_bulk(request: Request, format: str = "auto", concurrency: int = BULK_CONCURRENCY):
+    """
+    Email discovery for a CSV or NDJSON list of addresses, streamed back as NDJSON.
+
+    The body is spooled to a temporary file (in memory up to BULK_SPOOL_BYTES)
+    and read back record by record while results stream out.
+    """
+    if format not in ("auto", "csv", "ndjson"):
+        raise HTTPException(400, "format must be auto, csv or ndjson")
+    if not 1 <= concurrency <= 16:
+        raise HTTPException(400, "concurrency must be between 1 and 16")
+    if format == "auto":
+        content_type = request.headers.get("content-type", "").lower()
+        if "ndjson" in content_type or "jsonl" in content_type:
+            format = "ndjson"
+        elif "csv" in content_type:
+            format = "csv"
+
+    # Admitted before the upload is read, and holds its slot until the stream ends.
+    ticket = admission.enter("discovery", _client_id(request))
+    spool = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES)
+    try:
+        await ticket.wait()
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > BULK_MAX_UPLOAD_BYTES:
+                raise HTTPException(413, f"Upload exceeds {BULK_MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+            spool.write(chunk)
+        if not size:
+            raise HTTPException(400, "Empty upload")
+    except BaseException:
+        spool.close()
+        ticket.release()
+        raise
+    spool.seek(0)
+
+    scan_id = f"email-bulk-{uuid.uuid4().hex[:6]}"
+    lines = (line.decode("utf-8", errors="replace") for line in spool)
 
+    async def generate():
+        total_pii = 0
+        risk_counts: Dict[str, int] = {}
+        try:
+            async for event in email_scanner.scan_emails(
+                iter_email_records(lines, format), engine, concurrency=concurrency
+            ):
+                if event["type"] == "result" and "error" not in event:
+                    event["overall_risk"] = risk_from_severity(event["by_severity"])
+                    risk_counts[event["overall_risk"]] = risk_counts.get(event["overall_risk"], 0) + 1
+                    total_pii += event["total_pii"]
+                elif event["type"] == "summary":
+                    event.update(scan_id=scan_id, total_pii=total_pii, by_risk=risk_counts)
+                    record_stats(
+                        {
+                            "scan_id": scan_id,
+                            "query": f"EMAIL BULK: {event['queued']} addresses",
+                            "total_findings": total_pii,
+                            "overall_risk": risk_from_severity(
+                                {level: risk_counts.get(level, 0) for level in ("CRITICAL", "HIGH", "MEDIUM")}
+                            ),
+                            "timestamp": datetime.now().isoformat(),
+                        },
+                        "email_bulk",
+                    )
+                yield dumps(event) + b"\n"
+        finally:
+            spool.close()
+            ticket.release()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.post("/api/scan/file", response_class=FastJSONResponse)
+async def scan_file(request: Request, file: UploadFile = File(...)):
+    # zip/tar(.gz)/gzip uploads are scanned entry by entry (see archive_scanner.py).
+    archive_format = await asyncio.to_thread(sniff_archive, file.file)
+    if archive_format:
+        async with admission.enter("analyze", _client_id(request)):
+            result = await archive_scanner.scan(file.file, archive_format, engine, filename=file.filename)
+        result = {"filename": file.filename, "file_size": file.size, **result}
+        severity = result["by_severity"]
+        record_stats(
+            {
+                "scan_id": "file-" + uuid.uuid4().hex[:6],
+                "query": f"Archive: {file.filename} ({result['archive']['scanned']} files)",
+                "total_findings": result["pii_count"],
+                "overall_risk": "CRITICAL" if severity.get("CRITICAL", 0) > 0 else "HIGH" if severity.get("HIGH") else "LOW",
+                "timestamp": datetime.now().isoformat(),
+            },
+            "file",
+            result["by_method"],
+        )
+        return FastJSONResponse(result)
 
-@app.post("/api/scan/file")
-async def scan_file(file: UploadFile = File(...)):
     content = await file.read()
     try:
         text = content.decode("utf-8")
     except UnicodeDecodeError:
         text = content.decode("latin-1")
 
-    pii_matches = engine.detect(text)
+    # Detection (BERT inference) runs off the event loop, at most ADMISSION_LIMITS["analyze"] at once.
+    async with admission.enter("analyze", _client_id(request)):
+        pii_matches = await asyncio.to_thread(engine.detect, text)
     methods: Dict[str, int] = {}
     severity: Dict[str, int] = {}
     for match in pii_matches:
@@ -673,28 +1180,31 @@ async def scan_file(file: UploadFile = File(...)):
         "by_method": methods,
     }
 
-    stats_history.append(
+    record_stats(
         {
             "scan_id": "file-" + uuid.uuid4().hex[:6],
             "query": f"File: {file.filename}",
             "total_findings": len(pii_matches),
             "overall_risk": "CRITICAL" if severity.get("CRITICAL", 0) > 0 else "HIGH" if severity.get("HIGH") else "LOW",
             "timestamp": datetime.now().isoformat(),
-        }
+        },
+        "file",
+        methods,
     )
-    return result
+    return FastJSONResponse(result)
 
 
-@app.post("/api/analyze")
-async def analyze_text(req: AnalyzeRequest):
-    pii_matches = engine.detect(req.text)
+@app.post("/api/analyze", response_class=FastJSONResponse)
+async def analyze_text(req: AnalyzeRequest, request: Request):
+    async with admission.enter("analyze", _client_id(request)):
+        pii_matches = await asyncio.to_thread(engine.detect, req.text)
     methods: Dict[str, int] = {}
     severity: Dict[str, int] = {}
     for match in pii_matches:
         methods[match.detection_method] = methods.get(match.detection_method, 0) + 1
         severity[match.severity] = severity.get(match.severity, 0) + 1
 
-    return {
+    return FastJSONResponse({
         "total_findings": len(pii_matches),
         "findings": [
             {
@@ -710,31 +1220,148 @@ async def analyze_text(req: AnalyzeRequest):
         ],
         "by_severity": severity,
         "by_method": methods,
+    })
+
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(request: Request, format: str = "auto", batch_size: int = BATCH_SIZE):
+    """
+    PII detection for a JSON array or NDJSON stream of ``{"id", "text"}`` records, streamed back as NDJSON.
+
+    Records are detected in batches and each ``{"id", "findings"}`` result is
+    written as soon as its batch is done; a "summary" line with aggregate
+    counts ends the stream. The body is spooled like bulk email uploads.
+    """
+    if format not in ("auto", "json", "ndjson"):
+        raise HTTPException(400, "format must be auto, json or ndjson")
+    if not 1 <= batch_size <= 256:
+        raise HTTPException(400, "batch_size must be between 1 and 256")
+
+    # One slot of the analysis pool for the whole stream.
+    ticket = admission.enter("analyze", _client_id(request))
+    spool = tempfile.SpooledTemporaryFile(max_size=BULK_SPOOL_BYTES)
+    try:
+        await ticket.wait()
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > BULK_MAX_UPLOAD_BYTES:
+                raise HTTPException(413, f"Upload exceeds {BULK_MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+            spool.write(chunk)
+        if not size:
+            raise HTTPException(400, "Empty upload")
+    except BaseException:
+        spool.close()
+        ticket.release()
+        raise
+    spool.seek(0)
+
+    async def generate():
+        try:
+            async for event in analyze_records(iter_text_records(spool, format), engine, batch_size=batch_size):
+                yield dumps(event) + b"\n"
+        finally:
+            spool.close()
+            ticket.release()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/api/fetch/stats")
+async def get_fetch_stats():
+    return {**scanner.fetch_stats(), "dedup": scanner.dedup_stats()}
+
+
+@app.get("/api/scheduler/stats")
+async def get_scheduler_stats():
+    return {**scheduler.stats(), "coalescing": coalescer.stats()}
+
+
+@app.get("/api/admission/stats")
+async def get_admission_stats():
+    return {**admission.stats(), "monitor": {"running": len(scheduler.job_ids()), "max_active": MONITOR_MAX_ACTIVE}}
+
+
+@app.get("/api/jobs/stats")
+async def get_job_stats():
+    if job_queue is None:
+        return {"execution": SCAN_EXECUTION}
+    return {"execution": SCAN_EXECUTION, **await asyncio.to_thread(job_queue.stats), "waiting": len(_job_waiters)}
+
+
+SCANS_ACTIVE.set_function(lambda: stats.active("scans"))
+MONITORS_ACTIVE.set_function(lambda: stats.active("monitors"))
+SSE_SUBSCRIBERS.set_function(bus.subscribers)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics for this process (see metrics.py)."""
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/api/storage/stats")
+async def get_storage_stats():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "scans": scans.stats(),
+        "traces": traces.stats(),
+        "monitors": monitors.stats(),
+        "events": bus.stats(),
+        "durable": durable.stats() if durable is not None else None,
+        "backend": {**backend.stats(), "worker_id": WORKER_ID, "writer": writer.stats()},
+        "stats_rollup_buckets": stats.stats(),
+        "spill_path": STORAGE_SPILL_PATH,
+        # ru_maxrss is in KiB on Linux.
+        "process_max_rss_bytes": usage.ru_maxrss * 1024,
     }
 
 
 @app.get("/api/stats")
 async def get_stats():
-    total_scans = len(stats_history)
-    total_findings = sum(s.get("total_findings", 0) for s in stats_history)
-    active_scans = sum(1 for s in scans.values() if s.get("status") == "running")
-    active_monitors = sum(1 for m in monitors.values() if m.get("status") in ("running", "stopping"))
-
-    risk_dist: Dict[str, int] = {}
-    for item in stats_history:
-        risk = item.get("overall_risk", "LOW")
-        risk_dist[risk] = risk_dist.get(risk, 0) + 1
-
+    summary = stats.summary()
     return {
-        "total_scans": total_scans,
-        "total_findings": total_findings,
-        "active_scans": active_scans,
-        "active_monitors": active_monitors,
-        "risk_distribution": risk_dist,
-        "recent_scans": stats_history[-10:][::-1],
+        "total_scans": summary["total_scans"],
+        "total_findings": summary["total_findings"],
+        "active_scans": stats.active("scans"),
+        "active_monitors": stats.active("monitors"),
+        "risk_distribution": summary["risk_distribution"],
+        "by_method": summary["by_method"],
+        "by_type": summary["by_type"],
+        "recent_scans": summary["recent_scans"],
     }
 
 
+def _parse_time(value: Optional[str], default: float) -> float:
+    """Epoch seconds or an ISO 8601 timestamp (naive values are local time)."""
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        raise HTTPException(400, f"Invalid time: {value}")
+
+
+@app.get("/api/stats/timeseries")
+async def get_stats_timeseries(
+    resolution: str = "minute", start: Optional[str] = None, end: Optional[str] = None, fill: bool = True
+):
+    """Per-bucket scans, findings and risk/method/type breakdowns for a time range (default: the last 60 buckets)."""
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(400, f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+    width, _ = RESOLUTIONS[resolution]
+    end_ts = _parse_time(end, time.time())
+    start_ts = _parse_time(start, end_ts - 60 * width)
+    try:
+        return stats.timeseries(resolution, start_ts, end_ts, fill=fill)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+
+
 if __name__ == "__main__":
     import uvicorn
 
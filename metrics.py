@@ -0,0 +1,236 @@
+"""
+Metrics — Prometheus counters, gauges and histograms for the scan path, served at ``/metrics``.
+
+A small in-process registry that renders the Prometheus text exposition
+format, so no client library is needed. Recording is a lock, a dict lookup
+and (for histograms) a bisect over the bucket bounds, cheap enough to stay
+on in production; gauges whose value already lives elsewhere (active scans,
+SSE subscribers) are read through a callback only when ``/metrics`` is
+scraped. Metrics are per process: each API worker serves its own.
+"""
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds: from a fast regex pass to a slow page fetch.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 2097152, 4194304)
+LOOP_LAG_INTERVAL = 0.5
+
+_Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> _Labels:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}") from None
+
+    def _label_str(self, key: _Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        head = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        lines = self.samples()
+        return head + "".join(line + "\n" for line in lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[_Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[_Labels, float] = {}
+        self._callback: Optional[Callable[[], object]] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, callback: Callable[[], object]):
+        """Read the value at scrape time: a number, or ``{label tuple: number}`` for labelled gauges."""
+        self._callback = callback
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            value = self._callback()
+            items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, +Inf last), sum].
+        self._values: Dict[_Labels, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._label_str(key, ('le', _format_value(float(bound))))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+REGISTRY = Registry()
+
+# ── Scan path ──
+
+SEARCH_SECONDS = REGISTRY.histogram(
+    "pii_search_duration_seconds", "Tavily search latency, retries included.", ["outcome"])
+SEARCH_ERRORS = REGISTRY.counter(
+    "pii_search_errors_total", "Tavily searches that returned no results because of an error.", ["reason"])
+FETCH_SECONDS = REGISTRY.histogram(
+    "pii_fetch_duration_seconds", "Page fetch latency (download and text extraction), retries included.", ["outcome"])
+FETCH_RESPONSES = REGISTRY.counter(
+    "pii_fetch_responses_total", "Page fetches by final HTTP status (or error).", ["status"])
+FETCH_BYTES = REGISTRY.counter(
+    "pii_fetch_bytes_total", "Page bytes downloaded from the network and used after truncation.", ["kind"])
+FETCH_RESPONSE_BYTES = REGISTRY.histogram(
+    "pii_fetch_response_bytes", "Bytes downloaded per page fetch.", buckets=BYTES_BUCKETS)
+CLEAN_SECONDS = REGISTRY.histogram(
+    "pii_html_clean_duration_seconds", "HTML-to-text extraction time per page, pool wait included.")
+DETECT_SECONDS = REGISTRY.histogram(
+    "pii_detect_duration_seconds", "PII detection time per call and layer.", ["layer"])
+FINDINGS = REGISTRY.counter(
+    "pii_findings_total", "PII findings detected, by type and detection method.", ["type", "method"])
+
+# ── Runtime ──
+
+SCANS_ACTIVE = REGISTRY.gauge("pii_scans_active", "Scans started (running or queued) and not yet finished.")
+MONITORS_ACTIVE = REGISTRY.gauge("pii_monitors_active", "Monitors running.")
+MONITOR_LAG_SECONDS = REGISTRY.histogram(
+    "pii_monitor_schedule_lag_seconds", "Delay between a monitor run's due time and its start.")
+SSE_SUBSCRIBERS = REGISTRY.gauge("pii_sse_subscribers", "Open SSE streams on scan and monitor topics.")
+LOOP_LAG = REGISTRY.histogram(
+    "pii_event_loop_lag_seconds", "How late the event loop ran a timer scheduled every "
+    f"{LOOP_LAG_INTERVAL} s.", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+LOOP_LAG_LAST = REGISTRY.gauge("pii_event_loop_lag_last_seconds", "Event loop lag at the last check.")
+
+
+async def watch_loop_lag(interval: float = LOOP_LAG_INTERVAL):
+    """Sleep ``interval`` at a time and record how much later than that the loop woke up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        LOOP_LAG.observe(lag)
+        LOOP_LAG_LAST.set(lag)
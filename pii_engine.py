@@ -5,10 +5,15 @@ Layer 2: spaCy NER (PERSON, ORG, GPE, LOC, DATE)
 Layer 3: Transformer NER - dslim/bert-base-NER (PER, ORG, LOC, MISC)
 """
 import re
+import time
 import logging
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 
+from metrics import DETECT_SECONDS, FINDINGS
+from tracing import span
+
 logger = logging.getLogger(__name__)
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -166,6 +171,32 @@ def _get_context(text: str, start: int, end: int, window: int = 40) -> str:
     return ctx
 
 
+@contextmanager
+def _layer(name: str):
+    """Time a detection layer for /metrics and the current trace."""
+    with DETECT_SECONDS.time(layer=name), span(f"detect.{name}"):
+        yield
+
+
+def _count_findings(matches: List[PIIMatch]):
+    counts: Dict[tuple, int] = {}
+    for m in matches:
+        key = (m.pii_type, m.detection_method)
+        counts[key] = counts.get(key, 0) + 1
+    for (pii_type, method), count in counts.items():
+        FINDINGS.inc(count, type=pii_type, method=method)
+
+
+def _merge(matches: List[PIIMatch]) -> List[PIIMatch]:
+    """Deduplicate by (normalized_value, pii_type), keeping the highest confidence, in text order."""
+    unique = {}
+    for m in matches:
+        key = (m.value.strip().lower(), m.pii_type)
+        if key not in unique or m.confidence > unique[key].confidence:
+            unique[key] = m
+    return sorted(unique.values(), key=lambda m: m.start)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Main Engine
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -211,24 +242,72 @@ class PIIEngine:
         text = text[:max_length]
         all_matches: List[PIIMatch] = []
 
-        # Layer 1: Regex
-        all_matches.extend(self._detect_regex(text))
-
-        # Layer 2: spaCy NER
-        all_matches.extend(self._detect_spacy(text))
-
-        # Layer 3: Transformer NER
-        all_matches.extend(self._detect_transformer(text))
-
-        # Deduplicate by (normalized_value, pii_type) — keep highest confidence
-        unique = {}
-        for m in all_matches:
-            key = (m.value.strip().lower(), m.pii_type)
-            if key not in unique or m.confidence > unique[key].confidence:
-                unique[key] = m
+        with span("detect", chars=len(text)) as attrs:
+            # Layer 1: Regex
+            with _layer("regex"):
+                all_matches.extend(self._detect_regex(text))
+
+            # Layer 2: spaCy NER
+            if self.nlp:
+                with _layer("spacy"):
+                    all_matches.extend(self._detect_spacy(text))
+
+            # Layer 3: Transformer NER
+            if self.ner_pipe:
+                with _layer("transformer"):
+                    all_matches.extend(self._detect_transformer(text))
+
+            merged = _merge(all_matches)
+            attrs["findings"] = len(merged)
+        _count_findings(merged)
+        return merged
+
+    def detect_batch(self, texts: List[str], max_length: int = 50000, batch_size: int = 32) -> List[List[PIIMatch]]:
+        """
+        ``detect`` for many texts at once: same results, one list per text.
+
+        spaCy and the transformer process the texts (and their chunks) in
+        batches of ``batch_size`` instead of one model call per text, which is
+        what dominates the cost for many short texts.
+        """
+        texts = [(text or "")[:max_length] for text in texts]
+        with DETECT_SECONDS.time(layer="regex"):
+            all_matches: List[List[PIIMatch]] = [self._detect_regex(text) if text else [] for text in texts]
+
+        if self.nlp:
+            started = time.perf_counter()
+            # (text index, offset) of every spaCy chunk.
+            spans = [(i, offset) for i, text in enumerate(texts) for offset in range(0, len(text), 100000)]
+            try:
+                docs = self.nlp.pipe(
+                    (texts[i][offset:offset + 100000][:self.nlp.max_length] for i, offset in spans),
+                    batch_size=batch_size,
+                )
+                for (i, offset), doc in zip(spans, docs):
+                    all_matches[i].extend(self._spacy_matches(texts[i], doc, offset))
+            except Exception:
+                # Fall back to one text at a time, which skips only the failing chunks.
+                for i, text in enumerate(texts):
+                    all_matches[i] = [m for m in all_matches[i] if m.detection_method != "spacy"]
+                    all_matches[i].extend(self._detect_spacy(text))
+            DETECT_SECONDS.observe(time.perf_counter() - started, layer="spacy")
+
+        chunks = [(i, chunk) for i, text in enumerate(texts) for chunk in self._transformer_chunks(text)]
+        if self.ner_pipe and chunks:
+            started = time.perf_counter()
+            try:
+                results = self.ner_pipe([chunk for _, chunk in chunks], batch_size=batch_size)
+                for (i, _), entities in zip(chunks, results):
+                    all_matches[i].extend(self._transformer_matches(texts[i], entities))
+            except Exception:
+                for i, text in enumerate(texts):
+                    all_matches[i] = [m for m in all_matches[i] if m.detection_method != "transformer"]
+                    all_matches[i].extend(self._detect_transformer(text))
+            DETECT_SECONDS.observe(time.perf_counter() - started, layer="transformer")
 
-        result = sorted(unique.values(), key=lambda m: m.start)
-        return result
+        merged = [_merge(matches) for matches in all_matches]
+        _count_findings([m for matches in merged for m in matches])
+        return merged
 
     def _detect_regex(self, text: str) -> List[PIIMatch]:
         """Layer 1: Regex-based pattern detection."""
@@ -270,41 +349,47 @@ class PIIEngine:
             except Exception:
                 continue
 
-            for ent in doc.ents:
-                if ent.label_ not in ("PERSON", "ORG", "GPE", "LOC", "DATE", "NORP"):
-                    continue
-
-                # Map spaCy labels to PII types
-                pii_type = {
-                    "PERSON": "PERSON_NAME",
-                    "ORG": "ORGANIZATION",
-                    "GPE": "LOCATION",
-                    "LOC": "LOCATION",
-                    "DATE": "DATE_ENTITY",
-                    "NORP": "NATIONALITY",
-                }.get(ent.label_, ent.label_)
-
-                severity = "HIGH" if pii_type in ("PERSON_NAME",) else "MEDIUM"
-                confidence = 0.75 if ent.label_ in ("PERSON", "ORG") else 0.65
+            matches.extend(self._spacy_matches(text, doc, offset))
+        return matches
 
-                # Skip very short or numeric-only entities
-                if len(ent.text.strip()) < 2 or ent.text.strip().isdigit():
-                    continue
+    def _spacy_matches(self, text: str, doc, offset: int) -> List[PIIMatch]:
+        """PII matches from a spaCy doc of the chunk of ``text`` starting at ``offset``."""
+        matches = []
+        for ent in doc.ents:
+            if ent.label_ not in ("PERSON", "ORG", "GPE", "LOC", "DATE", "NORP"):
+                continue
 
-                abs_start = offset + ent.start_char
-                abs_end = offset + ent.end_char
+            # Map spaCy labels to PII types
+            pii_type = {
+                "PERSON": "PERSON_NAME",
+                "ORG": "ORGANIZATION",
+                "GPE": "LOCATION",
+                "LOC": "LOCATION",
+                "DATE": "DATE_ENTITY",
+                "NORP": "NATIONALITY",
+            }.get(ent.label_, ent.label_)
+
+            severity = "HIGH" if pii_type in ("PERSON_NAME",) else "MEDIUM"
+            confidence = 0.75 if ent.label_ in ("PERSON", "ORG") else 0.65
+
+            # Skip very short or numeric-only entities
+            if len(ent.text.strip()) < 2 or ent.text.strip().isdigit():
+                continue
 
-                matches.append(PIIMatch(
-                    pii_type=pii_type,
-                    value=ent.text,
-                    masked_value=_mask_value(ent.text, pii_type),
-                    confidence=confidence,
-                    severity=severity,
-                    context=_get_context(text, abs_start, abs_end),
-                    detection_method="spacy",
-                    start=abs_start,
-                    end=abs_end,
-                ))
+            abs_start = offset + ent.start_char
+            abs_end = offset + ent.end_char
+
+            matches.append(PIIMatch(
+                pii_type=pii_type,
+                value=ent.text,
+                masked_value=_mask_value(ent.text, pii_type),
+                confidence=confidence,
+                severity=severity,
+                context=_get_context(text, abs_start, abs_end),
+                detection_method="spacy",
+                start=abs_start,
+                end=abs_end,
+            ))
         return matches
 
     def _detect_transformer(self, text: str) -> List[PIIMatch]:
@@ -313,54 +398,61 @@ class PIIEngine:
             return []
 
         matches = []
-        # BERT has token limit, process in chunks
-        chunk_size = 400
-        words = text.split()
-
-        for i in range(0, len(words), chunk_size):
-            chunk = " ".join(words[i:i + chunk_size])
+        for chunk in self._transformer_chunks(text):
             try:
                 entities = self.ner_pipe(chunk)
             except Exception:
                 continue
+            matches.extend(self._transformer_matches(text, entities))
+        return matches
 
-            for ent in entities:
-                if ent.get("score", 0) < 0.7:
-                    continue
+    @staticmethod
+    def _transformer_chunks(text: str) -> List[str]:
+        # BERT has token limit, process in chunks
+        chunk_size = 400
+        words = text.split()
+        return [" ".join(words[i:i + chunk_size]) for i in range(0, len(words), chunk_size)]
 
-                label = ent.get("entity_group", "")
-                word = ent.get("word", "").strip()
+    def _transformer_matches(self, text: str, entities: List[Dict]) -> List[PIIMatch]:
+        """PII matches from the NER pipeline's entities for a chunk of ``text``."""
+        matches = []
+        for ent in entities:
+            if ent.get("score", 0) < 0.7:
+                continue
 
-                if len(word) < 2:
-                    continue
+            label = ent.get("entity_group", "")
+            word = ent.get("word", "").strip()
 
-                pii_type = {
-                    "PER": "PERSON_NAME",
-                    "ORG": "ORGANIZATION",
-                    "LOC": "LOCATION",
-                    "MISC": "MISC_ENTITY",
-                }.get(label, label)
+            if len(word) < 2:
+                continue
 
-                severity = "HIGH" if pii_type == "PERSON_NAME" else "MEDIUM"
+            pii_type = {
+                "PER": "PERSON_NAME",
+                "ORG": "ORGANIZATION",
+                "LOC": "LOCATION",
+                "MISC": "MISC_ENTITY",
+            }.get(label, label)
 
-                # Find position in original text
-                try:
-                    start_pos = text.find(word)
-                    end_pos = start_pos + len(word) if start_pos >= 0 else 0
-                except Exception:
-                    start_pos, end_pos = 0, 0
+            severity = "HIGH" if pii_type == "PERSON_NAME" else "MEDIUM"
 
-                matches.append(PIIMatch(
-                    pii_type=pii_type,
-                    value=word,
-                    masked_value=_mask_value(word, pii_type),
-                    confidence=round(ent.get("score", 0.8), 2),
-                    severity=severity,
-                    context=_get_context(text, start_pos, end_pos) if start_pos >= 0 else "",
-                    detection_method="transformer",
-                    start=start_pos,
-                    end=end_pos,
-                ))
+            # Find position in original text
+            try:
+                start_pos = text.find(word)
+                end_pos = start_pos + len(word) if start_pos >= 0 else 0
+            except Exception:
+                start_pos, end_pos = 0, 0
+
+            matches.append(PIIMatch(
+                pii_type=pii_type,
+                value=word,
+                masked_value=_mask_value(word, pii_type),
+                confidence=round(ent.get("score", 0.8), 2),
+                severity=severity,
+                context=_get_context(text, start_pos, end_pos) if start_pos >= 0 else "",
+                detection_method="transformer",
+                start=start_pos,
+                end=end_pos,
+            ))
         return matches
 
     def get_model_status(self) -> Dict:
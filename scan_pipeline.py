@@ -0,0 +1,518 @@
+"""
+Scan Pipeline — runs web scans, crawls and monitor sub-scans, shared by the API (main.py) and scan workers (worker.py).
+
+Holds what running a scan needs and nothing the API alone uses: the detection
+engine and scanners, the in-memory scan store, the event bus and the shared
+state backend with its writer. Importing it opens no monitor database and
+builds no app, so a worker process carries only the pipeline.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from crawler import normalize_url
+from email_discovery_scanner import EmailDiscoveryScanner
+from events import EventBus
+from pii_engine import PIIEngine
+from scheduler import Coalescer
+from social_api_scanner import SocialAPIScanner
+from state_backend import BackendWriter, open_backend
+from stats import StatsAggregator
+from storage import BoundedList, BoundedStore, RetentionPolicy
+from tracing import TRACE_EXPORT_URL, current_trace, export_otlp, span, start_trace
+from web_scanner import WebScanner
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Shared instances
+engine = PIIEngine()
+scanner = WebScanner()
+social_scanner = SocialAPIScanner(web_scanner=scanner)
+email_scanner = EmailDiscoveryScanner(web_scanner=scanner)
+
+# Retention of finished scans; running ones are never evicted.
+SCAN_RETENTION = RetentionPolicy(ttl_seconds=6 * 3600, max_entries=500, max_bytes=256 * 1024 * 1024)
+# Spans of finished scans, served by /api/scan/{id}/trace; the scan itself keeps only the stage breakdown.
+TRACE_RETENTION = RetentionPolicy(ttl_seconds=6 * 3600, max_entries=500, max_bytes=64 * 1024 * 1024)
+LOG_MAX_LINES = 2000
+# Events kept per scan/monitor topic for Last-Event-ID resume.
+EVENT_HISTORY = 5000
+
+# State shared between worker processes/nodes: None or "memory://" (single worker),
+# "sqlite:///path/state.db" (workers on one host) or "redis://host:port/db".
+STATE_BACKEND_URL: Optional[str] = None
+# Running scans are mirrored to the backend at most this often (and when they finish).
+SCAN_SHARE_SECONDS = 1.0
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Persistent queue of scans, crawls and monitor scans run by worker.py (SCAN_EXECUTION = "queue" in main.py).
+JOB_QUEUE_PATH = "jobs.db"
+
+# Identical monitor target scans starting within this many seconds are shared.
+MONITOR_COALESCE_SECONDS = 15.0
+
+# Alert-quality filter: send email only for the most accurate findings.
+ALERT_CONFIDENCE_THRESHOLDS: Dict[str, float] = {
+    "regex": 0.85,
+    "transformer": 0.92,
+}
+
+backend = open_backend(STATE_BACKEND_URL)
+# Scan, monitor and event mirroring is queued here and written by a background task.
+writer = BackendWriter(backend)
+_scan_shared_at: Dict[str, float] = {}
+
+
+def _drop_scan_events(scan_id: str, scan: Dict[str, Any]):
+    bus.drop(f"scan:{scan_id}")
+
+
+# In-memory stores; main.py attaches its spill store to ``scans`` and ``traces``.
+scans: BoundedStore = BoundedStore(
+    "scans",
+    SCAN_RETENTION,
+    evictable=lambda scan: scan.get("status") not in ("running", "queued"),
+    on_evict=_drop_scan_events,
+)
+traces: BoundedStore = BoundedStore("traces", TRACE_RETENTION)
+bus = EventBus(history=EVENT_HISTORY)
+stats = StatsAggregator()
+coalescer = Coalescer(window=MONITOR_COALESCE_SECONDS)
+
+
+class ScanRequest(BaseModel):
+    query: str
+    max_results: int = 5
+    # Extra narrower queries; when given, results of all queries are merged by URL.
+    queries: List[str] = Field(default_factory=list)
+
+
+class CrawlRequest(BaseModel):
+    url: str
+    max_depth: int = Field(default=2, ge=0, le=5)
+    max_pages: int = Field(default=25, ge=1, le=500)
+    concurrency: int = Field(default=4, ge=1, le=16)
+
+
+class MonitorRequest(BaseModel):
+    mode: str = "all"
+    query: Optional[str] = None
+    url: Optional[str] = None
+    platform: Optional[str] = None
+    handle: Optional[str] = None
+    email: Optional[str] = None
+    max_results: int = Field(default=5, ge=1, le=20)
+    crawl_depth: int = Field(default=0, ge=0, le=5)
+    crawl_max_pages: int = Field(default=25, ge=1, le=500)
+    interval_seconds: int = Field(default=120, ge=30, le=86400)
+    duration_minutes: int = Field(default=60, ge=1, le=10080)
+    # Wall-time cap for one run (defaults to the interval) and for each sub-scan within it.
+    run_budget_seconds: Optional[int] = Field(default=None, ge=10, le=86400)
+    subscan_timeout_seconds: Optional[int] = Field(default=None, ge=5, le=86400)
+
+
+def create_scan(scan_id: str, query: str, status: str = "running"):
+    scans[scan_id] = {
+        "scan_id": scan_id,
+        "query": query,
+        "status": status,
+        "started_at": datetime.now().isoformat(),
+        "findings": [],
+        "progress": 0,
+        "log": BoundedList(LOG_MAX_LINES),
+    }
+    stats.start("scans", scan_id)
+
+
+def publish(topic: str, event_type: str, data: Dict[str, Any]) -> int:
+    event_id = bus.publish(topic, event_type, data)
+    writer.append_event(topic, event_id, event_type, data)
+    return event_id
+
+
+def close_topic(topic: str):
+    bus.close(topic)
+    writer.close_topic(topic)
+
+
+def share_scan(scan_id: str, final: bool = False):
+    """Mirror a scan for other workers, throttled to SCAN_SHARE_SECONDS while it runs."""
+    if not backend.shared or scan_id not in scans:
+        return
+    now = time.monotonic()
+    if not final and now - _scan_shared_at.get(scan_id, 0.0) < SCAN_SHARE_SECONDS:
+        return
+    if final:
+        _scan_shared_at.pop(scan_id, None)
+    else:
+        _scan_shared_at[scan_id] = now
+    writer.put("scans", scan_id, scans[scan_id], ttl=SCAN_RETENTION.ttl_seconds)
+
+
+def emit_event(scan_id: str, event_type: str, data: Dict[str, Any]):
+    publish(f"scan:{scan_id}", event_type, data)
+    share_scan(scan_id)
+
+
+def add_log(scan_id: str, msg: str):
+    ts = datetime.now().strftime("%H:%M:%S")
+    entry = f"[{ts}] {msg}"
+    data: Dict[str, Any] = {"message": entry}
+    if scan_id in scans:
+        log = scans[scan_id]["log"]
+        log.append(entry)
+        # Absolute log position, so clients mixing the stream and ?since= polls can skip lines they have.
+        data["line"] = log.dropped + len(log) - 1
+    emit_event(scan_id, "log", data)
+
+
+def record_stats(entry: Dict[str, Any], scan_type: str, by_method: Optional[Dict[str, int]] = None):
+    entry["scan_type"] = scan_type
+    stats.record(entry, by_method)
+
+
+def risk_from_severity(severity: Dict[str, int]) -> str:
+    if severity.get("CRITICAL", 0) > 0:
+        return "CRITICAL"
+    if severity.get("HIGH", 0) > 0:
+        return "HIGH"
+    if severity.get("MEDIUM", 0) > 0:
+        return "MEDIUM"
+    return "LOW"
+
+
+def _is_high_accuracy_finding(finding: Dict[str, Any]) -> bool:
+    method = (finding.get("method") or "").lower()
+    if method not in ALERT_CONFIDENCE_THRESHOLDS:
+        return False
+    try:
+        confidence = float(finding.get("confidence", 0.0))
+    except (TypeError, ValueError):
+        confidence = 0.0
+    return confidence >= ALERT_CONFIDENCE_THRESHOLDS[method]
+
+
+def summarize_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    total_pii = 0
+    total_sources = 0
+    methods: Dict[str, int] = {}
+    severity: Dict[str, int] = {}
+    top_findings: List[Dict[str, Any]] = []
+    high_accuracy_pii = 0
+    high_accuracy_methods: Dict[str, int] = {}
+    high_accuracy_severity: Dict[str, int] = {}
+    high_accuracy_findings: List[Dict[str, Any]] = []
+    deduplicated_sources = 0
+
+    for item in results:
+        if not isinstance(item, dict) or "error" in item:
+            continue
+
+        total_sources += 1
+        total_pii += int(item.get("pii_count", 0))
+        if (item.get("dedup") or {}).get("status") in ("exact", "near"):
+            deduplicated_sources += 1
+
+        for finding in item.get("pii_findings", []):
+            method = finding.get("method", "unknown")
+            methods[method] = methods.get(method, 0) + 1
+
+            sev = finding.get("severity", "LOW")
+            severity[sev] = severity.get(sev, 0) + 1
+
+            if len(top_findings) < 10:
+                top_findings.append(
+                    {
+                        "source": item.get("url") or item.get("title") or item.get("source"),
+                        "type": finding.get("type"),
+                        "masked_value": finding.get("masked_value") or finding.get("value"),
+                        "severity": sev,
+                        "method": method,
+                    }
+                )
+
+            if _is_high_accuracy_finding(finding):
+                high_accuracy_pii += 1
+                high_accuracy_methods[method] = high_accuracy_methods.get(method, 0) + 1
+                high_accuracy_severity[sev] = high_accuracy_severity.get(sev, 0) + 1
+                if len(high_accuracy_findings) < 10:
+                    high_accuracy_findings.append(
+                        {
+                            "source": item.get("url") or item.get("title") or item.get("source"),
+                            "type": finding.get("type"),
+                            "masked_value": finding.get("masked_value") or finding.get("value"),
+                            "severity": sev,
+                            "method": method,
+                            "confidence": finding.get("confidence"),
+                        }
+                    )
+
+    return {
+        "total_pii": total_pii,
+        "total_sources": total_sources,
+        "by_method": methods,
+        "by_severity": severity,
+        "overall_risk": risk_from_severity(severity),
+        "top_findings": top_findings,
+        "high_accuracy_pii": high_accuracy_pii,
+        "high_accuracy_by_method": high_accuracy_methods,
+        "high_accuracy_by_severity": high_accuracy_severity,
+        "high_accuracy_risk": risk_from_severity(high_accuracy_severity),
+        "high_accuracy_findings": high_accuracy_findings,
+        "alert_ready": high_accuracy_pii > 0,
+        "deduplicated_sources": deduplicated_sources,
+        "dedup_ratio": round(deduplicated_sources / total_sources, 4) if total_sources else 0.0,
+    }
+
+
+def record_timing(scan_id: str):
+    """
+    Store the scan's stage breakdown under "timing" and stream it as a "timing" event.
+
+    The spans (up to TRACE_MAX_SPANS) go to ``traces`` and the shared backend instead
+    of the scan record, which every poll of the scan serializes.
+    """
+    trace = current_trace()
+    if trace is None or scan_id not in scans:
+        return
+    summary = trace.summary()
+    traces[scan_id] = summary
+    writer.put("traces", scan_id, summary, ttl=TRACE_RETENTION.ttl_seconds)
+    timing = {key: summary[key] for key in ("trace_id", "duration_ms", "stages", "slowest")}
+    scans[scan_id]["timing"] = timing
+    emit_event(scan_id, "timing", timing)
+    if TRACE_EXPORT_URL:
+        asyncio.create_task(export_otlp(summary))
+
+
+def complete_scan(scan_id: str, query: str, results: List[Dict[str, Any]], scan_type: str = "web"):
+    with span("summarize", results=len(results)):
+        summary = summarize_results(results)
+    scans[scan_id].update(
+        {
+            "status": "completed",
+            "findings": results,
+            "progress": 100,
+            "total_pii": summary["total_pii"],
+            "overall_risk": summary["overall_risk"],
+            "by_severity": summary["by_severity"],
+            "by_method": summary["by_method"],
+            "deduplicated_sources": summary["deduplicated_sources"],
+            "dedup_ratio": summary["dedup_ratio"],
+            "completed_at": datetime.now().isoformat(),
+        }
+    )
+    scans.touch(scan_id)
+
+    add_log(
+        scan_id,
+        f"Complete: {summary['total_pii']} PII across {summary['total_sources']} sources | Risk: {summary['overall_risk']}"
+        + (f" | {summary['deduplicated_sources']} near-duplicates reused" if summary["deduplicated_sources"] else ""),
+    )
+    record_timing(scan_id)
+    emit_event(
+        scan_id,
+        "completed",
+        {"total_findings": summary["total_pii"], "overall_risk": summary["overall_risk"]},
+    )
+    close_topic(f"scan:{scan_id}")
+    share_scan(scan_id, final=True)
+    stats.finish("scans", scan_id)
+
+    record_stats(
+        {
+            "scan_id": scan_id,
+            "query": query,
+            "total_findings": summary["total_pii"],
+            "overall_risk": summary["overall_risk"],
+            "timestamp": datetime.now().isoformat(),
+        },
+        scan_type,
+        summary["by_method"],
+    )
+
+
+def fail_scan(scan_id: str, exc: Exception):
+    logger.error(f"Scan error: {exc}")
+    scans[scan_id]["status"] = "error"
+    scans[scan_id]["error"] = str(exc)
+    add_log(scan_id, f"ERROR: {exc}")
+    record_timing(scan_id)
+    scans.touch(scan_id)
+    close_topic(f"scan:{scan_id}")
+    share_scan(scan_id, final=True)
+    stats.finish("scans", scan_id)
+
+
+async def run_scan(scan_id: str, req: ScanRequest):
+    with start_trace("scan", scan_id=scan_id, query=req.query[:200]):
+        try:
+            def log_fn(msg: str):
+                add_log(scan_id, msg)
+
+            scans[scan_id]["progress"] = 10
+            emit_event(scan_id, "progress", {"progress": 10, "message": "Searching web..."})
+            if req.queries:
+                results = await scanner.scan_many([req.query, *req.queries], engine, req.max_results, log_fn=log_fn)
+            else:
+                results = await scanner.scan(req.query, engine, req.max_results, log_fn)
+
+            scans[scan_id]["progress"] = 90
+            emit_event(scan_id, "progress", {"progress": 90, "message": "Analyzing results..."})
+
+            complete_scan(scan_id, req.query, results)
+        except Exception as exc:
+            fail_scan(scan_id, exc)
+
+
+async def run_crawl(scan_id: str, req: CrawlRequest):
+    with start_trace("crawl", scan_id=scan_id, url=req.url):
+        try:
+            def log_fn(msg: str):
+                add_log(scan_id, msg)
+
+            def on_result(result: Dict[str, Any]):
+                scan = scans[scan_id]
+                scan["findings"].append(result)
+                progress = min(90, 5 + int(85 * len(scan["findings"]) / req.max_pages))
+                scan["progress"] = progress
+                emit_event(
+                    scan_id,
+                    "result",
+                    {
+                        "url": result.get("url"),
+                        "title": result.get("title"),
+                        "depth": result.get("depth"),
+                        "pii_count": result.get("pii_count", 0),
+                        "detection_methods": result.get("detection_methods", {}),
+                    },
+                )
+                emit_event(scan_id, "progress", {"progress": progress, "message": f"{len(scan['findings'])} pages scanned"})
+
+            scans[scan_id]["progress"] = 5
+            emit_event(scan_id, "progress", {"progress": 5, "message": "Crawling site..."})
+            results = await scanner.crawl(
+                req.url,
+                engine,
+                max_depth=req.max_depth,
+                max_pages=req.max_pages,
+                concurrency=req.concurrency,
+                log_fn=log_fn,
+                on_result=on_result,
+            )
+            complete_scan(scan_id, f"CRAWL: {req.url}", results, scan_type="crawl")
+        except Exception as exc:
+            fail_scan(scan_id, exc)
+
+
+async def _run_subscan(
+    monitor_id: str, name: str, coro, timeout: float, collected: List[Dict[str, Any]], log_fn: Callable[[str], None]
+) -> Dict[str, Any]:
+    """
+    Await one monitor sub-scan within ``timeout`` seconds.
+
+    Results land in ``collected`` (a crawl appends pages as they finish, so a
+    timed-out crawl keeps what it scanned). Returns the sub-scan's timing entry.
+    """
+    started = time.monotonic()
+    timing: Dict[str, Any] = {"status": "ok"}
+    try:
+        results = await asyncio.wait_for(coro, timeout)
+        if isinstance(results, dict):
+            results = [results]
+        if results is not collected:
+            collected.extend(results)
+    except asyncio.TimeoutError:
+        timing["status"] = "timeout"
+        log_fn(f"{name} scan timed out after {timeout:.0f}s; keeping {len(collected)} partial results")
+    except Exception as exc:
+        timing["status"] = "error"
+        timing["error"] = str(exc)
+        logger.error(f"Monitor {monitor_id} {name} scan failed: {exc}")
+        log_fn(f"{name} scan failed: {exc}")
+    timing["duration_ms"] = round((time.monotonic() - started) * 1000)
+    timing["results"] = len(collected)
+    return timing
+
+
+async def _crawl_into(crawl, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Await a crawl whose pages are streamed into ``pages`` and return that list."""
+    results = await crawl
+    # Error entries are only returned at the end, never passed to on_result.
+    pages.extend(r for r in results if "error" in r)
+    return pages
+
+
+async def execute_monitor_scan(
+    monitor_id: str, req: MonitorRequest, log_fn: Callable[[str], None]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Run the configured sub-scans concurrently.
+
+    Each sub-scan gets ``subscan_timeout_seconds`` but never more than the run
+    budget; a failed or timed-out sub-scan does not discard the others.
+    Sub-scans go through the coalescer, so monitors watching the same target
+    at the same time share one scan. Returns the merged results (in web, url,
+    social, email order) and the per-sub-scan timings; progress lines go
+    to ``log_fn``.
+    """
+    mode = req.mode.lower()
+    budget = req.run_budget_seconds or req.interval_seconds
+    timeout = min(req.subscan_timeout_seconds or budget, budget)
+    subscans: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+
+    if mode in ("web", "all") and req.query:
+        log_fn(f'Web scan: "{req.query}"')
+        subscans["web"] = (
+            coalescer.run(("web", req.query, req.max_results), lambda: scanner.scan(req.query, engine, req.max_results)),
+            [],
+        )
+
+    if mode in ("url", "all") and req.url:
+        if req.crawl_depth > 0:
+            log_fn(f"Site crawl: {req.url} (depth {req.crawl_depth}, up to {req.crawl_max_pages} pages)")
+            pages: List[Dict[str, Any]] = []
+
+            def crawl():
+                return _crawl_into(
+                    scanner.crawl(
+                        req.url, engine, max_depth=req.crawl_depth, max_pages=req.crawl_max_pages, on_result=pages.append
+                    ),
+                    pages,
+                )
+
+            key = ("crawl", normalize_url(req.url), req.crawl_depth, req.crawl_max_pages)
+            subscans["url"] = (coalescer.run(key, crawl), pages)
+        else:
+            log_fn(f"URL scan: {req.url}")
+            subscans["url"] = (coalescer.run(("url", req.url), lambda: scanner.scan_url(req.url, engine)), [])
+
+    if mode in ("social", "all") and req.platform and req.handle:
+        log_fn(f"Social scan: {req.platform} @{req.handle.lstrip('@')}")
+        platforms = [p for p in req.platform.split(",") if p.strip()]
+        key = ("social", tuple(sorted(p.strip().lower() for p in platforms)), req.handle.lstrip("@").lower())
+        subscans["social"] = (
+            coalescer.run(key, lambda: social_scanner.scan_handles(platforms, req.handle, engine, deep_search=True)),
+            [],
+        )
+
+    if mode in ("email", "all") and req.email:
+        log_fn(f"Email discovery: {req.email}")
+        key = ("email", req.email.strip().lower())
+        subscans["email"] = (coalescer.run(key, lambda: email_scanner.scan_email(req.email, engine)), [])
+
+    timings = await asyncio.gather(
+        *(_run_subscan(monitor_id, name, coro, timeout, collected, log_fn) for name, (coro, collected) in subscans.items())
+    )
+
+    results: List[Dict[str, Any]] = []
+    for _, collected in subscans.values():
+        results.extend(collected)
+    return results, dict(zip(subscans, timings))
@@ -0,0 +1,288 @@
+"""
+Scheduler — one heap-driven scheduler for all monitor runs.
+
+Jobs sit in a priority queue keyed by their next run time. A dispatcher moves
+due jobs onto a queue that a fixed pool of workers drains, so at most
+``max_concurrent`` runs are in flight however many monitors exist. New jobs
+get a random start offset so monitors created together do not fire together,
+and ``Coalescer`` lets runs that are due at the same time share one scan of an
+identical target. Lag (how late runs start) and queue depth are exposed.
+"""
+import asyncio
+import heapq
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from metrics import MONITOR_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_RUNS = 4
+# New jobs start after a random delay of up to this many seconds (capped at 10% of the interval).
+START_JITTER_SECONDS = 10.0
+# Each later run is shifted by up to this fraction of the interval either way.
+RUN_JITTER_FRACTION = 0.02
+# Results of a coalesced scan are shared with identical scans starting this soon after.
+COALESCE_SECONDS = 15.0
+
+
+@dataclass
+class _Job:
+    job_id: str
+    run: Callable[[], Awaitable[None]]
+    interval: float
+    ends_at: float
+    on_done: Callable[[str, str, Optional[BaseException]], None]
+    on_scheduled: Optional[Callable[[Optional[float]], None]] = None
+    due: float = 0.0
+    version: int = 0
+    runs: int = 0
+    task: Optional[asyncio.Task] = None
+    removed: bool = False
+
+
+@dataclass
+class _Lag:
+    last: float = 0.0
+    max: float = 0.0
+    ewma: Optional[float] = None
+
+    def add(self, lag: float):
+        self.last = lag
+        self.max = max(self.max, lag)
+        self.ewma = lag if self.ewma is None else 0.9 * self.ewma + 0.1 * lag
+
+
+class MonitorScheduler:
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT_RUNS,
+        start_jitter: float = START_JITTER_SECONDS,
+        run_jitter: float = RUN_JITTER_FRACTION,
+    ):
+        self.max_concurrent = max_concurrent
+        self.start_jitter = start_jitter
+        self.run_jitter = run_jitter
+        self._jobs: Dict[str, _Job] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._ready: "asyncio.Queue[_Job]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._lag = _Lag()
+        self.running = 0
+        self._closing = False
+        self.counts = {"scheduled": 0, "started": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    # ── Lifecycle ──
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._dispatch()))
+        self._tasks.extend(asyncio.create_task(self._work()) for _ in range(self.max_concurrent))
+
+    async def stop(self):
+        """Cancel the loops and any runs in progress; jobs are left as they are (no ``on_done``)."""
+        self._closing = True
+        for job in list(self._jobs.values()):
+            if job.task and not job.task.done():
+                job.task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ── Jobs ──
+
+    def add(
+        self,
+        job_id: str,
+        run: Callable[[], Awaitable[None]],
+        interval: float,
+        ends_at: float,
+        on_done: Callable[[str, str, Optional[BaseException]], None],
+        on_scheduled: Optional[Callable[[Optional[float]], None]] = None,
+        first_run_at: Optional[float] = None,
+    ):
+        """
+        Run ``run()`` every ``interval`` seconds until ``ends_at`` (epoch seconds).
+
+        ``first_run_at`` defaults to now plus a random start offset.
+        ``on_done(job_id, status, error)`` fires once with "completed",
+        "stopped" or "error"; ``on_scheduled(ts)`` fires whenever the next run
+        time changes (None when there is none).
+        """
+        if job_id in self._jobs:
+            raise ValueError(f"Job {job_id} already scheduled")
+        job = _Job(job_id, run, interval, ends_at, on_done, on_scheduled)
+        self._jobs[job_id] = job
+        if first_run_at is None:
+            first_run_at = time.time() + random.uniform(0, min(self.start_jitter, interval * 0.1))
+        self._schedule(job, first_run_at)
+
+    def remove(self, job_id: str) -> bool:
+        """Stop a job; a run in progress is cancelled. Returns False if unknown."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.removed = True
+        if job.task and not job.task.done():
+            job.task.cancel()
+        else:
+            self._finish(job, "stopped")
+        return True
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def job_ids(self) -> List[str]:
+        return list(self._jobs)
+
+    def _schedule(self, job: _Job, due: float):
+        if due >= job.ends_at:
+            self._finish(job, "completed")
+            return
+        job.due = due
+        job.version += 1
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, job.job_id, job.version))
+        self.counts["scheduled"] += 1
+        if job.on_scheduled:
+            job.on_scheduled(due)
+        self._wakeup.set()
+
+    def _finish(self, job: _Job, status: str, error: Optional[BaseException] = None):
+        if self._jobs.pop(job.job_id, None) is None:
+            return
+        if job.on_scheduled:
+            job.on_scheduled(None)
+        try:
+            job.on_done(job.job_id, status, error)
+        except Exception as e:
+            logger.error(f"on_done failed for {job.job_id}: {e}")
+
+    # ── Loops ──
+
+    async def _dispatch(self):
+        # wait_for drops a cancellation that races with the wakeup it waits on, so stop() also ends the loop here.
+        while not self._closing:
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, job_id, version = heapq.heappop(self._heap)
+                job = self._jobs.get(job_id)
+                if job is None or job.version != version or job.removed:
+                    continue
+                self._ready.put_nowait(job)
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self):
+        while True:
+            job = await self._ready.get()
+            if job.removed:
+                continue
+            lag = max(0.0, time.time() - job.due)
+            self._lag.add(lag)
+            MONITOR_LAG_SECONDS.observe(lag)
+            self.running += 1
+            self.counts["started"] += 1
+            job.runs += 1
+            job.task = asyncio.create_task(job.run())
+            try:
+                await job.task
+            except asyncio.CancelledError:
+                if self._closing or not job.task.cancelled():
+                    raise       # the worker itself is being cancelled
+                self.counts["cancelled"] += 1
+                self._finish(job, "stopped")
+                continue
+            except Exception as e:
+                self.counts["failed"] += 1
+                logger.error(f"Job {job.job_id} failed: {e}")
+                self._finish(job, "error", e)
+                continue
+            finally:
+                self.running -= 1
+                job.task = None
+
+            self.counts["completed"] += 1
+            if job.removed:
+                self._finish(job, "stopped")
+                continue
+            # Fixed rate from the planned start; a run that overran starts the next one now.
+            jitter = random.uniform(-1, 1) * self.run_jitter * job.interval
+            self._schedule(job, max(time.time(), job.due + job.interval + jitter))
+
+    # ── Metrics ──
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        pending = [due for due, _, job_id, version in self._heap
+                   if job_id in self._jobs and self._jobs[job_id].version == version]
+        return {
+            "jobs": len(self._jobs),
+            "running": self.running,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": self._ready.qsize(),
+            "overdue": sum(1 for due in pending if due <= now),
+            "next_run_in": round(min(pending) - now, 3) if pending else None,
+            "lag_seconds": {
+                "last": round(self._lag.last, 3),
+                "avg": round(self._lag.ewma, 3) if self._lag.ewma is not None else None,
+                "max": round(self._lag.max, 3),
+            },
+            **self.counts,
+        }
+
+
+class Coalescer:
+    """
+    Share one execution of identical work started within ``window`` seconds.
+
+    The work runs in its own task, so a caller that gives up (timeout,
+    cancellation) does not cancel it for the others; it is cancelled only
+    once every caller waiting on it has given up. Failed work is not shared
+    with later callers.
+    """
+
+    def __init__(self, window: float = COALESCE_SECONDS):
+        self.window = window
+        self._entries: Dict[Hashable, Tuple[float, asyncio.Task]] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.counts = {"executed": 0, "shared": 0}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        now = time.monotonic()
+        for stale in [k for k, (started, task) in self._entries.items() if task.done() and (
+            now - started > self.window or task.cancelled() or task.exception() is not None
+        )]:
+            del self._entries[stale]
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.counts["shared"] += 1
+            task = entry[1]
+        else:
+            self.counts["executed"] += 1
+            task = asyncio.create_task(factory())
+            self._entries[key] = (now, task)
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "window_seconds": self.window, "tracked": len(self._entries)}
@@ -6,9 +6,49 @@ import asyncio
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime
+from urllib.parse import urlsplit
+
+from synthetic_data import SyntheticGenerator
 
 logger = logging.getLogger(__name__)
 
+# Social hubs searched during deep discovery, one narrow query per site.
+DISCOVERY_SITES = ["linkedin.com", "github.com", "facebook.com", "instagram.com", "twitter.com"]
+DISCOVERY_RESULTS_PER_SITE = 3
+
+# Platform name -> site searched for it during discovery.
+PLATFORM_SITES = {
+    "twitter": "twitter.com",
+    "x": "x.com",
+    "instagram": "instagram.com",
+    "github": "github.com",
+    "linkedin": "linkedin.com",
+    "facebook": "facebook.com",
+}
+
+# Simulated mode: size and PII density of generated profiles for unknown handles.
+SIMULATED_POSTS = 6
+SIMULATED_PII_DENSITY = 0.3
+
+
+def _normalize_platforms(platforms: List[str]) -> List[str]:
+    return list(dict.fromkeys(p.lower().strip() for p in platforms if p and p.strip()))
+
+
+def unsupported_platforms(platforms: List[str]) -> List[str]:
+    """Requested platforms that are not in PLATFORM_SITES (normalized, in request order)."""
+    return [p for p in _normalize_platforms(platforms) if p not in PLATFORM_SITES]
+
+
+def _platform_of(url: str) -> Optional[str]:
+    """Platform a discovered URL belongs to, if it is one of the known social sites."""
+    host = (urlsplit(url).hostname or "").lower()
+    for platform, site in PLATFORM_SITES.items():
+        if host == site or host.endswith("." + site):
+            return platform
+    return None
+
+
 class SocialAPIScanner:
     def __init__(self, web_scanner=None, twitter_keys: Dict = None, instagram_keys: Dict = None):
         self.web_scanner = web_scanner
@@ -21,45 +61,89 @@ class SocialAPIScanner:
         Scan a specific social media handle for PII.
         If deep_search is True, also searches the web for related profiles/mentions.
         """
-        platform = platform.lower()
+        return await self.scan_handles([platform], handle, engine, deep_search=deep_search)
+
+    async def scan_handles(self, platforms: List[str], handle: str, engine, deep_search: bool = True) -> List[Dict]:
+        """
+        Scan one handle across several platforms concurrently.
+
+        The direct scans for every platform and a single shared deep web
+        discovery run at the same time, so wall time is that of the slowest
+        platform. Results are merged: direct results first (one per platform,
+        in request order), then discovery hits, each tagged with its "platform".
+        Raises ValueError for platforms not in PLATFORM_SITES.
+        """
+        unknown = unsupported_platforms(platforms)
+        if unknown:
+            raise ValueError(f"Unsupported platform(s): {', '.join(unknown)}")
+        platforms = _normalize_platforms(platforms)
         handle = handle.strip("@")
-        
-        logger.info(f"Scanning social identity: @{handle} on {platform}")
+
+        logger.info(f"Scanning social identity: @{handle} on {', '.join(platforms)}")
+        tasks = [self._direct_scan(platform, handle, engine) for platform in platforms]
+
+        # Deep Web Discovery (Find related info/profiles around the web), shared by all platforms
+        discover = deep_search and self.web_scanner
+        if discover:
+            tasks.append(self._discover(handle, engine, platforms))
+
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
         all_results = []
-        
-        # 1. Direct API Scan (Profile info)
-        if self.is_simulated:
-            direct_res = await self._simulate_scan(platform, handle, engine)
-        else:
-            if platform == "twitter":
-                direct_res = await self._scan_twitter_real(handle, engine)
-            elif platform == "instagram":
-                direct_res = await self._scan_instagram_real(handle, engine)
-            else:
-                direct_res = {"error": f"Platform {platform} not supported for direct API scan"}
-        
-        if direct_res:
-            all_results.append(direct_res)
-
-        # 2. Deep Web Discovery (Find related info/profiles around the web)
-        if deep_search and self.web_scanner:
-            logger.info(f"Initiating Deep Discovery for @{handle}...")
-            # Target common social hubs
-            discovery_query = f'"{handle}" OR "@{handle}" site:linkedin.com OR site:github.com OR site:facebook.com OR site:instagram.com OR site:twitter.com'
-            web_results = await self.web_scanner.scan(discovery_query, engine, max_results=5)
-            
-            for res in web_results:
-                if "error" not in res:
-                    res["source"] = "social-discovery"
-                    res["title"] = f"DISCOVERY: {res.get('title', 'Related Profile')}"
-                    all_results.append(res)
-                    
+        for platform, direct_res in zip(platforms, outcomes):
+            if isinstance(direct_res, Exception):
+                logger.error(f"Direct scan failed for {platform} @{handle}: {direct_res}")
+                direct_res = {"error": f"{platform} scan failed: {direct_res}"}
+            if direct_res:
+                direct_res["platform"] = platform
+                all_results.append(direct_res)
+
+        if discover:
+            web_results = outcomes[-1]
+            if isinstance(web_results, Exception):
+                logger.error(f"Deep discovery failed for @{handle}: {web_results}")
+                web_results = []
+            all_results.extend(web_results)
+
         return all_results
 
+    async def _direct_scan(self, platform: str, handle: str, engine) -> Dict:
+        """Direct API Scan (Profile info) for one platform."""
+        if self.is_simulated:
+            return await self._simulate_scan(platform, handle, engine)
+        if platform == "twitter":
+            return await self._scan_twitter_real(handle, engine)
+        if platform == "instagram":
+            return await self._scan_instagram_real(handle, engine)
+        return {"error": f"Platform {platform} not supported for direct API scan"}
+
+    async def _discover(self, handle: str, engine, platforms: List[str]) -> List[Dict]:
+        """One deep discovery search across the social hubs plus the requested platforms."""
+        logger.info(f"Initiating Deep Discovery for @{handle}...")
+        # Target common social hubs
+        sites = list(dict.fromkeys(DISCOVERY_SITES + [PLATFORM_SITES[p] for p in platforms]))
+        discovery_queries = [f'"{handle}" OR "@{handle}" site:{site}' for site in sites]
+        web_results = await self.web_scanner.scan_many(
+            discovery_queries, engine, max_results=DISCOVERY_RESULTS_PER_SITE
+        )
+
+        results = []
+        for res in web_results:
+            if "error" not in res:
+                res["source"] = "social-discovery"
+                res["title"] = f"DISCOVERY: {res.get('title', 'Related Profile')}"
+                res["platform"] = _platform_of(res.get("url", ""))
+                results.append(res)
+        return results
+
     async def _simulate_scan(self, platform: str, handle: str, engine) -> Dict:
-        """Simulate a social media scan with realistic PII hits."""
-        await asyncio.sleep(1.0)
-        
+        """
+        Simulate a social media scan with realistic PII hits.
+
+        Unknown handles get a synthetic profile seeded by platform and handle, so
+        repeated scans see the same text; its embedded PII is returned under
+        "ground_truth".
+        """
         # Mock profile data
         profiles = {
             "santhosh_dev": {
@@ -73,20 +157,24 @@ class SocialAPIScanner:
             }
         }
         
-        profile = profiles.get(handle.lower(), {
-            "name": f"User {handle}",
-            "bio": f"No official bio found for @{handle}. Maybe check dev@example.com for more info.",
-            "posts": [f"Sample post from @{handle}.", "Contact: +1 555-0199."]
-        })
-        
-        all_text = f"Profile Name: {profile['name']}\nBio: {profile['bio']}\n" + "\n".join(profile['posts'])
-        pii_matches = engine.detect(all_text)
+        ground_truth = None
+        profile = profiles.get(handle.lower())
+        if profile:
+            all_text = f"Profile Name: {profile['name']}\nBio: {profile['bio']}\n" + "\n".join(profile['posts'])
+        else:
+            generator = SyntheticGenerator.for_key(f"{platform}:{handle.lower()}", pii_density=SIMULATED_PII_DENSITY)
+            doc = generator.profile(handle=handle, posts=SIMULATED_POSTS)
+            profile = doc.meta
+            all_text = doc.text
+            ground_truth = [{"type": s.pii_type, "value": s.value, "start": s.start, "end": s.end} for s in doc.spans]
+
+        pii_matches = await asyncio.to_thread(engine.detect, all_text)
         
         methods = {}
         for m in pii_matches:
             methods[m.detection_method] = methods.get(m.detection_method, 0) + 1
             
-        return {
+        result = {
             "source": f"direct-{platform}",
             "handle": f"@{handle}",
             "title": f"[PROFILE] {profile['name']} (@{handle})",
@@ -109,6 +197,9 @@ class SocialAPIScanner:
             "detection_methods": methods,
             "simulated": True
         }
+        if ground_truth is not None:
+            result["ground_truth"] = ground_truth
+        return result
 
     async def _scan_twitter_real(self, handle: str, engine) -> Dict:
         return {"error": "Twitter API keys required for live scan."}
@@ -0,0 +1,662 @@
+"""
+State Backend — shared scan/monitor state and event logs for multi-worker deployments.
+
+Each worker keeps its own scans, monitors and event bus in memory and mirrors
+them to a backend at their save points; a request that lands on another
+worker reads the mirrored copy, and its SSE stream follows the mirrored event
+log. Backends:
+
+- ``memory://`` (default): process-local, nothing is shared (single worker).
+- ``sqlite:///path/to/state.db``: workers on one host share a SQLite file.
+- ``redis://host:port/db``: any Redis-protocol server, via a small built-in
+  RESP client (``benchmarks/resp_standin.py`` serves the same commands
+  locally without Redis).
+
+Leases (``claim``) give a monitor a single owning worker; the owner renews
+them and another worker may adopt a monitor whose lease has expired.
+"""
+import asyncio
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from events import HEARTBEAT_SECONDS, Event
+from fastjson import dumps_str, loads
+
+logger = logging.getLogger(__name__)
+
+# How often a stream following another worker's topic checks for new events.
+REMOTE_POLL_SECONDS = 0.25
+# Mirrored event logs and topic markers expire this long after their last write.
+EVENT_TTL_SECONDS = 24 * 3600
+# Mirrored writes waiting for the background writer; beyond this, new ones are dropped (and counted).
+WRITER_MAX_PENDING = 10000
+WRITER_BATCH_SIZE = 500
+
+
+def _dumps(value: Any) -> str:
+    return dumps_str(value)
+
+
+class StateBackend:
+    """Base backend: namespaced JSON values, per-topic event logs and leases."""
+
+    name = "base"
+    # False when the backend is process-local, so mirroring can be skipped.
+    shared = True
+
+    def put(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self.put_json(namespace, key, _dumps(value), ttl)
+
+    def put_json(self, namespace: str, key: str, raw: str, ttl: Optional[float] = None):
+        """``put`` of a value that is already serialized."""
+        raise NotImplementedError
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def values(self, namespace: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def append_event(self, topic: str, event_id: int, event: str, data: Any):
+        """
+        Mirror one event under the publishing bus's id.
+
+        Ids increase within a topic; a worker that takes a topic over (an
+        adopted or resumed monitor) continues after ``last_event_id``.
+        """
+        self.append_event_json(topic, event_id, event, _dumps(data))
+
+    def append_event_json(self, topic: str, event_id: int, event: str, raw_data: str):
+        """``append_event`` with the data already serialized."""
+        raise NotImplementedError
+
+    def events(self, topic: str, after: int = 0) -> List[Event]:
+        """The topic's events with an id above ``after``, in id order."""
+        raise NotImplementedError
+
+    def last_event_id(self, topic: str) -> int:
+        """Highest mirrored event id of the topic, 0 if it has none."""
+        raise NotImplementedError
+
+    def open_topic(self, topic: str):
+        """Announce a topic before its first event, so followers wait for it instead of ending."""
+        raise NotImplementedError
+
+    def close_topic(self, topic: str):
+        raise NotImplementedError
+
+    def topic_state(self, topic: str) -> Optional[str]:
+        """"open", "closed", or None for an unknown topic."""
+        raise NotImplementedError
+
+    def claim(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew the lease ``name`` for ``owner``; False if someone else holds it."""
+        raise NotImplementedError
+
+    def release(self, name: str, owner: str):
+        raise NotImplementedError
+
+    def purge(self):
+        """Drop expired entries (backends without native expiry)."""
+
+    def close(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "shared": self.shared}
+
+
+class MemoryBackend(StateBackend):
+    """Process-local backend; the single-worker default."""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], Tuple[Any, Optional[float]]] = {}
+        self._events: Dict[str, List[Event]] = {}
+        self._closed: set = set()
+        self._leases: Dict[str, Tuple[str, float]] = {}
+
+    def put(self, namespace, key, value, ttl=None):
+        self._values[(namespace, str(key))] = (value, time.time() + ttl if ttl else None)
+
+    def put_json(self, namespace, key, raw, ttl=None):
+        self.put(namespace, key, loads(raw), ttl)
+
+    def get(self, namespace, key):
+        entry = self._values.get((namespace, str(key)))
+        if entry is None or (entry[1] is not None and entry[1] < time.time()):
+            return None
+        return entry[0]
+
+    def delete(self, namespace, key):
+        self._values.pop((namespace, str(key)), None)
+
+    def values(self, namespace):
+        now = time.time()
+        return {
+            key: value
+            for (ns, key), (value, expires) in self._values.items()
+            if ns == namespace and (expires is None or expires >= now)
+        }
+
+    def append_event(self, topic, event_id, event, data):
+        self._events.setdefault(topic, []).append(Event(event_id, event, data))
+
+    def append_event_json(self, topic, event_id, event, raw_data):
+        self.append_event(topic, event_id, event, loads(raw_data))
+
+    def events(self, topic, after=0):
+        return [ev for ev in self._events.get(topic, []) if ev.id > after]
+
+    def last_event_id(self, topic):
+        return max((ev.id for ev in self._events.get(topic, [])), default=0)
+
+    def open_topic(self, topic):
+        self._events.setdefault(topic, [])
+
+    def close_topic(self, topic):
+        self._events.setdefault(topic, [])
+        self._closed.add(topic)
+
+    def topic_state(self, topic):
+        if topic not in self._events:
+            return None
+        return "closed" if topic in self._closed else "open"
+
+    def claim(self, name, owner, ttl):
+        holder = self._leases.get(name)
+        if holder is not None and holder[0] != owner and holder[1] > time.time():
+            return False
+        self._leases[name] = (owner, time.time() + ttl)
+        return True
+
+    def release(self, name, owner):
+        if self._leases.get(name, (None,))[0] == owner:
+            del self._leases[name]
+
+    def purge(self):
+        now = time.time()
+        for key in [k for k, (_, expires) in self._values.items() if expires is not None and expires < now]:
+            del self._values[key]
+
+
+class SQLiteBackend(StateBackend):
+    """Shared SQLite file; suits several workers on one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL,"
+            " PRIMARY KEY (namespace, key));"
+            "CREATE TABLE IF NOT EXISTS events ("
+            " topic TEXT NOT NULL, id INTEGER NOT NULL, event TEXT NOT NULL, data TEXT NOT NULL,"
+            " PRIMARY KEY (topic, id));"
+            "CREATE TABLE IF NOT EXISTS topics ("
+            " topic TEXT PRIMARY KEY, closed INTEGER NOT NULL DEFAULT 0, expires_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);"
+        )
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    def put_json(self, namespace, key, raw, ttl=None):
+        self._execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, str(key), raw, time.time() + ttl if ttl else None),
+        )
+
+    def get(self, namespace, key):
+        rows = self._execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (namespace, str(key), time.time()),
+        )
+        return loads(rows[0][0]) if rows else None
+
+    def delete(self, namespace, key):
+        self._execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, str(key)))
+
+    def values(self, namespace):
+        rows = self._execute(
+            "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (namespace, time.time()),
+        )
+        return {key: loads(value) for key, value in rows}
+
+    def append_event_json(self, topic, event_id, event, raw_data):
+        expires = time.time() + EVENT_TTL_SECONDS
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO events (topic, id, event, data) VALUES (?, ?, ?, ?)",
+                (topic, event_id, event, raw_data),
+            )
+            self._conn.execute(
+                "INSERT INTO topics (topic, closed, expires_at) VALUES (?, 0, ?)"
+                " ON CONFLICT(topic) DO UPDATE SET expires_at = excluded.expires_at",
+                (topic, expires),
+            )
+
+    def events(self, topic, after=0):
+        rows = self._execute("SELECT id, event, data FROM events WHERE topic = ? AND id > ? ORDER BY id", (topic, after))
+        return [Event(event_id, event, loads(data)) for event_id, event, data in rows]
+
+    def last_event_id(self, topic):
+        rows = self._execute("SELECT MAX(id) FROM events WHERE topic = ?", (topic,))
+        return rows[0][0] or 0
+
+    def open_topic(self, topic):
+        self._execute(
+            "INSERT OR IGNORE INTO topics (topic, closed, expires_at) VALUES (?, 0, ?)",
+            (topic, time.time() + EVENT_TTL_SECONDS),
+        )
+
+    def close_topic(self, topic):
+        self._execute(
+            "INSERT INTO topics (topic, closed, expires_at) VALUES (?, 1, ?)"
+            " ON CONFLICT(topic) DO UPDATE SET closed = 1",
+            (topic, time.time() + EVENT_TTL_SECONDS),
+        )
+
+    def topic_state(self, topic):
+        rows = self._execute("SELECT closed FROM topics WHERE topic = ?", (topic,))
+        if not rows:
+            return None
+        return "closed" if rows[0][0] else "open"
+
+    def claim(self, name, owner, ttl):
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+                " WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now),
+            )
+            return cur.rowcount > 0
+
+    def release(self, name, owner):
+        self._execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def purge(self):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM kv WHERE expires_at < ?", (now,))
+            self._conn.execute("DELETE FROM events WHERE topic IN (SELECT topic FROM topics WHERE expires_at < ?)", (now,))
+            self._conn.execute("DELETE FROM topics WHERE expires_at < ?", (now,))
+            self._conn.execute("DELETE FROM leases WHERE expires_at < ?", (now,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self):
+        return {**super().stats(), "path": self.path}
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RespClient:
+    """Minimal blocking RESP2 client: one connection, reconnects once on failure."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 2.0):
+        self.host, self.port, self.db, self.password, self.timeout = host, port, db, password, timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        if self.password:
+            self._roundtrip(("AUTH", self.password))
+        if self.db:
+            self._roundtrip(("SELECT", self.db))
+
+    def _disconnect(self):
+        for closable in (self._file, self._sock):
+            try:
+                if closable is not None:
+                    closable.close()
+            except OSError:
+                pass
+        self._sock = self._file = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read(self) -> Any:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read() for _ in range(count)]
+        raise ConnectionError(f"unexpected reply: {line!r}")
+
+    def _roundtrip(self, args) -> Any:
+        self._sock.sendall(self._encode(args))
+        return self._read()
+
+    def execute(self, *args) -> Any:
+        return self.pipeline(args)[0]
+
+    def pipeline(self, *commands) -> List[Any]:
+        """Send several commands in one round trip; returns their replies (error replies raise)."""
+        payload = b"".join(self._encode(args) for args in commands)
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(payload)
+                    replies = []
+                    # Read every reply, even after an error reply, so the connection stays in step.
+                    for _ in commands:
+                        try:
+                            replies.append(self._read())
+                        except RespError as exc:
+                            replies.append(exc)
+                    break
+                except (OSError, ConnectionError):
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+class RedisBackend(StateBackend):
+    """Redis (or any RESP server); suits workers spread over several hosts."""
+
+    name = "redis"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, prefix: str = "pii:"):
+        self.client = RespClient(host, port, db, password)
+        self.prefix = prefix
+        self.address = f"{host}:{port}/{db}"
+
+    def _kv(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}kv:{namespace}:{key}"
+
+    def put_json(self, namespace, key, raw, ttl=None):
+        args = ["SET", self._kv(namespace, key), raw]
+        if ttl:
+            args += ["EX", max(1, int(ttl))]
+        self.client.pipeline(args, ("SADD", f"{self.prefix}idx:{namespace}", key))
+
+    def get(self, namespace, key):
+        raw = self.client.execute("GET", self._kv(namespace, key))
+        return loads(raw) if raw is not None else None
+
+    def delete(self, namespace, key):
+        self.client.execute("DEL", self._kv(namespace, key))
+        self.client.execute("SREM", f"{self.prefix}idx:{namespace}", key)
+
+    def values(self, namespace):
+        keys = self.client.execute("SMEMBERS", f"{self.prefix}idx:{namespace}") or []
+        if not keys:
+            return {}
+        raws = self.client.execute("MGET", *(self._kv(namespace, key) for key in keys))
+        found, expired = {}, []
+        for key, raw in zip(keys, raws):
+            if raw is None:
+                expired.append(key)
+            else:
+                found[key] = loads(raw)
+        if expired:
+            self.client.execute("SREM", f"{self.prefix}idx:{namespace}", *expired)
+        return found
+
+    def _events_key(self, topic: str) -> str:
+        # A sorted set scored by event id, so reads select by id whatever worker wrote them.
+        return f"{self.prefix}events:{topic}"
+
+    def append_event_json(self, topic, event_id, event, raw_data):
+        key = self._events_key(topic)
+        member = f'{{"id":{int(event_id)},"event":{_dumps(event)},"data":{raw_data}}}'
+        self.client.pipeline(("ZADD", key, event_id, member), ("EXPIRE", key, EVENT_TTL_SECONDS))
+
+    def events(self, topic, after=0):
+        raws = self.client.execute("ZRANGEBYSCORE", self._events_key(topic), f"({after}", "+inf") or []
+        return [Event(item["id"], item["event"], item["data"]) for item in map(loads, raws)]
+
+    def last_event_id(self, topic):
+        reply = self.client.execute("ZREVRANGE", self._events_key(topic), 0, 0, "WITHSCORES") or []
+        return int(float(reply[1])) if reply else 0
+
+    def open_topic(self, topic):
+        self.client.execute("SET", f"{self.prefix}open:{topic}", "1", "EX", EVENT_TTL_SECONDS)
+
+    def close_topic(self, topic):
+        self.client.execute("SET", f"{self.prefix}closed:{topic}", "1", "EX", EVENT_TTL_SECONDS)
+
+    def topic_state(self, topic):
+        if self.client.execute("EXISTS", f"{self.prefix}closed:{topic}"):
+            return "closed"
+        known = self.client.execute("EXISTS", self._events_key(topic), f"{self.prefix}open:{topic}")
+        return "open" if known else None
+
+    def claim(self, name, owner, ttl):
+        key = f"{self.prefix}lease:{name}"
+        ms = max(1, int(ttl * 1000))
+        if self.client.execute("SET", key, owner, "NX", "PX", ms) == "OK":
+            return True
+        if self.client.execute("GET", key) == owner:
+            self.client.execute("PEXPIRE", key, ms)
+            return True
+        return False
+
+    def release(self, name, owner):
+        key = f"{self.prefix}lease:{name}"
+        if self.client.execute("GET", key) == owner:
+            self.client.execute("DEL", key)
+
+    def close(self):
+        self.client.close()
+
+    def stats(self):
+        return {**super().stats(), "address": self.address}
+
+
+def open_backend(url: Optional[str] = None) -> StateBackend:
+    """Backend for ``memory://``, ``sqlite:///path`` or ``redis://[:password@]host:port/db``."""
+    if not url or url == "memory://":
+        return MemoryBackend()
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        # sqlite:///state.db is relative to the working directory, sqlite:////var/lib/state.db absolute.
+        return SQLiteBackend(parsed.path[1:] or "state.db")
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisBackend(parsed.hostname or "127.0.0.1", parsed.port or 6379, db, parsed.password)
+    raise ValueError(f"Unsupported state backend: {url}")
+
+
+class BackendWriter:
+    """
+    Mirrors writes to a backend from one background task (``run``), off the event loop.
+
+    Callers queue writes and return at once, so a slow or unreachable backend
+    delays the mirror, not requests. Writes are applied in order, in batches
+    handed to a thread; values are serialized on the loop when a batch is
+    taken, as the loop keeps mutating them. A ``put`` of a key whose previous
+    put is still queued only updates the queued value. The queue is bounded:
+    once ``max_pending`` writes wait, new ones are dropped and counted. When a
+    write fails, the rest of its batch is dropped too, so an outage costs one
+    timeout per batch rather than per write. Does nothing for process-local
+    backends.
+    """
+
+    def __init__(self, backend: StateBackend, max_pending: int = WRITER_MAX_PENDING, batch_size: int = WRITER_BATCH_SIZE):
+        self.backend = backend
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._ops: Deque[Tuple[str, tuple]] = deque()
+        self._puts: Dict[Tuple[str, str], Tuple[Any, Optional[float]]] = {}
+        self._wakeup = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self.counts = {"queued": 0, "merged": 0, "written": 0, "dropped": 0, "errors": 0}
+
+    def _enqueue(self, method: str, args: tuple) -> bool:
+        if not self.backend.shared:
+            return False
+        if len(self._ops) >= self.max_pending:
+            self.counts["dropped"] += 1
+            return False
+        self._ops.append((method, args))
+        self.counts["queued"] += 1
+        self._wakeup.set()
+        return True
+
+    def put(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        slot = (namespace, str(key))
+        if slot in self._puts:
+            self._puts[slot] = (value, ttl)
+            self.counts["merged"] += 1
+        elif self._enqueue("put", slot):
+            self._puts[slot] = (value, ttl)
+
+    def append_event(self, topic: str, event_id: int, event: str, data: Any):
+        self._enqueue("append_event", (topic, event_id, event, data))
+
+    def close_topic(self, topic: str):
+        self._enqueue("close_topic", (topic,))
+
+    def release(self, name: str, owner: str):
+        self._enqueue("release", (name, owner))
+
+    def _take_batch(self) -> List[Tuple[Callable, tuple]]:
+        batch = []
+        while self._ops and len(batch) < self.batch_size:
+            method, args = self._ops.popleft()
+            try:
+                if method == "put":
+                    value, ttl = self._puts.pop(args)
+                    batch.append((self.backend.put_json, (*args, _dumps(value), ttl)))
+                elif method == "append_event":
+                    topic, event_id, event, data = args
+                    batch.append((self.backend.append_event_json, (topic, event_id, event, _dumps(data))))
+                else:
+                    batch.append((getattr(self.backend, method), args))
+            except (TypeError, ValueError) as exc:
+                self.counts["errors"] += 1
+                logger.warning(f"Could not serialize a mirrored {method}: {exc}")
+        return batch
+
+    def _write(self, batch: List[Tuple[Callable, tuple]]) -> int:
+        """Apply a batch (in a thread); returns how many writes went through."""
+        for done, (method, args) in enumerate(batch):
+            try:
+                method(*args)
+            except Exception as exc:
+                logger.warning(
+                    f"State backend {method.__name__} failed: {exc}; dropping {len(batch) - done} mirrored writes"
+                )
+                return done
+        return len(batch)
+
+    async def flush(self):
+        """Write everything queued so far."""
+        async with self._flushing:
+            while self._ops:
+                batch = self._take_batch()
+                written = await asyncio.to_thread(self._write, batch)
+                self.counts["written"] += written
+                if written < len(batch):
+                    self.counts["errors"] += 1
+                    self.counts["dropped"] += len(batch) - written
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "pending": len(self._ops)}
+
+
+async def follow_remote(
+    backend: StateBackend,
+    topic: str,
+    last_event_id: int = 0,
+    poll: float = REMOTE_POLL_SECONDS,
+    heartbeat: Optional[float] = HEARTBEAT_SECONDS,
+) -> AsyncIterator[Optional[Event]]:
+    """
+    Follow a topic published by another worker through the backend's event log.
+
+    Same contract as ``EventBus.subscribe``: yields events after
+    ``last_event_id``, None as a heartbeat, and ends once the topic is closed
+    (or unknown) and drained.
+    """
+    last = last_event_id
+    idle_since = time.monotonic()
+    while True:
+        events = await asyncio.to_thread(backend.events, topic, last)
+        for ev in events:
+            last = ev.id
+            yield ev
+        if events:
+            idle_since = time.monotonic()
+            continue
+        state = await asyncio.to_thread(backend.topic_state, topic)
+        if state != "open":
+            # A close can land between the two reads; drain once more before ending.
+            if state == "closed":
+                for ev in await asyncio.to_thread(backend.events, topic, last):
+                    last = ev.id
+                    yield ev
+            return
+        if heartbeat is not None and time.monotonic() - idle_since >= heartbeat:
+            idle_since = time.monotonic()
+            yield None
+        await asyncio.sleep(poll)
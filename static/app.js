@@ -105,6 +105,7 @@ async function startScan() {
             body: JSON.stringify({ query }),
         });
         const data = await resp.json();
+        if (!resp.ok) throw new Error(data.detail || 'Scan failed');
         currentScanId = data.scan_id;
         addLog(`Scan ID: ${data.scan_id}`);
         connectSSE(currentScanId);
@@ -128,7 +129,14 @@ function connectSSE(scanId) {
 
     sseSource.addEventListener('log', (e) => {
         const d = JSON.parse(e.data);
-        appendLogLine(d.message);
+        appendScanLogLine(d.line, d.message);
+    });
+
+    sseSource.addEventListener('timing', (e) => {
+        const d = JSON.parse(e.data);
+        const stages = Object.entries(d.stages).slice(0, 4)
+            .map(([name, s]) => `${name} ${(s.total_ms / 1000).toFixed(1)}s${s.count > 1 ? ` (${s.count})` : ''}`);
+        addLog(`Timing: ${(d.duration_ms / 1000).toFixed(1)}s total | ${stages.join(' | ')}`);
     });
 
     sseSource.addEventListener('completed', (e) => {
@@ -142,7 +150,8 @@ function connectSSE(scanId) {
     });
 
     sseSource.addEventListener('error', () => {
-        if (sseSource) { sseSource.close(); sseSource = null; }
+        // While CONNECTING the browser retries by itself and resumes after the last event id.
+        if (sseSource && sseSource.readyState === EventSource.CLOSED) sseSource = null;
     });
 }
 
@@ -150,30 +159,24 @@ function connectSSE(scanId) {
 
 async function pollScan(scanId) {
     try {
-        const resp = await fetch(`/api/scan/${scanId}`);
+        // Only the status and the log lines added since the last poll; the full scan once it is done.
+        const logEl = document.getElementById('progressLog');
+        const since = parseInt(logEl.dataset.scanLogCount || '0', 10);
+        const resp = await fetch(`/api/scan/${scanId}?fields=status,progress,log,error&since=${since}`);
         const data = await resp.json();
 
         setProgress(data.progress);
 
         // Update log from server
-        if (data.log && data.log.length) {
-            const logEl = document.getElementById('progressLog');
-            const existing = logEl.querySelectorAll('.log-line').length;
-            data.log.slice(existing).forEach(entry => {
-                const line = document.createElement('div');
-                line.className = 'log-line';
-                line.textContent = entry;
-                logEl.appendChild(line);
-                logEl.scrollTop = logEl.scrollHeight;
-            });
-        }
+        (data.log || []).forEach((entry, i) => appendScanLogLine(data.log_offset + i, entry));
 
         if (data.status === 'completed') {
             clearInterval(pollInterval);
             pollInterval = null;
             if (sseSource) { sseSource.close(); sseSource = null; }
+            const full = await (await fetch(`/api/scan/${scanId}`)).json();
             setTimeout(() => {
-                renderResults(data);
+                renderResults(full);
                 switchTab('results');
                 hideProgress();
             }, 500);
@@ -202,6 +205,7 @@ function showProgress(title = 'SCAN IN PROGRESS') {
     if (logEl) {
         logEl.innerHTML = '';
         logEl.dataset.monitorLogCount = '0';
+        logEl.dataset.scanLogCount = '0';
     }
 }
 
@@ -221,6 +225,15 @@ function addLog(msg) {
     appendLogLine(line);
 }
 
+// Scan log lines arrive from both the stream and polls; each absolute position is shown once.
+function appendScanLogLine(position, text) {
+    const logEl = document.getElementById('progressLog');
+    const next = parseInt(logEl.dataset.scanLogCount || '0', 10);
+    if (position != null && position < next) return;
+    if (position != null) logEl.dataset.scanLogCount = String(position + 1);
+    appendLogLine(text);
+}
+
 function appendLogLine(text) {
     const log = document.getElementById('progressLog');
     const div = document.createElement('div');
@@ -349,7 +362,10 @@ async function pollMonitor(monitorId) {
     if (!monitorId) return;
 
     try {
-        const resp = await fetch(`/api/monitor/${monitorId}`);
+        const logEl = document.getElementById('progressLog');
+        const existing = parseInt(logEl.dataset.monitorLogCount || '0', 10);
+        const fields = 'status,started_at,ends_at,run_count,total_findings,alerts_sent,last_summary,next_run_at,log';
+        const resp = await fetch(`/api/monitor/${monitorId}?fields=${fields}&since=${existing}`);
         const data = await resp.json();
         if (!resp.ok) throw new Error(data.detail || 'Monitor status failed');
 
@@ -360,11 +376,10 @@ async function pollMonitor(monitorId) {
             setProgress(pct);
         }
 
-        const logEl = document.getElementById('progressLog');
-        const existing = parseInt(logEl.dataset.monitorLogCount || '0', 10);
-        if (Array.isArray(data.log) && data.log.length > existing) {
-            data.log.slice(existing).forEach(entry => appendLogLine(entry));
-            logEl.dataset.monitorLogCount = String(data.log.length);
+        const logOffset = data.log_offset || 0;
+        if (Array.isArray(data.log) && logOffset + data.log.length > existing) {
+            data.log.slice(Math.max(0, existing - logOffset)).forEach(entry => appendLogLine(entry));
+            logEl.dataset.monitorLogCount = String(logOffset + data.log.length);
         }
 
         const summary = data.last_summary || {};
@@ -372,7 +387,9 @@ async function pollMonitor(monitorId) {
         document.getElementById('monitorStatus').textContent =
             `Status: ${data.status || 'unknown'} | Runs: ${data.run_count || 0} | ` +
             `Total findings: ${data.total_findings || 0} | In-app alerts: ${data.alerts_sent || 0} | ` +
-            `Last risk: ${summary.overall_risk || '-'} | Next run: ${nextRun}`;
+            `Last risk: ${summary.overall_risk || '-'} | ` +
+            (summary.duration_ms != null ? `Last run: ${(summary.duration_ms / 1000).toFixed(1)}s${summary.partial ? ' (partial)' : ''} | ` : '') +
+            `Next run: ${nextRun}`;
 
         if (['completed', 'stopped', 'error'].includes(data.status)) {
             if (monitorPollInterval) {
@@ -402,6 +419,12 @@ async function scanURL() {
         return;
     }
 
+    const crawlDepth = parseInt(document.getElementById('urlCrawlDepth').value, 10) || 0;
+    if (crawlDepth > 0) {
+        await startCrawl(url, crawlDepth);
+        return;
+    }
+
     const btn = document.getElementById('btnUrlScan');
     btn.disabled = true;
     btn.textContent = 'SCANNING...';
@@ -441,6 +464,28 @@ async function scanURL() {
     }
 }
 
+async function startCrawl(url, maxDepth) {
+    showProgress('SITE CRAWL IN PROGRESS');
+    addLog(`Site crawl: ${url} (depth ${maxDepth})`);
+
+    try {
+        const resp = await fetch('/api/scan/crawl', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ url, max_depth: maxDepth }),
+        });
+        const data = await resp.json();
+        if (!resp.ok) throw new Error(data.detail || 'Crawl failed');
+        currentScanId = data.scan_id;
+        addLog(`Scan ID: ${data.scan_id}`);
+        connectSSE(currentScanId);
+        pollInterval = setInterval(() => pollScan(currentScanId), 2000);
+    } catch (e) {
+        addLog('ERROR: ' + e.message);
+        hideProgress();
+    }
+}
+
 function renderURLResult(data) {
     const sum = document.getElementById('resultsSummary');
     sum.classList.remove('hidden');
@@ -515,6 +560,11 @@ async function uploadFile(file) {
 
         const data = await resp.json();
         setProgress(75);
+        if (data.archive) {
+            const skipped = Object.entries(data.archive.skipped).map(([k, v]) => `${k}:${v}`).join(', ');
+            addLog(`Archive (${data.archive.format}): ${data.archive.scanned} files scanned` + (skipped ? `, skipped ${skipped}` : ''));
+            if (data.archive.truncated) addLog(`Archive cut short (${data.archive.truncated})`);
+        }
         addLog(`Found ${data.pii_count} PII items`);
         if (data.by_method) {
             const m = Object.entries(data.by_method).map(([k, v]) => `${k}:${v}`).join(', ');
@@ -551,7 +601,9 @@ async function scanSocial() {
         const resp = await fetch('/api/scan/social', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ platform, handle }),
+            body: JSON.stringify(platform === 'all'
+                ? { handle, platforms: ['twitter', 'instagram'] }
+                : { platform, handle }),
         });
 
         const data = await resp.json();
@@ -626,7 +678,7 @@ function renderFileResult(data) {
     const sum = document.getElementById('resultsSummary');
     sum.classList.remove('hidden');
     document.getElementById('resTotalFindings').textContent = data.pii_count || 0;
-    document.getElementById('resTotalSources').textContent = '1';
+    document.getElementById('resTotalSources').textContent = data.files ? data.files.length : '1';
 
     const sev = data.by_severity || {};
     const risk = sev.CRITICAL ? 'CRITICAL' : sev.HIGH ? 'HIGH' : sev.MEDIUM ? 'MEDIUM' : 'LOW';
@@ -644,6 +696,27 @@ function renderFileResult(data) {
         return;
     }
 
+    if (data.files) {
+        // Archive upload: one card per file with findings.
+        container.innerHTML = data.files.filter(f => f.pii_count > 0).map(f => `
+            <div class="result-card expanded">
+                <div class="result-card-header">
+                    <div class="result-source">
+                        <span class="source-badge" style="color:var(--yellow);border-color:var(--yellow)">${esc(data.archive.format.toUpperCase())}</span>
+                        <span class="result-title">${esc(f.path)}</span>
+                    </div>
+                    <div class="result-meta">
+                        <span class="pii-count-badge has-findings">${f.pii_count} PII</span>
+                    </div>
+                </div>
+                <div class="result-card-body" style="display:block">
+                    ${f.findings.map(x => renderFinding(x)).join('')}
+                </div>
+            </div>
+        `).join('');
+        return;
+    }
+
     container.innerHTML = `
         <div class="result-card expanded">
             <div class="result-card-header">
@@ -0,0 +1,146 @@
+"""
+Stats — incrementally maintained scan counters and time-bucketed rollups.
+
+Every finished scan is recorded once; totals, the risk/method/type breakdowns
+and the per-minute/hour/day rollups are updated on write, so reading the
+dashboard stats costs the same however long the service has been running.
+"""
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+# Resolution -> (bucket width in seconds, buckets kept).
+RESOLUTIONS = {
+    "minute": (60, 24 * 60),
+    "hour": (3600, 30 * 24),
+    "day": (86400, 365),
+}
+RECENT_SCANS = 10
+# Largest number of points a single time-series response may contain.
+MAX_POINTS = 2000
+
+
+def _new_bucket() -> Dict[str, Any]:
+    return {"scans": 0, "findings": 0, "by_risk": {}, "by_method": {}, "by_type": {}}
+
+
+def _add(counter: Dict[str, int], key: str, amount: int = 1):
+    counter[key] = counter.get(key, 0) + amount
+
+
+def _merge(into: Dict[str, Any], bucket: Dict[str, Any]):
+    into["scans"] += bucket["scans"]
+    into["findings"] += bucket["findings"]
+    for field in ("by_risk", "by_method", "by_type"):
+        for key, value in bucket[field].items():
+            _add(into[field], key, value)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+class StatsAggregator:
+    def __init__(self, recent: int = RECENT_SCANS):
+        self.totals = _new_bucket()
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=recent)
+        self._rollups: Dict[str, "OrderedDict[int, Dict[str, Any]]"] = {res: OrderedDict() for res in RESOLUTIONS}
+        self._active: Dict[str, Set[str]] = {}
+
+    # ── Writes ──
+
+    def record(self, entry: Dict[str, Any], by_method: Optional[Dict[str, int]] = None, ts: Optional[float] = None):
+        """
+        Count one finished scan.
+
+        ``entry`` carries "scan_type", "total_findings" and "overall_risk" (and is
+        kept as-is in the recent list); ``by_method`` breaks its findings down by
+        detection method.
+        """
+        ts = time.time() if ts is None else ts
+        findings = int(entry.get("total_findings") or 0)
+        risk = entry.get("overall_risk") or "LOW"
+        scan_type = entry.get("scan_type") or "other"
+
+        targets = [self.totals]
+        for res, (width, keep) in RESOLUTIONS.items():
+            buckets = self._rollups[res]
+            start = int(ts // width * width)
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = _new_bucket()
+                while len(buckets) > keep:
+                    buckets.popitem(last=False)
+            targets.append(bucket)
+
+        for target in targets:
+            target["scans"] += 1
+            target["findings"] += findings
+            _add(target["by_risk"], risk)
+            _add(target["by_type"], scan_type)
+            for method, count in (by_method or {}).items():
+                _add(target["by_method"], method, count)
+        self.recent.append(entry)
+
+    def start(self, kind: str, item_id: str):
+        self._active.setdefault(kind, set()).add(item_id)
+
+    def finish(self, kind: str, item_id: str):
+        self._active.get(kind, set()).discard(item_id)
+
+    def active(self, kind: str) -> int:
+        return len(self._active.get(kind, ()))
+
+    # ── Reads ──
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total_scans": self.totals["scans"],
+            "total_findings": self.totals["findings"],
+            "risk_distribution": dict(self.totals["by_risk"]),
+            "by_method": dict(self.totals["by_method"]),
+            "by_type": dict(self.totals["by_type"]),
+            "recent_scans": list(self.recent)[::-1],
+        }
+
+    def timeseries(self, resolution: str, start: float, end: float, fill: bool = True) -> Dict[str, Any]:
+        """
+        Buckets of ``resolution`` overlapping ``[start, end)`` plus their totals.
+
+        With ``fill`` empty buckets are included as zeros so the series is
+        evenly spaced. Raises ValueError for an unknown resolution or a range
+        that would exceed MAX_POINTS buckets.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of: {', '.join(RESOLUTIONS)}")
+        if end <= start:
+            raise ValueError("end must be after start")
+        width, _ = RESOLUTIONS[resolution]
+        first = int(start // width * width)
+        if (end - first) / width > MAX_POINTS:
+            raise ValueError(f"range spans more than {MAX_POINTS} {resolution} buckets")
+
+        buckets = self._rollups[resolution]
+        starts: Iterable[int] = range(first, int(end), width) if fill else (
+            s for s in buckets if first <= s < end
+        )
+        points: List[Dict[str, Any]] = []
+        totals = _new_bucket()
+        for bucket_start in starts:
+            bucket = buckets.get(bucket_start)
+            if bucket is None:
+                bucket = _new_bucket()
+            else:
+                _merge(totals, bucket)
+            points.append({"ts": bucket_start, "t": _iso(bucket_start), **bucket})
+        return {
+            "resolution": resolution,
+            "start": _iso(first),
+            "end": _iso(end),
+            "points": points,
+            "totals": totals,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {res: len(buckets) for res, buckets in self._rollups.items()}
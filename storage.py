@@ -0,0 +1,391 @@
+"""
+Storage — bounded, TTL-evicting in-memory stores with optional SQLite spill.
+
+``BoundedStore`` is a dict-like map whose finished entries (as decided by an
+``evictable`` predicate) expire after a TTL or are evicted oldest-first once
+the store exceeds its entry or byte budget. Evicted entries can be spilled to
+SQLite and are then still readable by key. ``BoundedList`` is a list that keeps
+only its newest items. Both report their approximate memory use.
+``DurableStore`` persists records (such as monitors) to SQLite with batched,
+coalesced writes so they survive a restart.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, MutableMapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DURABLE_FLUSH_SECONDS = 1.0
+DURABLE_BATCH_SIZE = 100
+
+_DELETED = object()
+
+
+@dataclass
+class RetentionPolicy:
+    ttl_seconds: Optional[float] = None     # since the entry was last written or touched
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    spill_ttl_seconds: float = 7 * 24 * 3600
+
+
+def approx_size(obj: Any) -> int:
+    """Approximate deep size in bytes of JSON-like data (shared objects count twice)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(approx_size(v) for v in obj)
+    return size
+
+
+class SQLiteSpill:
+    """Key/value table that receives entries evicted from bounded stores."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS spill ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def put(self, namespace: str, key: str, value: Any):
+        data = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO spill (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (namespace, str(key), data, time.time()),
+            )
+            self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM spill WHERE namespace = ? AND key = ?", (namespace, str(key))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM spill WHERE namespace = ? AND key = ?", (namespace, str(key)))
+            self._conn.commit()
+
+    def purge(self, namespace: str, older_than: float) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM spill WHERE namespace = ? AND stored_at < ?", (namespace, time.time() - older_than)
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM spill WHERE namespace = ?", (namespace,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BoundedStore(MutableMapping):
+    """
+    Dict with a retention policy for finished entries.
+
+    Entries are ordered by their last write; ``touch(key)`` re-dates an entry
+    and re-measures its size after in-place changes (e.g. when a scan
+    completes). Entries for which ``evictable`` is False (running scans) are
+    never evicted. ``on_evict(key, value)`` runs for every evicted entry so
+    dependent data (event logs, tasks) can be dropped with it. Iteration and
+    ``len`` cover the in-memory entries only; spilled entries are reachable by
+    key.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: RetentionPolicy,
+        evictable: Callable[[Any], bool] = lambda value: True,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+        spill: Optional[SQLiteSpill] = None,
+    ):
+        self.name = name
+        self.policy = policy
+        self.evictable = evictable
+        self.on_evict = on_evict
+        self.spill = spill
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._written: Dict[Hashable, float] = {}
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self.counts = {"evicted": 0, "expired": 0, "spilled": 0, "spill_hits": 0}
+
+    # ── Mapping protocol ──
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+        if self.spill is not None:
+            value = self.spill.get(self.name, key)
+            if value is not None:
+                self.counts["spill_hits"] += 1
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._measure(key)
+        self.enforce()
+
+    def __delitem__(self, key: Hashable):
+        if key in self._data:
+            self._forget(key)
+        elif self.spill is not None and self.spill.get(self.name, key) is not None:
+            self.spill.delete(self.name, key)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._data:
+            return True
+        return self.spill is not None and self.spill.get(self.name, key) is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ── Retention ──
+
+    def touch(self, key: Hashable):
+        """Mark an entry as freshly written and re-measure it."""
+        if key in self._data:
+            self._data.move_to_end(key)
+            self._measure(key)
+            self.enforce()
+
+    def _measure(self, key: Hashable):
+        self._bytes -= self._sizes.get(key, 0)
+        self._sizes[key] = approx_size(self._data[key])
+        self._bytes += self._sizes[key]
+        self._written[key] = time.monotonic()
+
+    def _forget(self, key: Hashable) -> Any:
+        value = self._data.pop(key)
+        self._bytes -= self._sizes.pop(key, 0)
+        self._written.pop(key, None)
+        return value
+
+    def _evict(self, key: Hashable, reason: str):
+        value = self._forget(key)
+        self.counts[reason] += 1
+        if self.spill is not None:
+            try:
+                self.spill.put(self.name, key, value)
+                self.counts["spilled"] += 1
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"Could not spill {self.name}/{key}: {e}")
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def _over_budget(self) -> bool:
+        policy = self.policy
+        return (policy.max_entries is not None and len(self._data) > policy.max_entries) or (
+            policy.max_bytes is not None and self._bytes > policy.max_bytes
+        )
+
+    def enforce(self):
+        """Expire entries past their TTL, then evict the oldest finished ones while over budget."""
+        ttl = self.policy.ttl_seconds
+        cutoff = time.monotonic() - ttl if ttl is not None else None
+        for key in list(self._data):
+            expired = cutoff is not None and self._written[key] < cutoff
+            if not expired and not self._over_budget():
+                break
+            if self.evictable(self._data[key]):
+                self._evict(key, "expired" if expired else "evicted")
+
+    def sweep(self):
+        """Periodic maintenance: enforce the policy and purge old spill rows."""
+        self.enforce()
+        if self.spill is not None:
+            self.spill.purge(self.name, self.policy.spill_ttl_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "approx_bytes": self._bytes,
+            **self.counts,
+            "spill_entries": self.spill.count(self.name) if self.spill is not None else None,
+            "policy": {
+                "ttl_seconds": self.policy.ttl_seconds,
+                "max_entries": self.policy.max_entries,
+                "max_bytes": self.policy.max_bytes,
+            },
+        }
+
+
+class BoundedList(list):
+    """
+    List that keeps only its newest ``max_items`` items.
+
+    ``dropped`` counts the items discarded from the front, so ``dropped + i``
+    is a stable absolute position for item ``i``.
+    """
+
+    def __init__(self, max_items: int, items=()):
+        super().__init__(items)
+        self.max_items = max_items
+        self.dropped = 0
+        self._trim()
+
+    def _trim(self):
+        excess = len(self) - self.max_items
+        if excess > 0:
+            del self[:excess]
+            self.dropped += excess
+
+    def append(self, item: Any):
+        super().append(item)
+        self._trim()
+
+    def extend(self, items):
+        super().extend(items)
+        self._trim()
+
+    def since(self, position: int) -> list:
+        """Items from absolute ``position`` on (clamped to what is still kept)."""
+        return self[max(0, position - self.dropped):]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self), "dropped": self.dropped, "approx_bytes": approx_size(self)}
+
+
+class DurableStore:
+    """
+    SQLite-backed record store with write batching.
+
+    ``save`` only marks a record dirty and keeps a reference to it; ``run``
+    (a background task) serializes the latest state of every dirty record and
+    writes them in one transaction every ``flush_seconds``, or sooner once
+    ``batch_size`` records are pending. Repeated saves of a record between
+    flushes cost one write. ``close`` flushes whatever is still pending.
+    """
+
+    def __init__(self, path: str, flush_seconds: float = DURABLE_FLUSH_SECONDS, batch_size: int = DURABLE_BATCH_SIZE):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+        self._dirty: Dict[Tuple[str, str], Any] = {}
+        self._wakeup = asyncio.Event()
+        self.counts = {"saves": 0, "flushes": 0, "written": 0, "deleted": 0, "errors": 0}
+
+    def save(self, namespace: str, key: str, value: Any):
+        self._dirty[(namespace, str(key))] = value
+        self.counts["saves"] += 1
+        if len(self._dirty) >= self.batch_size:
+            self._wakeup.set()
+
+    def delete(self, namespace: str, key: str):
+        self._dirty[(namespace, str(key))] = _DELETED
+
+    def discard(self, namespace: str, key: str):
+        """Forget a pending save of the record; what is already stored stays."""
+        self._dirty.pop((namespace, str(key)), None)
+
+    def load(self, namespace: str) -> Dict[str, Any]:
+        """All records in ``namespace``, oldest update first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM records WHERE namespace = ? ORDER BY updated_at", (namespace,)
+            ).fetchall()
+        records = {}
+        for key, value in rows:
+            try:
+                records[key] = json.loads(value)
+            except ValueError as e:
+                logger.warning(f"Skipping unreadable record {namespace}/{key}: {e}")
+        return records
+
+    def _take_batch(self):
+        batch, self._dirty = self._dirty, {}
+        now = time.time()
+        upserts, deletes = [], []
+        for (namespace, key), value in batch.items():
+            if value is _DELETED:
+                deletes.append((namespace, key))
+                continue
+            try:
+                upserts.append((namespace, key, json.dumps(value, default=str), now))
+            except (TypeError, ValueError) as e:
+                self.counts["errors"] += 1
+                logger.warning(f"Could not serialize {namespace}/{key}: {e}")
+        return upserts, deletes
+
+    def _write(self, upserts, deletes):
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)", upserts
+                )
+                self._conn.executemany("DELETE FROM records WHERE namespace = ? AND key = ?", deletes)
+        self.counts["flushes"] += 1
+        self.counts["written"] += len(upserts)
+        self.counts["deleted"] += len(deletes)
+
+    async def flush(self):
+        """Write pending records; serialization happens here, the SQLite write in a thread."""
+        if not self._dirty:
+            return
+        upserts, deletes = self._take_batch()
+        try:
+            await asyncio.to_thread(self._write, upserts, deletes)
+        except sqlite3.Error as e:
+            self.counts["errors"] += 1
+            logger.error(f"Durable store flush failed: {e}")
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def close(self):
+        upserts, deletes = self._take_batch()
+        try:
+            if upserts or deletes:
+                self._write(upserts, deletes)
+        finally:
+            with self._lock:
+                self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counts, "pending": len(self._dirty), "path": self.path}
@@ -0,0 +1,275 @@
+"""
+Synthetic Data — seeded generator of profiles, posts and web pages with known PII.
+
+Every document comes with ground-truth spans (type, value, start, end) for the
+PII embedded in it, so the simulated social scanner, load tests and detection
+benchmarks all run on realistic text without network access or artificial
+delays. Output depends only on the seed (and key), never on call order across
+generators.
+"""
+import hashlib
+import html
+import random
+import string
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_SEED = 1337
+
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Meera", "Arjun", "Kavya", "Rohan", "Isha",
+    "James", "Emily", "Michael", "Sarah", "David", "Olivia", "Daniel", "Sophia", "Lucas", "Grace",
+]
+LAST_NAMES = [
+    "Sharma", "Iyer", "Reddy", "Nair", "Gupta", "Menon", "Rao", "Kapoor", "Pillai", "Joshi",
+    "Smith", "Johnson", "Brown", "Miller", "Wilson", "Taylor", "Anderson", "Clark", "Walker", "Young",
+]
+CITIES = ["Bangalore", "Chennai", "Hyderabad", "Pune", "Mumbai", "Austin", "Seattle", "Boston", "Denver", "Portland"]
+EMPLOYERS = ["Tech Corp", "Nimbus Labs", "Bluefin Systems", "Orbit Analytics", "Quarry Software", "Helix Health"]
+ROLES = ["backend engineer", "data scientist", "product designer", "SRE", "full-stack dev", "ML engineer"]
+MAIL_DOMAINS = ["gmail.com", "outlook.com", "yahoo.com", "proton.me", "techcorp.io", "example.org"]
+TOPICS = ["Kubernetes", "Rust", "React", "Postgres", "coffee", "open source", "trail running", "photography"]
+
+# Sentence frames for filler text; they never contain PII on their own.
+FILLER = [
+    "Spent the afternoon refactoring the {topic} setup and it finally feels clean.",
+    "Anyone else think {topic} meetups have gotten way better this year?",
+    "Shipping a small update today, nothing fancy but it fixes a long-standing bug.",
+    "Reading a great thread about {topic} and how teams adopt it in practice.",
+    "The weekend plan is simple: {topic}, a long walk and no laptops.",
+    "Grateful for a team that reviews code quickly and kindly.",
+    "Wrote up some notes on {topic}; will share once they are less messy.",
+    "Conference season again, the hallway track is still the best part.",
+]
+
+# PII type -> frames that embed one value of that type at "{}".
+PII_FRAMES = {
+    "EMAIL": ["Reach me at {} for collaborations.", "New email: {}", "Contact: {}"],
+    "PHONE_IN": ["Call or WhatsApp {} after 6pm.", "Phone: {}"],
+    "PHONE_US": ["Office line is {} if you need me.", "Phone: {}"],
+    "SSN": ["Form copy attached, SSN {} (please keep private)."],
+    "CREDIT_CARD": ["Card on file ends up being {} apparently."],
+    "AADHAAR": ["Aadhaar no. {} submitted for the KYC step."],
+    "PAN_CARD": ["PAN {} used for the tax filing."],
+    "IP_ADDRESS": ["Home server is reachable at {} for now."],
+    "DOB": ["Born on {} and still no idea how taxes work."],
+    "API_KEY": ["Oops, config dump: api_key={}"],
+    "LINKEDIN_PROFILE": ["Connect with me on {}"],
+    "GITHUB_PROFILE": ["Code lives at {}"],
+    "TWITTER_PROFILE": ["Also posting at {}"],
+    "SOCIAL_HANDLE": ["Shout-out to {} for the help today!"],
+    "PERSON_NAME": ["Had a great chat with {} about the roadmap."],
+}
+PII_TYPES = tuple(PII_FRAMES)
+
+
+@dataclass
+class PIISpan:
+    pii_type: str
+    value: str
+    start: int
+    end: int
+
+
+@dataclass
+class SyntheticDocument:
+    kind: str                       # profile | post | page | html
+    text: str
+    spans: List[PIISpan] = field(default_factory=list)
+    meta: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {"kind": self.kind, "text": self.text, "spans": [asdict(s) for s in self.spans], "meta": self.meta}
+
+
+class _Builder:
+    """Concatenates text while recording the offsets of embedded PII."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.spans: List[PIISpan] = []
+        self.length = 0
+
+    def add(self, text: str):
+        self.parts.append(text)
+        self.length += len(text)
+
+    def add_frame(self, frame: str, pii_type: str, value: str):
+        before, after = frame.split("{}", 1)
+        self.add(before)
+        self.spans.append(PIISpan(pii_type, value, self.length, self.length + len(value)))
+        self.add(value)
+        self.add(after)
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def _luhn_complete(prefix: str) -> str:
+    """Append the Luhn check digit to ``prefix``."""
+    total = 0
+    for i, d in enumerate(reversed(prefix)):
+        n = int(d)
+        if i % 2 == 0:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return prefix + str((10 - total % 10) % 10)
+
+
+class SyntheticGenerator:
+    """
+    Deterministic generator of PII-bearing documents.
+
+    ``pii_density`` is the share of sentences that carry one PII value;
+    ``pii_types`` restricts which types are embedded.
+    """
+
+    def __init__(self, seed: int = DEFAULT_SEED, pii_density: float = 0.3, pii_types: Optional[List[str]] = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.pii_density = max(0.0, min(1.0, pii_density))
+        self.pii_types = list(pii_types or PII_TYPES)
+
+    @classmethod
+    def for_key(cls, key: str, seed: int = DEFAULT_SEED, **kwargs) -> "SyntheticGenerator":
+        """Generator whose output depends only on ``seed`` and ``key`` (e.g. a handle)."""
+        digest = hashlib.blake2b(f"{seed}:{key}".encode("utf-8"), digest_size=8).digest()
+        return cls(seed=int.from_bytes(digest, "big"), **kwargs)
+
+    # ── PII values ──
+
+    def person(self, handle: Optional[str] = None) -> Dict[str, str]:
+        rng = self.rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = handle or f"{first.lower()}_{last.lower()[:4]}{rng.randint(1, 99)}"
+        return {
+            "name": f"{first} {last}",
+            "handle": handle,
+            "email": f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@{rng.choice(MAIL_DOMAINS)}",
+            "city": rng.choice(CITIES),
+            "employer": rng.choice(EMPLOYERS),
+            "role": rng.choice(ROLES),
+        }
+
+    def value(self, pii_type: str, person: Optional[Dict[str, str]] = None) -> str:
+        """A fresh value of ``pii_type`` in a format the regex layer recognizes."""
+        rng = self.rng
+        person = person or self.person()
+        handle = person["handle"]
+        if pii_type == "EMAIL":
+            return person["email"] if rng.random() < 0.5 else (
+                f"{handle.replace('_', '.')}@{rng.choice(MAIL_DOMAINS)}"
+            )
+        if pii_type == "PHONE_IN":
+            return f"+91 {rng.randint(6, 9)}{rng.randint(0, 9999):04d} {rng.randint(0, 99999):05d}"
+        if pii_type == "PHONE_US":
+            return f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}"
+        if pii_type == "SSN":
+            area = rng.choice([a for a in range(100, 900) if a != 666])
+            return f"{area}-{rng.randint(1, 99):02d}-{rng.randint(1, 9999):04d}"
+        if pii_type == "CREDIT_CARD":
+            digits = _luhn_complete("4" + "".join(rng.choice(string.digits) for _ in range(14)))
+            return " ".join(digits[i:i + 4] for i in range(0, 16, 4))
+        if pii_type == "AADHAAR":
+            return f"{rng.randint(2000, 9999)} {rng.randint(0, 9999):04d} {rng.randint(0, 9999):04d}"
+        if pii_type == "PAN_CARD":
+            letters = "".join(rng.choice(string.ascii_uppercase) for _ in range(5))
+            return f"{letters}{rng.randint(0, 9999):04d}{rng.choice(string.ascii_uppercase)}"
+        if pii_type == "IP_ADDRESS":
+            return ".".join(str(rng.randint(1, 254)) for _ in range(4))
+        if pii_type == "DOB":
+            return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(1965, 2004)}"
+        if pii_type == "API_KEY":
+            return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(32))
+        if pii_type == "LINKEDIN_PROFILE":
+            return f"https://linkedin.com/in/{handle.replace('_', '-')}"
+        if pii_type == "GITHUB_PROFILE":
+            return f"https://github.com/{handle.replace('_', '-')}"
+        if pii_type == "TWITTER_PROFILE":
+            return f"https://x.com/{handle}"
+        if pii_type == "SOCIAL_HANDLE":
+            return f"@{handle[:20]}"
+        if pii_type == "PERSON_NAME":
+            return self.person()["name"]
+        raise ValueError(f"Unknown PII type: {pii_type}")
+
+    # ── Text ──
+
+    def _sentence(self, builder: _Builder, person: Dict[str, str]):
+        if self.pii_types and self.rng.random() < self.pii_density:
+            pii_type = self.rng.choice(self.pii_types)
+            builder.add_frame(self.rng.choice(PII_FRAMES[pii_type]), pii_type, self.value(pii_type, person))
+        else:
+            builder.add(self.rng.choice(FILLER).format(topic=self.rng.choice(TOPICS)))
+
+    def _paragraph(self, builder: _Builder, person: Dict[str, str], sentences: int):
+        for i in range(sentences):
+            if i:
+                builder.add(" ")
+            self._sentence(builder, person)
+
+    def post(self, person: Optional[Dict[str, str]] = None, sentences: int = 2) -> SyntheticDocument:
+        person = person or self.person()
+        builder = _Builder()
+        self._paragraph(builder, person, sentences)
+        return SyntheticDocument("post", builder.text(), builder.spans, {"handle": person["handle"]})
+
+    def profile(self, handle: Optional[str] = None, posts: int = 5, post_sentences: int = 2) -> SyntheticDocument:
+        """A profile laid out like the simulated social scan: name, bio, then one post per line."""
+        person = self.person(handle)
+        builder = _Builder()
+        builder.add("Profile Name: ")
+        builder.spans.append(PIISpan("PERSON_NAME", person["name"], builder.length, builder.length + len(person["name"])))
+        builder.add(person["name"])
+        builder.add(f"\nBio: {person['role'].capitalize()} at {person['employer']}. Based in {person['city']}. ")
+        self._paragraph(builder, person, 2)
+        for _ in range(posts):
+            builder.add("\n")
+            self._paragraph(builder, person, post_sentences)
+        return SyntheticDocument("profile", builder.text(), builder.spans, dict(person))
+
+    def page(self, target_chars: int = 5000, paragraph_sentences: int = 5) -> SyntheticDocument:
+        """Plain-text web page of roughly ``target_chars`` characters."""
+        person = self.person()
+        builder = _Builder()
+        builder.add(f"{person['employer']} — Team Blog\n\n")
+        while builder.length < target_chars:
+            self._paragraph(builder, person, paragraph_sentences)
+            builder.add("\n\n")
+        return SyntheticDocument("page", builder.text(), builder.spans, {"author": person["name"]})
+
+    def html_page(self, target_chars: int = 5000, paragraph_sentences: int = 5) -> SyntheticDocument:
+        """HTML web page; span offsets refer to the HTML source."""
+        person = self.person()
+        builder = _Builder()
+        builder.add(
+            f"<!DOCTYPE html><html><head><title>{html.escape(person['employer'])} blog</title>"
+            "<style>body{font-family:sans-serif}</style></head><body>"
+            "<nav><a href=\"/\">Home</a> <a href=\"/about\">About</a></nav><main>"
+        )
+        while builder.length < target_chars:
+            builder.add("<p>")
+            for i in range(paragraph_sentences):
+                if i:
+                    builder.add(" ")
+                sentence = _Builder()
+                self._sentence(sentence, person)
+                text = sentence.text()
+                escaped = html.escape(text, quote=False)
+                offset = builder.length
+                builder.add(escaped)
+                # Escaping would shift offsets; the frames avoid markup characters so this holds.
+                if escaped == text:
+                    builder.spans.extend(
+                        PIISpan(s.pii_type, s.value, offset + s.start, offset + s.end) for s in sentence.spans
+                    )
+            builder.add("</p>\n")
+        builder.add("</main><footer>&copy; synthetic</footer></body></html>")
+        return SyntheticDocument("html", builder.text(), builder.spans, {"author": person["name"]})
+
+    def documents(self, count: int, kind: str = "page", **kwargs) -> Iterator[SyntheticDocument]:
+        factory = {"profile": self.profile, "post": self.post, "page": self.page, "html": self.html_page}[kind]
+        for _ in range(count):
+            yield factory(**kwargs)
@@ -0,0 +1,212 @@
+"""
+Tracing — per-scan timing spans, with export as OTLP/JSON.
+
+A scan runs inside ``start_trace``; code on its path opens ``span(...)``
+blocks (search, page fetch, HTML clean, each detection layer,
+summarization). The current trace and parent span travel in context
+variables, so spans nest across awaits, the tasks a crawl starts and
+``asyncio.to_thread`` calls without being passed around. Outside a trace
+``span`` costs one context variable lookup.
+
+``Trace.summary()`` holds the total duration, time per stage, the slowest
+spans and the spans themselves; a scan record keeps all but the spans under
+"timing". ``to_otlp`` turns a summary into an OTLP/JSON
+``ExportTraceServiceRequest`` for any OpenTelemetry collector
+(``POST /v1/traces``) or trace viewer.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Spans kept per trace; a large crawl records the stage totals of the rest but not the spans.
+TRACE_MAX_SPANS = 2000
+TRACE_SLOWEST_SPANS = 10
+# OTLP/HTTP JSON endpoint finished traces are sent to, e.g. "http://localhost:4318/v1/traces".
+TRACE_EXPORT_URL: Optional[str] = None
+TRACE_SERVICE_NAME = "pii-scanner"
+
+_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("trace_parent", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Trace:
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = _new_id(16)
+        self.root_id = _new_id(8)
+        self.name = name
+        self.attributes = attributes
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.stages: Dict[str, Dict[str, float]] = {}
+        # Detection may record spans from worker threads.
+        self._lock = threading.Lock()
+
+    def add(self, name: str, span_id: str, parent_id: Optional[str], start: float, end: float, attributes: Dict[str, Any]):
+        duration_ms = (end - start) * 1000
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            stage["count"] += 1
+            stage["total_ms"] += duration_ms
+            stage["max_ms"] = max(stage["max_ms"], duration_ms)
+            if len(self.spans) >= TRACE_MAX_SPANS:
+                self.dropped += 1
+                return
+            self.spans.append({
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "name": name,
+                "start_ms": round((start - self._t0) * 1000, 3),
+                "duration_ms": round(duration_ms, 3),
+                **({"attributes": attributes} if attributes else {}),
+            })
+
+    def finish(self):
+        """Close the root span; later calls keep the first end time."""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._t0
+
+    def summary(self) -> Dict[str, Any]:
+        """Total and per-stage times plus the recorded spans (JSON-ready)."""
+        self.finish()
+        with self._lock:
+            spans = list(self.spans)
+            stage_items = [(name, dict(s)) for name, s in self.stages.items()]
+        # Stages overlap when pages are fetched concurrently, so their totals can exceed the duration.
+        stages = {
+            name: {"count": s["count"], "total_ms": round(s["total_ms"], 1), "max_ms": round(s["max_ms"], 1)}
+            for name, s in sorted(stage_items, key=lambda item: -item[1]["total_ms"])
+        }
+        slowest = sorted(spans, key=lambda s: -s["duration_ms"])[:TRACE_SLOWEST_SPANS]
+        return {
+            "trace_id": self.trace_id,
+            "root_span_id": self.root_id,
+            "name": self.name,
+            "attributes": self.attributes,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "stages": stages,
+            "slowest": [{k: s[k] for k in ("name", "start_ms", "duration_ms", "attributes") if k in s} for s in slowest],
+            "spans": spans,
+            "dropped_spans": self.dropped,
+        }
+
+
+@contextmanager
+def start_trace(name: str, **attributes) -> Iterator[Trace]:
+    """Make a new trace current for the enclosed block (and the tasks and threads it starts)."""
+    trace = Trace(name, attributes)
+    trace_token = _trace.set(trace)
+    parent_token = _parent.set(trace.root_id)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _parent.reset(parent_token)
+        _trace.reset(trace_token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as a child of the current span.
+
+    Yields the span's attributes, so the block can add what it learns (a
+    status, a size); does nothing outside a trace.
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield attributes
+        return
+    span_id = _new_id(8)
+    parent_id = _parent.get()
+    token = _parent.set(span_id)
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as exc:
+        attributes["error"] = exc.__class__.__name__
+        raise
+    finally:
+        _parent.reset(token)
+        trace.add(name, span_id, parent_id, start, time.perf_counter(), attributes)
+
+
+# ── OTLP export ──
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in (attributes or {}).items() if value is not None]
+
+
+def to_otlp(timing: Dict[str, Any], service_name: str = TRACE_SERVICE_NAME) -> Dict[str, Any]:
+    """An OTLP/JSON ExportTraceServiceRequest for a trace summary (``Trace.summary()``)."""
+    start_ns = int(timing["started_at"] * 1e9)
+
+    def otlp_span(span_id, parent_id, name, start_ms, duration_ms, attributes):
+        begin = start_ns + int(start_ms * 1e6)
+        return {
+            "traceId": timing["trace_id"],
+            "spanId": span_id,
+            **({"parentSpanId": parent_id} if parent_id else {}),
+            "name": name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(begin),
+            "endTimeUnixNano": str(begin + int(duration_ms * 1e6)),
+            "attributes": _otlp_attributes(attributes),
+        }
+
+    spans = [otlp_span(timing["root_span_id"], None, timing["name"], 0, timing["duration_ms"], timing.get("attributes"))]
+    spans += [
+        otlp_span(s["span_id"], s["parent_id"], s["name"], s["start_ms"], s["duration_ms"], s.get("attributes"))
+        for s in timing["spans"]
+    ]
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{"scope": {"name": "tracing"}, "spans": spans}],
+        }]
+    }
+
+
+async def export_otlp(timing: Dict[str, Any], url: Optional[str] = None):
+    """POST a trace summary to an OTLP/HTTP JSON endpoint; failures are logged, not raised."""
+    url = url or TRACE_EXPORT_URL
+    if not url:
+        return
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            resp = await client.post(url, json=to_otlp(timing))
+        if resp.status_code >= 300:
+            logger.warning(f"Trace export to {url} failed: HTTP {resp.status_code}")
+    except Exception as exc:
+        logger.warning(f"Trace export to {url} failed: {exc}")
@@ -0,0 +1,68 @@
+"""
+Views — field selection and pagination for the scan and monitor GET endpoints.
+
+Pollers ask only for what they render (``fields``), fetch the log from the
+position they already have (``since``) and page through large lists
+(``cursor``/``limit``), so each poll costs roughly what changed since the
+last one instead of the whole record.
+"""
+from typing import Any, Dict, Optional, Set
+
+
+def parse_fields(value: Optional[str]) -> Optional[Set[str]]:
+    """``"status,log"`` -> {"status", "log"}; None or empty selects every field."""
+    if not value:
+        return None
+    fields = {f.strip() for f in value.split(",") if f.strip()}
+    return fields or None
+
+
+def _slim(item: Any) -> Any:
+    """A result without its page text (``content_length`` still tells its size)."""
+    if isinstance(item, dict) and "raw_content" in item:
+        item = {k: v for k, v in item.items() if k != "raw_content"}
+    return item
+
+
+def shape(
+    record: Dict[str, Any],
+    id_key: str,
+    fields: Optional[Set[str]] = None,
+    since: Optional[int] = None,
+    page_key: Optional[str] = None,
+    cursor: int = 0,
+    limit: Optional[int] = None,
+    content: bool = True,
+) -> Dict[str, Any]:
+    """
+    The parts of a scan or monitor record a client asked for.
+
+    ``log`` starts at absolute position ``since`` (clamped to what is kept)
+    and comes with ``log_offset`` (position of its first line) and
+    ``log_next`` (the ``since`` for the next poll). ``page_key`` names the
+    list that ``cursor``/``limit`` page through; a page adds
+    ``<page_key>_total`` and ``<page_key>_next`` (None on the last page).
+    ``content=False`` drops each result's ``raw_content``.
+    """
+    out: Dict[str, Any] = {}
+    for key, value in record.items():
+        if fields is not None and key not in fields and key != id_key:
+            continue
+        if key == "log":
+            # Lines trimmed from the front of the log, so clients can keep absolute positions.
+            dropped = getattr(value, "dropped", record.get("log_offset", 0))
+            start = dropped if since is None else max(since, dropped)
+            out["log"] = list(value[start - dropped:])
+            out["log_offset"] = start
+            out["log_next"] = dropped + len(value)
+        elif key == page_key and isinstance(value, list):
+            items = value
+            if cursor or limit is not None:
+                items = value[cursor:cursor + limit] if limit is not None else value[cursor:]
+                end = cursor + len(items)
+                out[f"{key}_total"] = len(value)
+                out[f"{key}_next"] = end if end < len(value) else None
+            out[key] = items if content else [_slim(item) for item in items]
+        elif key != "log_offset":
+            out[key] = value
+    return out
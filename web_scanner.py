@@ -4,8 +4,31 @@ Web Scanner — Tavily API search + deep page content fetching for PII analysis.
 import httpx
 import asyncio
 import logging
-from bs4 import BeautifulSoup
-from typing import List, Dict
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from fetch_scheduler import (
+    RETRYABLE_STATUS,
+    CircuitOpenError,
+    FetchScheduler,
+    RetryableFetchError,
+    parse_retry_after,
+)
+from cache import AsyncTTLCache
+from crawler import URLFrontier, normalize_url
+from dedup import NearDuplicateIndex, changed_lines, fingerprint
+from html_extract import clean_html, clean_page, extract_links as extract_links_fn, get_extractor
+from metrics import (
+    CLEAN_SECONDS,
+    FETCH_BYTES,
+    FETCH_RESPONSE_BYTES,
+    FETCH_RESPONSES,
+    FETCH_SECONDS,
+    SEARCH_ERRORS,
+    SEARCH_SECONDS,
+)
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +43,123 @@ HEADERS = {
     )
 }
 
+# HTML-to-text backend: "auto" (fastest installed), "selectolax", "lxml" or "html.parser".
+HTML_EXTRACTOR = "auto"
+# Worker pool used to keep HTML parsing off the event loop ("thread" or "process").
+CLEAN_POOL = "thread"
+CLEAN_WORKERS = 4
+# Documents smaller than this are cheaper to parse inline than to hand off.
+CLEAN_OFFLOAD_MIN_CHARS = 20000
+
+# Per-fetch body ceiling; the download stops once this many bytes are read.
+MAX_FETCH_BYTES = 2_000_000
+# Cleaned page text kept for PII analysis.
+MAX_PAGE_CHARS = 50000
+# The <title> is looked up in this leading slice of the document only.
+TITLE_SCAN_CHARS = 65536
+# Near-duplicates whose changed lines exceed this share of the text are analyzed in full.
+DEDUP_MAX_CHANGED_RATIO = 0.5
+# Opt-in caches shared by bulk jobs (see ``cache=True``); entries live this long.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 1800
+PAGE_CACHE_SIZE = 256
+PAGE_CACHE_TTL = 1800
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = ("text/plain", "text/csv", "text/markdown", "application/json", "application/ld+json")
+# Servers that omit or misreport the type get their first chunk sniffed instead.
+SNIFF_CONTENT_TYPES = ("", "application/octet-stream", "binary/octet-stream")
+
+
+def _content_kind(content_type: str) -> Optional[str]:
+    """Route a response by Content-Type: "html", "text", "sniff" or None (reject)."""
+    if content_type in HTML_CONTENT_TYPES:
+        return "html"
+    if content_type in TEXT_CONTENT_TYPES:
+        return "text"
+    if content_type in SNIFF_CONTENT_TYPES:
+        return "sniff"
+    return None
+
+
+def _sniff_kind(chunk: bytes) -> Optional[str]:
+    """Classify an untyped body from its first bytes."""
+    head = chunk[:1024]
+    if b"\x00" in head or head.startswith((b"%PDF", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"PK\x03\x04")):
+        return None
+    lowered = head.lstrip().lower()
+    if lowered.startswith((b"<!doctype html", b"<html", b"<head", b"<body")) or b"<html" in lowered:
+        return "html"
+    return "text"
+
+
+def _finding_dict(m) -> Dict:
+    return {
+        "type": m.pii_type,
+        "value": m.value,
+        "masked_value": m.masked_value,
+        "confidence": m.confidence,
+        "severity": m.severity,
+        "context": m.context,
+        "method": m.detection_method,
+    }
+
+
+def _fetch_meta(page: Dict) -> Dict:
+    """Fetch metadata attached to a result (everything except the text itself)."""
+    return {k: v for k, v in page.items() if k not in ("text", "title", "links")}
+
 
 class WebScanner:
     """Search the web via Tavily, fetch each page, extract text content."""
 
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        search_url: str = TAVILY_SEARCH_URL,
+        extractor: str = HTML_EXTRACTOR,
+        clean_pool: str = CLEAN_POOL,
+        clean_workers: int = CLEAN_WORKERS,
+        max_fetch_bytes: int = MAX_FETCH_BYTES,
+    ):
         self.api_key = api_key or TAVILY_API_KEY
+        self.search_url = search_url
+        self.extractor = get_extractor(extractor)
+        self.clean_pool = clean_pool
+        self.clean_workers = clean_workers
+        self._clean_executor: Optional[Executor] = None
+        self.max_fetch_bytes = max_fetch_bytes
+        self.scheduler = FetchScheduler(retry_on=(httpx.TransportError,))
+        self.dedup_index = NearDuplicateIndex()
+        self.dedup_totals = {"unique": 0, "exact": 0, "near": 0}
+        self.search_cache = AsyncTTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+        self.page_cache = AsyncTTLCache(PAGE_CACHE_SIZE, PAGE_CACHE_TTL)
+        self.fetch_totals = {
+            "fetches": 0,
+            "bytes_downloaded": 0,
+            "bytes_read": 0,
+            "bytes_used": 0,
+            "truncated": 0,
+            "skipped": 0,
+        }
+        logger.info(f"HTML extractor: {self.extractor.name} ({clean_pool} pool x{clean_workers})")
 
-    async def search(self, query: str, max_results: int = 5) -> List[Dict]:
-        """Search the web via Tavily API."""
+    async def search(self, query: str, max_results: int = 5, cache: bool = False) -> List[Dict]:
+        """Search the web via Tavily API. ``cache`` serves repeated queries from ``search_cache``."""
+        with span("search", query=query[:200]) as attrs:
+            if not cache:
+                results = await self._search(query, max_results)
+            else:
+                results = await self.search_cache.get_or_load(
+                    (query, max_results),
+                    lambda: self._search(query, max_results),
+                    cacheable=lambda hits: not any("error" in hit for hit in hits),
+                )
+                results = [dict(hit) for hit in results]
+            attrs["results"] = len(results)
+            return results
+
+    async def _search(self, query: str, max_results: int) -> List[Dict]:
         payload = {
             "api_key": self.api_key,
             "query": query,
@@ -38,70 +169,301 @@ class WebScanner:
             "include_raw_content": True,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                resp = await client.post(TAVILY_SEARCH_URL, json=payload)
-                if resp.status_code != 200:
-                    return [{"error": f"Tavily API error {resp.status_code}"}]
-
-                data = resp.json()
-                results = []
-                for item in data.get("results", [])[:max_results]:
-                    results.append({
-                        "url": item.get("url", ""),
-                        "title": item.get("title", "Untitled"),
-                        "snippet": item.get("content", ""),
-                        "raw_content": item.get("raw_content", ""),
-                        "score": item.get("score", 0),
-                    })
-                return results
-            except httpx.TimeoutException:
-                return [{"error": "Tavily search timed out"}]
-            except Exception as e:
-                return [{"error": f"Tavily error: {str(e)}"}]
+        async def post():
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                resp = await client.post(self.search_url, json=payload)
+            if resp.status_code in RETRYABLE_STATUS:
+                raise RetryableFetchError(resp.status_code, parse_retry_after(resp.headers.get("retry-after")))
+            return resp
 
-    def _clean_html(self, html: str) -> str:
-        """Helper to extract clean text from HTML."""
-        if not html:
-            return ""
+        started = time.perf_counter()
         try:
-            soup = BeautifulSoup(html, "html.parser")
-            # Remove noise
-            for tag in soup(["script", "style", "nav", "footer", "header", "aside", "noscript", "svg", "form"]):
-                tag.decompose()
-            
-            # Extract text
-            text = soup.get_text(separator="\n", strip=True)
-            lines = [l.strip() for l in text.splitlines() if l.strip()]
-            return "\n".join(lines)
+            resp = await self.scheduler.run(self.search_url, post)
+            if resp.status_code != 200:
+                return self._search_failed(started, f"status_{resp.status_code}", f"Tavily API error {resp.status_code}")
+
+            data = resp.json()
+            results = []
+            for item in data.get("results", [])[:max_results]:
+                results.append({
+                    "url": item.get("url", ""),
+                    "title": item.get("title", "Untitled"),
+                    "snippet": item.get("content", ""),
+                    "raw_content": item.get("raw_content", ""),
+                    "score": item.get("score", 0),
+                })
+            SEARCH_SECONDS.observe(time.perf_counter() - started, outcome="ok")
+            return results
+        except RetryableFetchError as e:
+            return self._search_failed(started, f"status_{e.status}", f"Tavily API error {e.status}")
+        except CircuitOpenError as e:
+            return self._search_failed(started, "circuit_open", f"Tavily unavailable: {e}")
+        except httpx.TimeoutException:
+            return self._search_failed(started, "timeout", "Tavily search timed out")
         except Exception as e:
-            logger.error(f"HTML cleaning error: {e}")
-            return ""
+            return self._search_failed(started, "exception", f"Tavily error: {str(e)}")
+
+    @staticmethod
+    def _search_failed(started: float, reason: str, message: str) -> List[Dict]:
+        SEARCH_SECONDS.observe(time.perf_counter() - started, outcome="error")
+        SEARCH_ERRORS.inc(reason=reason)
+        return [{"error": message}]
+
+    def _clean_html(self, html: str) -> str:
+        """Helper to extract clean text from HTML."""
+        return clean_html(html, self.extractor.name)
+
+    def _get_clean_executor(self) -> Executor:
+        if self._clean_executor is None:
+            if self.clean_pool == "process":
+                self._clean_executor = ProcessPoolExecutor(max_workers=self.clean_workers)
+            else:
+                self._clean_executor = ThreadPoolExecutor(
+                    max_workers=self.clean_workers, thread_name_prefix="html-clean"
+                )
+        return self._clean_executor
+
+    async def _clean_html_async(self, html: str) -> str:
+        """Extract clean text from HTML on the worker pool, off the event loop."""
+        with CLEAN_SECONDS.time(), span("clean", chars=len(html)):
+            return await self._parse_offloop(clean_html, html)
+
+    async def _clean_page_async(self, html: str) -> Tuple[str, Optional[str]]:
+        """Clean text and <title> of a fetched page, parsed in the same off-loop call."""
+        with CLEAN_SECONDS.time(), span("clean", chars=len(html)):
+            return await self._parse_offloop(clean_page, html, TITLE_SCAN_CHARS)
+
+    async def _parse_offloop(self, func, html: str, *args):
+        """Run an html_extract function on the worker pool when the document is large."""
+        if self.clean_workers <= 0 or len(html) < CLEAN_OFFLOAD_MIN_CHARS:
+            return func(html, self.extractor.name, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_clean_executor(), func, html, self.extractor.name, *args)
+
+    def close(self):
+        """Shut down the HTML worker pool."""
+        if self._clean_executor is not None:
+            self._clean_executor.shutdown(wait=False, cancel_futures=True)
+            self._clean_executor = None
 
     async def fetch_page(self, url: str) -> str:
         """Fetch and extract clean text from a URL with improved handling."""
+        page = await self.fetch_page_detailed(url)
+        return page["text"]
+
+    async def fetch_page_detailed(self, url: str, extract_links: bool = False, cache: bool = False) -> Dict:
+        """
+        Stream a page, stopping at ``max_fetch_bytes``, and extract its text.
+
+        Non-text content types are rejected from the response headers before the
+        body is read. Returns the text plus fetch metadata (status, content type,
+        bytes downloaded vs. bytes used, truncation, title) and, when
+        ``extract_links`` is set, the raw hrefs of the page under "links".
+        With ``cache`` the page is served from ``page_cache``; transient
+        failures (5xx, open circuits, network errors) are never cached.
+        """
+        with span("fetch", url=url) as attrs:
+            if not cache:
+                page = await self._fetch_page(url, extract_links)
+            else:
+                page = dict(await self.page_cache.get_or_load(
+                    (normalize_url(url) or url, extract_links),
+                    lambda: self._fetch_page(url, extract_links),
+                    cacheable=lambda p: p["status"] is not None and p["status"] < 500,
+                ))
+            attrs.update(status=page["status"], bytes=page["bytes_downloaded"], skipped=page["skipped"])
+            return page
+
+    async def _fetch_page(self, url: str, extract_links: bool) -> Dict:
         is_social = any(d in url.lower() for d in ["linkedin.com", "github.com", "twitter.com", "x.com", "facebook.com", "instagram.com"])
-        
+
         # Increased timeout for social media as they often take longer or involve redirects
         timeout = 20.0 if is_social else 15.0
-        
+        started = time.perf_counter()
+
+        page = {
+            "text": "",
+            "title": None,
+            "status": None,
+            "content_type": None,
+            "bytes_downloaded": 0,
+            "bytes_read": 0,
+            "bytes_used": 0,
+            "truncated": False,
+            "skipped": None,
+            "attempts": 0,
+            "links": [],
+        }
+
+        # Add specific social media headers if needed
+        headers = HEADERS.copy()
+        if "linkedin.com" in url.lower():
+            headers["Accept"] = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
+            headers["Accept-Language"] = "en-US,en;q=0.5"
+
+        try:
+            download = await self.scheduler.run(url, lambda: self._download(url, headers, timeout, page))
+        except RetryableFetchError as e:
+            logger.warning(f"Failed to fetch {url}: {e.status} after {page['attempts']} attempts")
+            page["skipped"] = f"status {e.status}"
+            return self._record_fetch(page, started)
+        except CircuitOpenError as e:
+            logger.info(f"Skipping {url}: {e}")
+            page["skipped"] = str(e)
+            return self._record_fetch(page, started)
+        except Exception as e:
+            logger.debug(f"Fetch error for {url}: {e}")
+            page["skipped"] = f"error: {e.__class__.__name__}"
+            return self._record_fetch(page, started)
+
+        if download is None:
+            return self._record_fetch(page, started)
+
+        kind, body, encoding = download
+        try:
+            content = body.decode(encoding, errors="replace")
+        except LookupError:
+            content = body.decode("utf-8", errors="replace")
+        del body, download
+
+        if kind == "html":
+            text, page["title"] = await self._clean_page_async(content)
+            if extract_links:
+                page["links"] = await self._parse_offloop(extract_links_fn, content)
+        else:
+            text = content
+        page["text"] = text[:MAX_PAGE_CHARS]
+        page["bytes_used"] = len(page["text"].encode("utf-8"))
+        return self._record_fetch(page, started)
+
+    async def _download(self, url: str, headers: Dict, timeout: float, page: Dict) -> Optional[Tuple[str, bytes, str]]:
+        """
+        One download attempt, run inside the host's scheduler slot.
+
+        Returns ``(kind, body, encoding)`` or None when the response is skipped;
+        raises RetryableFetchError for statuses worth retrying.
+        """
+        page["attempts"] += 1
+        page["truncated"] = False
         async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, verify=False) as client:
-            try:
-                # Add specific social media headers if needed
-                headers = HEADERS.copy()
-                if "linkedin.com" in url.lower():
-                    headers["Accept"] = "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
-                    headers["Accept-Language"] = "en-US,en;q=0.5"
-                
-                resp = await client.get(url, headers=headers)
+            async with client.stream("GET", url, headers=headers) as resp:
+                page["status"] = resp.status_code
+                if resp.status_code in RETRYABLE_STATUS:
+                    raise RetryableFetchError(resp.status_code, parse_retry_after(resp.headers.get("retry-after")))
                 if resp.status_code != 200:
                     logger.warning(f"Failed to fetch {url}: {resp.status_code}")
-                    return ""
+                    page["skipped"] = f"status {resp.status_code}"
+                    return None
+
+                content_type = resp.headers.get("content-type", "").split(";")[0].strip().lower()
+                page["content_type"] = content_type or None
+                kind = _content_kind(content_type)
+                if kind is None:
+                    logger.info(f"Skipping {url}: unsupported content type {content_type}")
+                    page["skipped"] = f"content type {content_type}"
+                    return None
+
+                declared = resp.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > self.max_fetch_bytes:
+                    page["truncated"] = True
+
+                chunks: List[bytes] = []
+                received = 0
+                async for chunk in resp.aiter_bytes():
+                    if kind == "sniff" and not chunks:
+                        kind = _sniff_kind(chunk)
+                        if kind is None:
+                            page["skipped"] = "binary content"
+                            break
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if received >= self.max_fetch_bytes:
+                        page["truncated"] = True
+                        break
+                page["bytes_downloaded"] += resp.num_bytes_downloaded
+
+        if kind is None:
+            return None
+        body = b"".join(chunks)[:self.max_fetch_bytes]
+        page["bytes_read"] = len(body)
+        return kind, body, resp.charset_encoding or "utf-8"
+
+    def _record_fetch(self, page: Dict, started: float) -> Dict:
+        FETCH_SECONDS.observe(time.perf_counter() - started, outcome="skipped" if page["skipped"] else "ok")
+        FETCH_RESPONSES.inc(status=page["status"] if page["status"] is not None else "error")
+        FETCH_BYTES.inc(page["bytes_downloaded"], kind="downloaded")
+        FETCH_BYTES.inc(page["bytes_used"], kind="used")
+        FETCH_RESPONSE_BYTES.observe(page["bytes_downloaded"])
+        totals = self.fetch_totals
+        totals["fetches"] += 1
+        totals["bytes_downloaded"] += page["bytes_downloaded"]
+        totals["bytes_read"] += page["bytes_read"]
+        totals["bytes_used"] += page["bytes_used"]
+        if page["truncated"]:
+            totals["truncated"] += 1
+        if page["skipped"]:
+            totals["skipped"] += 1
+        return page
+
+    def fetch_stats(self) -> Dict:
+        """Aggregate page-fetch counters since start-up."""
+        totals = dict(self.fetch_totals)
+        totals["max_fetch_bytes"] = self.max_fetch_bytes
+        totals["used_ratio"] = round(totals["bytes_used"] / totals["bytes_read"], 4) if totals["bytes_read"] else None
+        totals["hosts"] = self.scheduler.stats()
+        totals["cache"] = {"search": self.search_cache.stats(), "pages": self.page_cache.stats()}
+        return totals
+
+    def _detect_findings(self, page_text: str, engine, url: str) -> Tuple[List[Dict], Dict]:
+        """
+        Run PII detection, short-circuiting near-duplicates of recently analyzed pages.
 
-                return self._clean_html(resp.text)[:50000]
-            except Exception as e:
-                logger.debug(f"Fetch error for {url}: {e}")
-                return ""
+        Exact copies reuse the earlier findings outright. Near copies reuse the
+        earlier findings still present in the text and run detection only on the
+        lines that changed. Returns the findings and a "dedup" record.
+        """
+        if not page_text:
+            return [], {"status": "unique"}
+
+        fp = fingerprint(page_text)
+        kind, entry, distance = self.dedup_index.lookup(fp)
+
+        if kind == "exact":
+            self.dedup_totals["exact"] += 1
+            return [dict(f) for f in entry.findings], {"status": "exact", "of": entry.url}
+
+        if kind == "near":
+            new_lines = changed_lines(page_text, entry.fp)
+            if sum(len(l) for l in new_lines) <= len(page_text) * DEDUP_MAX_CHANGED_RATIO:
+                reused = [dict(f) for f in entry.findings if f["value"] in page_text]
+                fresh = [_finding_dict(m) for m in engine.detect("\n".join(new_lines))] if new_lines else []
+                merged: Dict[Tuple[str, str], Dict] = {}
+                for f in reused + fresh:
+                    key = (f["value"].strip().lower(), f["type"])
+                    if key not in merged or f["confidence"] > merged[key]["confidence"]:
+                        merged[key] = f
+                findings = list(merged.values())
+                self.dedup_index.add(fp, url, findings)
+                self.dedup_totals["near"] += 1
+                return findings, {
+                    "status": "near",
+                    "of": entry.url,
+                    "distance": distance,
+                    "changed_lines": len(new_lines),
+                    "reused_findings": len(reused),
+                }
+
+        findings = [_finding_dict(m) for m in engine.detect(page_text)]
+        self.dedup_index.add(fp, url, findings)
+        self.dedup_totals["unique"] += 1
+        return findings, {"status": "unique"}
+
+    def dedup_stats(self) -> Dict:
+        totals = dict(self.dedup_totals)
+        analyzed = sum(totals.values())
+        totals["indexed"] = len(self.dedup_index)
+        totals["dedup_ratio"] = round((totals["exact"] + totals["near"]) / analyzed, 4) if analyzed else 0.0
+        return totals
 
     async def scan(self, query: str, engine, max_results: int = 5, log_fn=None) -> List[Dict]:
         """
@@ -125,109 +487,179 @@ class WebScanner:
                 findings.append({"error": sr["error"], "source": "web"})
                 continue
 
-            url = sr["url"]
-            title = sr["title"]
-            is_social = any(d in url.lower() for d in ["linkedin.com", "github.com", "twitter.com", "x.com"])
-
-            if log_fn:
-                domain_tag = "[SOCIAL]" if is_social else "[WEB]"
-                log_fn(f"[{i+1}/{len(search_results)}] {domain_tag} {title[:50]}...")
-
-            # Strategy: 
-            # 1. Prefer Tavily's raw_content if it looks good
-            # 2. Otherwise try deep fetch
-            # 3. Fallback to snippet
-            page_text = ""
-            raw_content = sr.get("raw_content", "")
-            
-            if raw_content and len(raw_content) > 500:
-                # If it's HTML, clean it, else use as is
-                if "<html" in raw_content.lower() or "<body" in raw_content.lower():
-                    page_text = self._clean_html(raw_content)
-                else:
-                    page_text = raw_content
-
-            if not page_text or len(page_text) < 300:
-                if log_fn: log_fn(f"  Fetching deep content for {url[:40]}...")
-                page_text = await self.fetch_page(url)
-
-            if not page_text:
-                page_text = sr.get("snippet", "")
-
-            if log_fn:
-                log_fn(f"  Content: {len(page_text):,} chars")
-
-            # Run PII detection
-            pii_matches = engine.detect(page_text) if page_text else []
-
-            # Count by detection method
-            methods = {}
-            for m in pii_matches:
-                methods[m.detection_method] = methods.get(m.detection_method, 0) + 1
-
-            result = {
-                "source": "web",
-                "url": url,
-                "title": title,
-                "content_length": len(page_text),
-                "raw_content": page_text[:3000],
-                "pii_count": len(pii_matches),
-                "pii_findings": [
-                    {
-                        "type": m.pii_type,
-                        "value": m.value,
-                        "masked_value": m.masked_value,
-                        "confidence": m.confidence,
-                        "severity": m.severity,
-                        "context": m.context,
-                        "method": m.detection_method,
-                    }
-                    for m in pii_matches
-                ],
-                "detection_methods": methods,
-            }
+            result = await self._analyze_search_result(sr, engine, f"[{i+1}/{len(search_results)}]", log_fn)
             findings.append(result)
 
-            if pii_matches and log_fn:
-                method_str = ", ".join(f"{k}:{v}" for k, v in methods.items())
-                log_fn(f"  ⚠ {len(pii_matches)} PII found [{method_str}]")
-            elif log_fn:
-                log_fn(f"  ✓ Clean")
-
             await asyncio.sleep(0.2)
 
         return findings
 
-    async def scan_url(self, url: str, engine, log_fn=None) -> Dict:
-        """Scan a single URL for PII."""
+    async def search_many(self, queries: List[str], max_results: int = 5, cache: bool = False) -> List[Dict]:
+        """
+        Run several Tavily searches concurrently and merge their hits.
+
+        URLs are deduplicated across queries by their normalized form; each
+        merged hit lists every query that surfaced it under "queries" and keeps
+        the best score and the longest raw content. Failed queries come back as
+        error entries carrying the "query".
+        """
+        queries = list(dict.fromkeys(q for q in queries if q))
+        batches = await asyncio.gather(*(self.search(q, max_results, cache=cache) for q in queries))
+
+        merged: Dict[str, Dict] = {}
+        errors: List[Dict] = []
+        for query, batch in zip(queries, batches):
+            for item in batch:
+                if "error" in item:
+                    errors.append({**item, "query": query})
+                    continue
+                key = normalize_url(item["url"]) or item["url"]
+                hit = merged.get(key)
+                if hit is None:
+                    merged[key] = {**item, "queries": [query]}
+                    continue
+                if query not in hit["queries"]:
+                    hit["queries"].append(query)
+                hit["score"] = max(hit.get("score") or 0, item.get("score") or 0)
+                if len(item.get("raw_content") or "") > len(hit.get("raw_content") or ""):
+                    hit["raw_content"] = item["raw_content"]
+        return errors + list(merged.values())
+
+    async def scan_many(
+        self,
+        queries: List[str],
+        engine,
+        max_results: int = 5,
+        concurrency: int = 4,
+        log_fn=None,
+        cache: bool = False,
+    ) -> List[Dict]:
+        """
+        Fan-out version of ``scan``: several narrower queries, one analysis per page.
+
+        ``max_results`` applies per query. Every unique page is fetched and
+        detected exactly once, with up to ``concurrency`` pages in flight, and
+        each result keeps the "queries" that surfaced it. ``cache`` reuses
+        searches and page fetches from the shared TTL caches.
+        """
         if log_fn:
-            log_fn(f"Fetching: {url}")
+            log_fn(f"Initiating fan-out search: {len(queries)} queries")
+
+        search_results = await self.search_many(queries, max_results, cache=cache)
+        valid = [r for r in search_results if "error" not in r]
 
-        page_text = await self.fetch_page(url)
-        title = url
+        if log_fn:
+            log_fn(f"Search complete. Analyzing {len(valid)} unique targets...")
 
-        # Try to extract title from HTML
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as c:
-                r = await c.get(url, headers=HEADERS)
-                soup = BeautifulSoup(r.text, "html.parser")
-                title = soup.title.string.strip() if soup.title else url
-        except Exception:
-            pass
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def analyze(i: int, sr: Dict) -> Dict:
+            if "error" in sr:
+                return {"error": sr["error"], "source": "web", "query": sr.get("query")}
+            async with sem:
+                result = await self._analyze_search_result(
+                    sr, engine, f"[{i+1}/{len(search_results)}]", log_fn, cache=cache
+                )
+            result["queries"] = sr["queries"]
+            return result
+
+        return list(await asyncio.gather(*(analyze(i, sr) for i, sr in enumerate(search_results))))
+
+    async def _analyze_search_result(self, sr: Dict, engine, label: str, log_fn=None, cache: bool = False) -> Dict:
+        """Get the text for one search hit (raw content, deep fetch or snippet) and detect PII."""
+        url = sr["url"]
+        title = sr["title"]
+        is_social = any(d in url.lower() for d in ["linkedin.com", "github.com", "twitter.com", "x.com"])
+
+        if log_fn:
+            domain_tag = "[SOCIAL]" if is_social else "[WEB]"
+            log_fn(f"{label} {domain_tag} {title[:50]}...")
+
+        # Strategy: 
+        # 1. Prefer Tavily's raw_content if it looks good
+        # 2. Otherwise try deep fetch
+        # 3. Fallback to snippet
+        page_text = ""
+        raw_content = sr.get("raw_content", "")
+        
+        if raw_content and len(raw_content) > 500:
+            # If it's HTML, clean it, else use as is
+            if "<html" in raw_content.lower() or "<body" in raw_content.lower():
+                page_text = await self._clean_html_async(raw_content)
+            else:
+                page_text = raw_content
+
+        fetch_meta = None
+        if not page_text or len(page_text) < 300:
+            if log_fn: log_fn(f"  Fetching deep content for {url[:40]}...")
+            page = await self.fetch_page_detailed(url, cache=cache)
+            page_text = page["text"]
+            fetch_meta = _fetch_meta(page)
+
+        if not page_text:
+            page_text = sr.get("snippet", "")
+
+        if log_fn:
+            log_fn(f"  Content: {len(page_text):,} chars")
+
+        # Run PII detection (reusing findings of near-duplicate pages)
+        pii_findings, dedup_info = self._detect_findings(page_text, engine, url)
+
+        # Count by detection method
+        methods = {}
+        for f in pii_findings:
+            methods[f["method"]] = methods.get(f["method"], 0) + 1
+
+        result = {
+            "source": "web",
+            "url": url,
+            "title": title,
+            "content_length": len(page_text),
+            "raw_content": page_text[:3000],
+            "pii_count": len(pii_findings),
+            "pii_findings": pii_findings,
+            "detection_methods": methods,
+            "dedup": dedup_info,
+        }
+        if fetch_meta:
+            result["fetch"] = fetch_meta
+
+        if log_fn and dedup_info["status"] != "unique":
+            log_fn(f"  ↺ {dedup_info['status']} duplicate of {dedup_info['of'][:60]}")
+        if pii_findings and log_fn:
+            method_str = ", ".join(f"{k}:{v}" for k, v in methods.items())
+            log_fn(f"  ⚠ {len(pii_findings)} PII found [{method_str}]")
+        elif log_fn:
+            log_fn(f"  ✓ Clean")
+
+        return result
+
+    async def scan_url(self, url: str, engine, log_fn=None, include_links: bool = False) -> Dict:
+        """Scan a single URL for PII. ``include_links`` adds the page's hrefs under "links"."""
+        if log_fn:
+            log_fn(f"Fetching: {url}")
+
+        page = await self.fetch_page_detailed(url, extract_links=include_links)
+        page_text = page["text"]
+        title = page["title"] or url
 
         if log_fn:
-            log_fn(f"Content: {len(page_text):,} chars")
+            if page["skipped"]:
+                log_fn(f"Skipped: {page['skipped']}")
+            log_fn(f"Content: {len(page_text):,} chars ({page['bytes_downloaded']:,} bytes downloaded)")
 
-        pii_matches = engine.detect(page_text) if page_text else []
+        pii_findings, dedup_info = self._detect_findings(page_text, engine, url)
 
         methods = {}
-        for m in pii_matches:
-            methods[m.detection_method] = methods.get(m.detection_method, 0) + 1
+        for f in pii_findings:
+            methods[f["method"]] = methods.get(f["method"], 0) + 1
 
         if log_fn:
-            if pii_matches:
+            if dedup_info["status"] != "unique":
+                log_fn(f"↺ {dedup_info['status']} duplicate of {dedup_info['of'][:60]}")
+            if pii_findings:
                 method_str = ", ".join(f"{k}:{v}" for k, v in methods.items())
-                log_fn(f"⚠ {len(pii_matches)} PII found [{method_str}]")
+                log_fn(f"⚠ {len(pii_findings)} PII found [{method_str}]")
             else:
                 log_fn(f"✓ Clean — no PII detected")
 
@@ -236,18 +668,70 @@ class WebScanner:
             "title": title,
             "content_length": len(page_text),
             "raw_content": page_text[:3000],
-            "pii_count": len(pii_matches),
-            "pii_findings": [
-                {
-                    "type": m.pii_type,
-                    "value": m.value,
-                    "masked_value": m.masked_value,
-                    "confidence": m.confidence,
-                    "severity": m.severity,
-                    "context": m.context,
-                    "method": m.detection_method,
-                }
-                for m in pii_matches
-            ],
+            "pii_count": len(pii_findings),
+            "pii_findings": pii_findings,
             "detection_methods": methods,
+            "dedup": dedup_info,
+            "fetch": _fetch_meta(page),
+            **({"links": page["links"]} if include_links else {}),
         }
+
+    async def crawl(
+        self,
+        start_url: str,
+        engine,
+        max_depth: int = 2,
+        max_pages: int = 25,
+        concurrency: int = 4,
+        log_fn=None,
+        on_result=None,
+    ) -> List[Dict]:
+        """
+        Same-site breadth-first crawl, scanning every page with ``scan_url``.
+
+        Links are followed up to ``max_depth`` hops from ``start_url`` and at
+        most ``max_pages`` pages are scanned, by ``concurrency`` workers. Each
+        page result (with its "depth") is passed to ``on_result`` as soon as it
+        is ready, and all results are returned at the end.
+        """
+        frontier = URLFrontier(start_url, max_depth=max_depth, max_pages=max_pages)
+        results: List[Dict] = []
+
+        if log_fn:
+            log_fn(f"Crawling {frontier.site} (depth {max_depth}, up to {max_pages} pages, {concurrency} workers)")
+
+        async def worker():
+            while True:
+                url, depth = await frontier.queue.get()
+                try:
+                    follow = depth < max_depth and not frontier.full
+                    result = await self.scan_url(url, engine, include_links=follow)
+                    result["source"] = "crawl"
+                    result["depth"] = depth
+                    for link in result.pop("links", []):
+                        if frontier.full:
+                            break
+                        frontier.add(link, depth + 1, base=url)
+                    results.append(result)
+                    if log_fn:
+                        status = f"{result['pii_count']} PII" if result["pii_count"] else "clean"
+                        log_fn(f"[{len(results)}/{frontier.accepted}] d{depth} {url[:70]} — {status}")
+                    if on_result:
+                        on_result(result)
+                except Exception as e:
+                    logger.warning(f"Crawl error on {url}: {e}")
+                    results.append({"error": f"Crawl error on {url}: {e}", "url": url, "source": "crawl"})
+                finally:
+                    frontier.queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        try:
+            await frontier.queue.join()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if log_fn:
+            log_fn(f"Crawl complete: {len(results)} pages scanned, {frontier.skipped} off-site/non-page links skipped")
+        return results
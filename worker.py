@@ -0,0 +1,151 @@
+"""
+Worker — runs queued scan, crawl and monitor-scan jobs outside the API process.
+
+Usage:
+    python worker.py [--concurrency 2] [--queue jobs.db]
+
+Start as many workers as the detection load needs, independently of the API
+processes (which run with SCAN_EXECUTION = "queue" in main.py and a shared
+STATE_BACKEND_URL in scan_pipeline.py). Each worker process owns its own
+PIIEngine and WebScanner and runs the scan pipeline of scan_pipeline.py, the
+same code the API runs inline; it imports nothing of the API (no app, no
+monitor database). Scan progress, logs and events are mirrored through the
+state backend, where ``/api/scan/{id}`` and the stream endpoints of any API
+process read them. Monitor-scan results go back through the queue to the API
+process that owns the monitor.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from typing import Any, Dict
+
+# Relative database paths (JOB_QUEUE_PATH, a sqlite:// STATE_BACKEND_URL) resolve against
+# the app directory, wherever the worker is started from.
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+import scan_pipeline as pipeline  # noqa: E402
+from job_queue import Job, JobQueue  # noqa: E402
+
+logger = logging.getLogger("worker")
+
+WORKER_CONCURRENCY = 2
+WORKER_POLL_SECONDS = 0.5
+JOB_KINDS = ["scan", "crawl", "monitor_scan"]
+
+
+async def _run_scan_job(job: Job) -> Dict[str, Any]:
+    scan_id = job.payload["scan_id"]
+    if job.kind == "scan":
+        req = pipeline.ScanRequest(**job.payload["request"])
+        pipeline.create_scan(scan_id, req.query)
+        pipeline.add_log(scan_id, f'Scan started on {pipeline.WORKER_ID}: "{req.query}"')
+        await pipeline.run_scan(scan_id, req)
+    else:
+        req = pipeline.CrawlRequest(**job.payload["request"])
+        pipeline.create_scan(scan_id, f"CRAWL: {req.url}")
+        pipeline.add_log(scan_id, f"Crawl started on {pipeline.WORKER_ID}: {req.url}")
+        await pipeline.run_crawl(scan_id, req)
+
+    # The submitting API process counts the scan in its stats from this result.
+    scan = pipeline.scans[scan_id]
+    return {
+        "status": scan["status"],
+        "entry": {
+            "scan_id": scan_id,
+            "query": scan["query"],
+            "total_findings": scan.get("total_pii", 0),
+            "overall_risk": scan.get("overall_risk", "LOW"),
+            "timestamp": scan.get("completed_at"),
+        },
+        "by_method": scan.get("by_method", {}),
+    }
+
+
+async def _run_monitor_scan_job(job: Job) -> Dict[str, Any]:
+    logs = []
+    req = pipeline.MonitorRequest(**job.payload["config"])
+    results, subscans = await pipeline.execute_monitor_scan(job.payload["monitor_id"], req, log_fn=logs.append)
+    return {"results": results, "subscans": subscans, "logs": logs}
+
+
+async def _keep_lease(queue: JobQueue, job: Job, task: asyncio.Task):
+    """Renew the job's lease while it runs; stop the job if it was cancelled or taken over."""
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not await asyncio.to_thread(queue.renew, job.id, pipeline.WORKER_ID):
+            logger.warning(f"Job {job.id} was cancelled or taken over; stopping it")
+            task.cancel()
+            return
+
+
+async def _work(queue: JobQueue):
+    while True:
+        job = await asyncio.to_thread(queue.claim, pipeline.WORKER_ID, JOB_KINDS)
+        if job is None:
+            await asyncio.sleep(WORKER_POLL_SECONDS)
+            continue
+
+        logger.info(f"Running {job.kind} job {job.id} (attempt {job.attempts})")
+        runner = _run_monitor_scan_job if job.kind == "monitor_scan" else _run_scan_job
+        task = asyncio.create_task(runner(job))
+        lease = asyncio.create_task(_keep_lease(queue, job, task))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            lease.cancel()
+            if asyncio.current_task().cancelling():
+                # Shutting down: hand the job back (queued again if it has attempts left).
+                task.cancel()
+                await asyncio.shield(asyncio.to_thread(queue.release, job.id, pipeline.WORKER_ID))
+                raise
+            continue        # the lease could not be renewed: the job was cancelled
+        except Exception as exc:
+            lease.cancel()
+            logger.exception(f"Job {job.id} failed")
+            await pipeline.writer.flush()
+            await asyncio.to_thread(queue.fail, job.id, pipeline.WORKER_ID, str(exc))
+            continue
+        lease.cancel()
+        # The scan's final state and events reach the backend before its job is reported done.
+        await pipeline.writer.flush()
+        await asyncio.to_thread(queue.complete, job.id, pipeline.WORKER_ID, result)
+
+
+async def run(queue: JobQueue, concurrency: int):
+    if not pipeline.backend.shared:
+        raise SystemExit('worker.py needs a shared STATE_BACKEND_URL in scan_pipeline.py (not "memory://")')
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"Worker {pipeline.WORKER_ID} polling {queue.path} with concurrency {concurrency}")
+    mirror = asyncio.create_task(pipeline.writer.run())
+    workers = [asyncio.create_task(_work(queue)) for _ in range(concurrency)]
+    await stop.wait()
+    logger.info("Shutting down; unfinished jobs are handed back to the queue")
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await pipeline.writer.flush()
+    mirror.cancel()
+    pipeline.scanner.close()
+    pipeline.backend.close()
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="jobs run at once")
+    parser.add_argument("--queue", default=pipeline.JOB_QUEUE_PATH, help="job queue database")
+    args = parser.parse_args()
+    queue = JobQueue(args.queue)
+    try:
+        asyncio.run(run(queue, args.concurrency))
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    cli()